@@ -1,9 +1,58 @@
-from .app import App
+import argparse
+import tomllib
+
+
+def load_config(path: str) -> dict:
+    """Reads a TOML configuration file.
+
+    Recognized keys:
+    - `detector`: str -- Name of the detector, see `--detector`
+    - `[detector_options]`: table -- Keyword arguments of the detector, e.g. `track = true`
+    """
+    with open(path, "rb") as file:
+        return tomllib.load(file)
 
 
 def main():
     """Main entry point of the package."""
-    app = App()
+    parser = argparse.ArgumentParser(
+        prog="python -m mugshot",
+        description="Controls the cursor with your face.",
+    )
+    parser.add_argument(
+        "--detector",
+        help="a detector name (see --list-detectors) or a module:Class reference, overriding the configuration file (default: AltCVDetection)",
+    )
+    parser.add_argument(
+        "--config",
+        metavar="PATH",
+        help="a TOML file setting `detector` and a `[detector_options]` table",
+    )
+    parser.add_argument(
+        "--list-detectors",
+        action="store_true",
+        help="list the available detectors, including plugins, and exit",
+    )
+    # Other arguments are left to Qt
+    args, _ = parser.parse_known_args()
+
+    # Detectors are only imported once selected, so listing them is fast
+    from mugshot.cv import DetectorRegistry
+
+    if args.list_detectors:
+        print("\n".join(DetectorRegistry.names()))
+        return
+
+    config = load_config(args.config) if args.config is not None else {}
+    detector = args.detector or config.get("detector", "AltCVDetection")
+    if detector not in DetectorRegistry.names() and ":" not in detector:
+        parser.error(
+            f"unknown detector {detector!r}, expected one of {DetectorRegistry.names()}"
+        )
+
+    from .app import App
+
+    app = App(detector, config.get("detector_options"))
     app.run()
 
 
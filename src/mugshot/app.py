@@ -1,19 +1,44 @@
 import logging
+import os
 import sys
 import time
+from typing import Optional
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QGuiApplication
 from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton
 
 from mugshot.components.feed import Feed, RectFloat
-from mugshot.cv import AltCVDetection
+from mugshot.cv import DetectorRegistry
 from mugshot.mouse_input import FrameInput
+from mugshot.mouse_input import GestureEngine, GestureEvent, GesturePhase
 from mugshot.cv import CVWorker
-from mugshot.feed import FeedWorker
-from mugshot.mouse_input import MouseAction
+from mugshot.cv import ProcessPoolDetection
+from mugshot.cv import QualityGovernor
+from mugshot.feed import CameraSource, FeedWorker
+from mugshot.mouse_input import OutputWorker
 from mugshot.mouse_input import Screen
+from mugshot.mouse_input import ScrollController
+from mugshot.mouse_input import create_cursor_filter
+from mugshot.mouse_input import create_output_backend
+from mugshot.recording import SessionRecorder
+from mugshot.startup import StartupOrchestrator
+from mugshot.telemetry import MetricsExporter, enable_metrics, record
 
 
 class MainWindow(QWidget):
-    def __init__(self):
+    METRICS_EXPORT_MS = 10_000
+    """Milliseconds between exports of the stage timings."""
+
+    MAX_INPUT_AGE = 0.25
+    """Seconds after capture beyond which inputs are stale, and discarded instead of executed."""
+
+    def __init__(
+        self, detector: str = "AltCVDetection", detectorOptions: Optional[dict] = None
+    ):
+        """Arguments:
+        - `detector`: str -- Name of the detector in `DetectorRegistry`, or a `module:Class` reference
+        - `detectorOptions`: Optional[dict] -- Keyword arguments of the detector
+        """
         super().__init__()
 
         logging.info(f"Initializing MainWindow at {time.ctime()}")
@@ -21,6 +46,10 @@ class MainWindow(QWidget):
         # === Widget states ===
         self.isDoingInputs = False
         self.mapArea = RectFloat(0.2, 0.2, 0.8, 0.8)
+        self.staleCount = 0
+        """Number of inputs discarded for being older than `MAX_INPUT_AGE`."""
+        self.gestures = GestureEngine()
+        """Debounces the inputs of each frame into gesture transitions."""
 
         # === Set up window widgets ===
         layout = QVBoxLayout()
@@ -30,9 +59,10 @@ class MainWindow(QWidget):
         self.feed.mapAreaChanged.connect(self.setMapArea)
         layout.addWidget(self.feed)
 
-        # Initialize start/stop button widget
+        # Initialize start/stop button widget, enabled once the pipeline is ready
         self.startStopBtn = StartStopBtn()
         self.startStopBtn.toggled.connect(self.setDoingInputs)
+        self.startStopBtn.setEnabled(False)
         layout.addWidget(self.startStopBtn)
 
         # Set QWidget properties after initializing component widgets
@@ -40,80 +70,204 @@ class MainWindow(QWidget):
         self.setLayout(layout)
 
         # === Initialize threads ===
-        self.cvWorker = CVWorker(cv_detection_class=AltCVDetection)
-        self.feedWorker = FeedWorker()
+        # A frame budget of 0 ms keeps the detection quality fixed
+        frameBudget = float(os.environ.get("MUGSHOT_FRAME_BUDGET_MS", "33")) / 1000
+
+        # Detection runs in a pool of processes when given more than 0 workers
+        detectionWorkers = int(os.environ.get("MUGSHOT_DETECTION_WORKERS", "0"))
+
+        def createDetection():
+            # Imported on the CV thread, after the window is shown
+            detectionClass = DetectorRegistry.load(detector)
+            if detectionWorkers > 0:
+                return ProcessPoolDetection(
+                    detectionClass,
+                    workers=detectionWorkers,
+                    **(detectorOptions or {}),
+                )
+            return detectionClass(**(detectorOptions or {}))
+
+        # Sessions are recorded to a new subdirectory for each run, frames being optional
+        self.recorder = None
+        recordPath = os.environ.get("MUGSHOT_RECORD")
+        if recordPath is not None:
+            frameWidth = int(os.environ.get("MUGSHOT_RECORD_FRAME_WIDTH", "320"))
+            self.recorder = SessionRecorder(
+                os.path.join(recordPath, time.strftime("%Y%m%d-%H%M%S")),
+                frame_width=frameWidth if frameWidth > 0 else None,
+            )
+
+        self.cvWorker = CVWorker(
+            cv_detection_class=createDetection,
+            quality_governor=QualityGovernor(frameBudget) if frameBudget > 0 else None,
+            recorder=self.recorder,
+        )
+
+        # The camera is opened with the cheapest capture profile meeting the detector's needs
+        def detectorInputSize():
+            # Called on the capture thread, the detector's models are not loaded
+            try:
+                return DetectorRegistry.load(detector).INPUT_SIZE
+            except Exception:
+                logging.exception("Failed to load the detector's input size")
+                return None
+
+        self.feedWorker = FeedWorker(
+            CameraSource(
+                0,
+                profile=os.environ.get("MUGSHOT_CAPTURE_PROFILE", "auto"),
+                min_size=detectorInputSize,
+            )
+        )
+        self.outputWorker = OutputWorker(
+            backend=create_output_backend(
+                os.environ.get("MUGSHOT_OUTPUT_BACKEND", "pyautogui")
+            ),
+            cursor_filter=create_cursor_filter(
+                os.environ.get("MUGSHOT_CURSOR_FILTER", "none")
+            ),
+            scroll_controller=ScrollController(
+                step=int(os.environ.get("MUGSHOT_SCROLL_STEP", "100"))
+            ),
+        )
 
         # === Set up signal flow ===
-        self.feedWorker.frameRead.connect(self.cvWorker.processFrame)
+        # Direct connection, so frames go straight into the CV mailbox from the capture thread
+        self.feedWorker.frameRead.connect(
+            self.cvWorker.processFrame, Qt.ConnectionType.DirectConnection
+        )
         self.cvWorker.frameProcessed.connect(self.feed.setFeed)
+        self.feed.previewVisibilityChanged.connect(self.cvWorker.setPreviewVisible)
         self.cvWorker.inputsMade.connect(self.doInputs)
 
+        # The screen size is cached, so refresh it when the screen changes
+        primaryScreen = QGuiApplication.primaryScreen()
+        primaryScreen.geometryChanged.connect(lambda _: Screen.invalidate())
+        QGuiApplication.instance().primaryScreenChanged.connect(
+            lambda _: Screen.invalidate()
+        )
+
+        # === Set up instrumentation ===
+        # Stage timings are only recorded when exported or shown
+        metricsPath = os.environ.get("MUGSHOT_METRICS")
+        showStats = os.environ.get("MUGSHOT_STATS_OVERLAY", "0") == "1"
+        enable_metrics(metricsPath is not None or showStats)
+        self.feed.setStatsOverlay(showStats)
+
+        self.metricsExporter = None
+        if metricsPath is not None:
+            self.metricsExporter = MetricsExporter(metricsPath)
+            self.metricsTimer = QTimer(self)
+            self.metricsTimer.timeout.connect(self.metricsExporter.export)
+            self.metricsTimer.start(self.METRICS_EXPORT_MS)
+
         # === Start threads ===
-        self.cvWorker.start()
-        self.feedWorker.start()
+        # The camera opens while the detector's models load and warm up, and inputs are only
+        # executed once every component is ready
+        self.startup = StartupOrchestrator(self)
+        self.startup.watch(
+            "camera", self.feedWorker.sourceOpened, self.feedWorker.sourceFailed
+        )
+        self.startup.watch(
+            "detector", self.cvWorker.detectorReady, self.cvWorker.detectorFailed
+        )
+        self.startup.watch("warmup", self.cvWorker.warmedUp)
+        self.startup.watch("output", self.outputWorker.started)
+        self.startup.pipelineReady.connect(self.enableInputs)
+        self.startup.componentFailed.connect(self.showStartupFailure)
+        self.startup.start(self.cvWorker, self.feedWorker, self.outputWorker)
 
         logging.info(f"Finished initializing MainWindow at {time.ctime()}")
 
     def setDoingInputs(self, value):
         if not value and not value == self.isDoingInputs:
-            MouseAction.left_up()
-            MouseAction.right_up()
+            self.gestures.reset()
+            self.outputWorker.setScrollDirection(0, 0)
+            self.outputWorker.leftUp()
+            self.outputWorker.rightUp()
+            self.outputWorker.resetCursorFilter()
 
         self.isDoingInputs = value
 
+    def enableInputs(self, startupTime: float):
+        """Public slot to let the user start inputs, once the pipeline is ready."""
+
+        self.startStopBtn.setEnabled(True)
+
+    def showStartupFailure(self, name: str, reason: str):
+        """Public slot to show why a component failed to start. Inputs stay disabled, as the
+        pipeline cannot become ready."""
+
+        self.startStopBtn.setText(f"Failed to start the {name}")
+        self.startStopBtn.setToolTip(reason)
+
     def setMapArea(self, value: RectFloat):
         self.mapArea = value
 
     def doInputs(self, frameInput: FrameInput):
-        """Public slot for executing inputs."""
-
-        if self.isDoingInputs:
-            if frameInput.is_left_eye_closed is not None:
-                if frameInput.is_left_eye_closed:
-                    MouseAction.left_down()
-                else:
-                    MouseAction.left_up()
-
-            if frameInput.is_right_eye_closed is not None:
-                if frameInput.is_right_eye_closed:
-                    MouseAction.right_down()
-                else:
-                    MouseAction.right_up()
-
-            if frameInput.cursor_pos is not None:
-                width, height = Screen.get_size()
-                new_cursor_pos = (
-                    int(
-                        (frameInput.cursor_pos[0] - self.mapArea.x1)
-                        / (self.mapArea.x2 - self.mapArea.x1)
-                        * width
-                    ),
-                    int(
-                        (frameInput.cursor_pos[1] - self.mapArea.y1)
-                        / (self.mapArea.y2 - self.mapArea.y1)
-                        * height
-                    ),
-                )
-                MouseAction.move_to(*new_cursor_pos)
+        """Public slot for executing inputs, which are sent on the output thread.
+
+        Inputs are discarded until the pipeline is ready, and inputs detected from a frame
+        captured more than `MAX_INPUT_AGE` ago are discarded."""
+
+        if not self.startup.isReady():
+            return
+        if frameInput.envelope is not None:
+            frameInput.envelope.mark("dispatched")
+        if frameInput.timestamp is not None:
+            age = time.monotonic() - frameInput.timestamp
+            record("capture_to_dispatch", age)
+            if age > self.MAX_INPUT_AGE:
+                self.staleCount += 1
+                return
+
+        if not self.isDoingInputs:
+            return
+
+        # Buttons are only pressed and released when a gesture starts or ends
+        events = self.gestures.update(frameInput)
+        for event in events:
+            self.doGesture(event)
+
+        # Scrolling is paced on the output thread while a tongue gesture is pressed
+        if any(event.gesture in ("tongue_down", "tongue_up") for event in events):
+            self.outputWorker.setScrollDirection(
+                0,
+                int(self.gestures.is_pressed("tongue_up"))
+                - int(self.gestures.is_pressed("tongue_down")),
+            )
 
-            if frameInput.is_tongue_down is not None:
-                if frameInput.is_tongue_down:
-                    MouseAction.v_scroll(-100)
-                else:
-                    MouseAction.v_scroll(100)
+        if frameInput.cursor_pos is not None:
+            new_cursor_pos = Screen.map_from_area(
+                frameInput.cursor_pos,
+                (self.mapArea.x1, self.mapArea.y1, self.mapArea.x2, self.mapArea.y2),
+            )
+            self.outputWorker.setCursorTarget(*new_cursor_pos, frameInput.timestamp)
 
-    def paintEvent(self, event):
-        """Overrides QWidget.paintEvent, reads successive frames in a loop."""
+    def doGesture(self, event: GestureEvent):
+        """Public slot for executing the mouse button actions of a gesture transition."""
 
-        if self.feedWorker.capture is not None:
-            self.feedWorker.readFrame()
-        super().paintEvent(event)
+        if event.gesture == "left_eye":
+            if event.phase == GesturePhase.PRESS:
+                self.outputWorker.leftDown()
+            elif event.phase == GesturePhase.RELEASE:
+                self.outputWorker.leftUp()
+        elif event.gesture == "right_eye":
+            if event.phase == GesturePhase.PRESS:
+                self.outputWorker.rightDown()
+            elif event.phase == GesturePhase.RELEASE:
+                self.outputWorker.rightUp()
 
     def closeEvent(self, event):
         """Overrides QWidget.closeEvent, cleans up worker resources."""
 
         self.feedWorker.quit()
         self.cvWorker.quit()
+        self.outputWorker.quit()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.metricsExporter is not None:
+            self.metricsExporter.export()
         super().closeEvent(event)
 
 
@@ -132,9 +286,11 @@ class StartStopBtn(QPushButton):
 
 
 class App:
-    def __init__(self):
+    def __init__(
+        self, detector: str = "AltCVDetection", detectorOptions: Optional[dict] = None
+    ):
         self._app = QApplication(sys.argv)
-        self._root = MainWindow()
+        self._root = MainWindow(detector, detectorOptions)
 
     def run(self):
         self._root.show()
@@ -0,0 +1,14 @@
+"""Module for headless performance benchmarks"""
+
+from ._runner import BenchmarkResult, run_benchmark, load_detector_class, peak_rss
+from ._startup import ImportTiming, measure_import, STARTUP_MODULES
+from ._suite import (
+    SuiteCase,
+    synthetic_frames,
+    read_frames,
+    default_cases,
+    run_suite,
+    compare_results,
+    save_results,
+    load_results,
+)
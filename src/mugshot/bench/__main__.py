@@ -0,0 +1,203 @@
+import argparse
+from dataclasses import asdict
+import json
+import logging
+import sys
+
+from mugshot.bench import (
+    STARTUP_MODULES,
+    compare_results,
+    default_cases,
+    load_detector_class,
+    load_results,
+    measure_import,
+    read_frames,
+    run_benchmark,
+    run_suite,
+    save_results,
+    synthetic_frames,
+)
+from mugshot.feed import open_source
+from mugshot.telemetry import enable_metrics
+
+
+def main():
+    """Entry point of the headless replay benchmark."""
+    parser = argparse.ArgumentParser(
+        prog="python -m mugshot.bench",
+        description="Replays recorded frames through a CV detector and reports its performance.",
+    )
+    parser.add_argument(
+        "source",
+        nargs="?",
+        help="a video file, a directory of images, or a camera index. Optional with --suite, which uses synthetic frames by default, and unused with --startup",
+    )
+    parser.add_argument(
+        "--detector",
+        default="AltCVDetection",
+        help="a detector exported by mugshot.cv, or a module:Class reference (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--capture-profile",
+        default=None,
+        help="capture profile of camera sources: qvga, vga, hd, fhd or auto (default: the driver's defaults)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=5,
+        help="leading frames excluded from measurements (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-frames", type=int, default=None, help="stop after this many frames"
+    )
+    parser.add_argument(
+        "--mirror",
+        action="store_true",
+        help="flip frames horizontally, as the camera feed does",
+    )
+    parser.add_argument(
+        "--no-annotate",
+        dest="annotate",
+        action="store_false",
+        help="only detect, without drawing annotations, as when the preview is hidden",
+    )
+    parser.add_argument(
+        "--stages",
+        action="store_true",
+        help="also measure the time spent in each stage of the detector",
+    )
+    parser.add_argument(
+        "--json", metavar="PATH", help="also write the results to a JSON file"
+    )
+
+    suite = parser.add_argument_group(
+        "regression suite",
+        "benchmark both detectors, preview compositing and mouse output, and compare them with a baseline",
+    )
+    suite.add_argument("--suite", action="store_true", help="run the regression suite")
+    suite.add_argument(
+        "--case",
+        action="append",
+        help="only run the suite benchmark with this name, may be repeated",
+    )
+    suite.add_argument(
+        "--save-baseline", metavar="PATH", help="write the suite results as a baseline"
+    )
+    suite.add_argument(
+        "--compare",
+        metavar="PATH",
+        help="compare the suite results with a baseline, failing on regressions",
+    )
+    suite.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="fraction of the baseline's median latency a benchmark may regress by (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="measure the import time of the app and of each detector, in fresh interpreters",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    enable_metrics(args.stages)
+
+    if args.startup:
+        run_startup_main(args)
+        return
+    if args.suite:
+        sys.exit(run_suite_main(args))
+    if args.source is None:
+        parser.error("a source is required without --suite")
+
+    detection = load_detector_class(args.detector)()
+    try:
+        result = run_benchmark(
+            open_source(args.source, args.capture_profile),
+            detection,
+            warmup=args.warmup,
+            max_frames=args.max_frames,
+            mirror=args.mirror,
+            annotate=args.annotate,
+        )
+    finally:
+        detection.close()
+
+    summary = result.summary()
+    latency = summary["latency_ms"]
+    print(f"detector   {summary['detector']}")
+    print(f"frames     {summary['frames']} in {summary['elapsed_s']:.2f} s")
+    print(f"fps        {summary['fps']:.1f}")
+    print(
+        f"latency    mean {latency['mean']:.1f} ms, p50 {latency['p50']:.1f} ms, "
+        f"p90 {latency['p90']:.1f} ms, p99 {latency['p99']:.1f} ms, max {latency['max']:.1f} ms"
+    )
+    if summary["peak_rss_bytes"] is not None:
+        print(f"peak rss   {summary['peak_rss_bytes'] / 2**20:.1f} MiB")
+    for name, stage in summary["stages_ms"].items():
+        print(
+            f"  {name:<14} x{stage['count']:<6} mean {stage['mean']:.2f} ms, "
+            f"p50 {stage['p50']:.2f} ms, p90 {stage['p90']:.2f} ms, p99 {stage['p99']:.2f} ms"
+        )
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(summary, file, indent=2)
+
+
+def run_startup_main(args):
+    """Runs the startup benchmark from parsed arguments."""
+    timings = [measure_import(module) for module in STARTUP_MODULES]
+    for timing in timings:
+        print(f"{timing.module:<32} {timing.seconds * 1000:8.1f} ms")
+        for name, seconds in timing.slowest:
+            print(f"  {name:<30} {seconds * 1000:8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump([asdict(timing) for timing in timings], file, indent=2)
+
+
+def run_suite_main(args) -> int:
+    """Runs the regression suite from parsed arguments, and returns the exit status."""
+    if args.source is None:
+        frames = synthetic_frames(count=args.max_frames or 30)
+    else:
+        frames = read_frames(
+            open_source(args.source, args.capture_profile),
+            max_frames=args.max_frames or 30,
+        )
+
+    cases = default_cases()
+    if args.case:
+        cases = [case for case in cases if case.name in args.case]
+    results = run_suite(frames, cases, warmup=args.warmup)
+
+    for name, case in results["cases"].items():
+        latency = case["latency_ms"]
+        print(f"{name:<32} p50 {latency['p50']:8.2f} ms, p90 {latency['p90']:8.2f} ms")
+    for name, reason in results["skipped"].items():
+        print(f"{name:<32} skipped: {reason}")
+
+    if args.json:
+        save_results(results, args.json)
+    if args.save_baseline:
+        save_results(results, args.save_baseline)
+
+    if args.compare:
+        regressions = compare_results(
+            results, load_results(args.compare), tolerance=args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+from dataclasses import dataclass, field
+import importlib
+import logging
+import sys
+import time
+from typing import Optional
+import cv2
+import numpy as np
+
+from mugshot.cv import BaseCVDetection, DetectorRegistry
+from mugshot.feed import FrameSource
+from mugshot.telemetry import metrics_enabled, reset_metrics, snapshot
+
+
+@dataclass
+class BenchmarkResult:
+    """A dataclass for storing the measurements of a benchmark run."""
+
+    detector: str
+    """Name of the benchmarked detector class."""
+
+    frames: int = 0
+    """Number of measured frames, excluding warm-up frames."""
+
+    elapsed: float = 0.0
+    """Time in seconds spent processing measured frames, excluding frame reads."""
+
+    latencies_ms: list[float] = field(default_factory=list)
+    """Per-frame processing latency in milliseconds."""
+
+    peak_rss: Optional[int] = None
+    """Peak resident set size of the process in bytes, None if unavailable on this platform."""
+
+    stages_ms: dict[str, dict[str, float]] = field(default_factory=dict)
+    """Per-stage latency statistics in milliseconds, keyed by stage name. Only filled when metrics are enabled, see `mugshot.telemetry`."""
+
+    @property
+    def fps(self) -> float:
+        """Measured frames per second."""
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Returns the `q`-th percentile (0 to 100) of per-frame latency in milliseconds."""
+        if not self.latencies_ms:
+            return 0.0
+        return float(np.percentile(self.latencies_ms, q))
+
+    def summary(self) -> dict:
+        """Returns the measurements as a JSON-serializable dictionary."""
+        return {
+            "detector": self.detector,
+            "frames": self.frames,
+            "elapsed_s": self.elapsed,
+            "fps": self.fps,
+            "latency_ms": {
+                "mean": float(np.mean(self.latencies_ms)) if self.latencies_ms else 0.0,
+                "p50": self.percentile(50),
+                "p90": self.percentile(90),
+                "p99": self.percentile(99),
+                "max": max(self.latencies_ms, default=0.0),
+            },
+            "peak_rss_bytes": self.peak_rss,
+            "stages_ms": self.stages_ms,
+        }
+
+
+def peak_rss() -> Optional[int]:
+    """Returns the peak resident set size of the current process in bytes.
+
+    Returns None on platforms without the `resource` module (e.g. Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, and in kilobytes elsewhere
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def load_detector_class(name: str) -> type[BaseCVDetection]:
+    """Resolves a detector class from its name.
+
+    `name` is either a detector of `DetectorRegistry` (e.g. `AltCVDetection`), another class
+    exported by `mugshot.cv`, or a fully qualified `module:Class` reference.
+    """
+    if name in DetectorRegistry.names() or ":" in name:
+        return DetectorRegistry.load(name)
+
+    module_name, _, class_name = name.rpartition(":")
+    module = importlib.import_module(module_name or "mugshot.cv")
+    cls = getattr(module, class_name, None)
+    if not (isinstance(cls, type) and issubclass(cls, BaseCVDetection)):
+        raise ValueError(f"{name!r} is not a BaseCVDetection subclass")
+    return cls
+
+
+def run_benchmark(
+    source: FrameSource,
+    detection: BaseCVDetection,
+    warmup: int = 0,
+    max_frames: Optional[int] = None,
+    mirror: bool = False,
+    annotate: bool = True,
+) -> BenchmarkResult:
+    """Pushes every frame of `source` through `detection.process_frame` and measures it.
+
+    Arguments:
+    - `source`: FrameSource -- Frames to process, opened if not already open
+    - `detection`: BaseCVDetection -- The detector to benchmark
+    - `warmup`: int -- Number of leading frames processed but excluded from measurements
+    - `max_frames`: Optional[int] -- Stop after this many measured frames, None for the whole source
+    - `mirror`: bool -- Whether to flip frames horizontally like `FeedWorker` does
+    - `annotate`: bool -- Whether to annotate frames, or only run `detection.detect` as `CVWorker` does when the preview is hidden
+
+    Returns:
+    - A `BenchmarkResult` holding the measurements, with per-stage timings if metrics are enabled.
+    """
+    result = BenchmarkResult(detector=type(detection).__name__)
+
+    if not source.is_opened() and not source.open():
+        logging.error("Frame source could not be opened")
+        return result
+
+    try:
+        reset_metrics()
+        seen = 0
+        while max_frames is None or result.frames < max_frames:
+            frame = source.read()
+            if frame is None:
+                break
+            if mirror:
+                frame = cv2.flip(frame, 1)
+
+            start = time.perf_counter()
+            if annotate:
+                detection.process_frame(frame)
+            else:
+                detection.detect(frame)
+            latency = time.perf_counter() - start
+
+            seen += 1
+            if seen <= warmup:
+                if seen == warmup:
+                    # Stage timings only cover measured frames
+                    reset_metrics()
+                continue
+
+            result.frames += 1
+            result.elapsed += latency
+            result.latencies_ms.append(latency * 1000)
+    finally:
+        source.release()
+
+    result.peak_rss = peak_rss()
+    if metrics_enabled():
+        result.stages_ms = {
+            name: {
+                "count": stage.count,
+                "mean": stage.total / stage.count * 1000,
+                "p50": stage.p50 * 1000,
+                "p90": stage.p90 * 1000,
+                "p99": stage.p99 * 1000,
+            }
+            for name, stage in snapshot().items()
+        }
+    return result
@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+import os
+import subprocess
+import sys
+
+STARTUP_MODULES = (
+    "mugshot.app",
+    "mugshot.cv._alt_cv_detection",
+    "mugshot.cv._cv_detection",
+)
+"""Modules imported on the way to the first window, and the detectors imported after it."""
+
+
+@dataclass
+class ImportTiming:
+    """A dataclass for the time taken to import a module in a fresh interpreter."""
+
+    module: str
+    """Name of the imported module."""
+
+    seconds: float
+    """Time in seconds to import the module and everything it imports, the best of all runs."""
+
+    slowest: list[tuple[str, float]] = field(default_factory=list)
+    """The slowest top-level dependencies as `(module, seconds)` tuples, including what they import."""
+
+
+def measure_import(module: str, repeat: int = 3, top: int = 5) -> ImportTiming:
+    """Measures the import time of `module` with `python -X importtime`, in fresh interpreters so
+    that nothing is already imported.
+
+    Arguments:
+    - `module`: str -- Module to import
+    - `repeat`: int -- Number of interpreters to measure, the fastest run is kept
+    - `top`: int -- Number of slowest dependencies to report
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    best = None
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+        timing = _parse_importtime(module, completed.stderr, top)
+        if best is None or timing.seconds < best.seconds:
+            best = timing
+    assert best is not None
+    return best
+
+
+def _parse_importtime(module: str, output: str, top: int) -> ImportTiming:
+    """Parses the `import time: self [us] | cumulative | imported package` lines of
+    `-X importtime`, where children are listed before their parent and indented below it.
+    """
+    parts = module.split(".")
+    measured = {".".join(parts[: i + 1]) for i in range(len(parts))}
+
+    total = 0.0
+    direct: list[tuple[str, float]] = []
+    children: list[tuple[str, float]] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        seconds = int(cumulative) / 1e6
+
+        if depth == 1:
+            children.append((name, seconds))
+        elif depth == 0:
+            # Modules imported by the interpreter itself, e.g. `site`, are not measured
+            if name in measured:
+                total += seconds
+                direct += children
+            children = []
+
+    direct.sort(key=lambda item: item[1], reverse=True)
+    return ImportTiming(module, total, direct[:top])
@@ -0,0 +1,242 @@
+from dataclasses import dataclass
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Optional
+import cv2
+import numpy as np
+
+from mugshot.feed import FrameSource
+from ._runner import BenchmarkResult, peak_rss
+
+type Step = Callable[[np.ndarray], Any]
+
+
+@dataclass
+class SuiteCase:
+    """A dataclass describing a benchmark of the regression suite."""
+
+    name: str
+    """Name of the benchmark, also the key of its result."""
+
+    setup: Callable[[], Step | tuple[Step, Callable[[], None]]]
+    """Prepares the benchmark, and returns the function measured on each frame, or a `(step, teardown)` tuple whose teardown is called once the benchmark is done, e.g. to restore global state. Raising `ImportError`, `OSError` or `RuntimeError`, e.g. for a missing dependency or model, skips the benchmark."""
+
+
+def synthetic_frames(
+    count: int = 30, size: tuple[int, int] = (640, 480), seed: int = 0
+) -> list[np.ndarray]:
+    """Generates reproducible BGR frames of a face-like shape moving over a textured
+    background, for benchmarking without recorded footage.
+
+    Arguments:
+    - `count`: int -- Number of frames
+    - `size`: tuple[int, int] -- `(width, height)` of the frames
+    - `seed`: int -- Seed of the background texture and noise
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    background = cv2.GaussianBlur(
+        rng.integers(0, 256, (height, width, 3), np.uint8), (0, 0), 3
+    )
+
+    frames = []
+    for i in range(count):
+        frame = background.copy()
+        angle = 2 * np.pi * i / max(count, 1)
+        cx = int(width * (0.5 + 0.15 * np.cos(angle)))
+        cy = int(height * (0.5 + 0.1 * np.sin(angle)))
+        fw, fh = width // 8, height // 5
+
+        # Face, eyes, and a mouth that opens and closes every 15 frames
+        cv2.ellipse(frame, (cx, cy), (fw, fh), 0, 0, 360, (150, 170, 210), -1)
+        for side in (-1, 1):
+            eye = (cx + side * fw // 2, cy - fh // 4)
+            cv2.ellipse(frame, eye, (fw // 5, fh // 10), 0, 0, 360, (40, 40, 40), -1)
+        mouth = (fw // 3, fh // 8 if (i // 15) % 2 else fh // 20)
+        cv2.ellipse(frame, (cx, cy + fh // 2), mouth, 0, 0, 360, (60, 60, 150), -1)
+
+        noise = rng.integers(-8, 9, frame.shape, np.int16)
+        frames.append(np.clip(frame + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+def read_frames(source: FrameSource, max_frames: int = 30) -> list[np.ndarray]:
+    """Reads up to `max_frames` frames of `source` into memory, e.g. recorded fixture footage."""
+    frames = []
+    if not source.is_opened() and not source.open():
+        logging.error("Frame source could not be opened")
+        return frames
+    try:
+        while len(frames) < max_frames:
+            frame = source.read()
+            if frame is None:
+                break
+            frames.append(frame)
+    finally:
+        source.release()
+    return frames
+
+
+def _detector_case(name: str) -> SuiteCase:
+    def setup():
+        from mugshot.cv import DetectorRegistry
+
+        detection = DetectorRegistry.load(name)()
+        # Releases the detector's models, so later benchmarks start from the same state
+        return (detection.process_frame, detection.close)
+
+    return SuiteCase(f"{name}.process_frame", setup)
+
+
+def _feed_case() -> SuiteCase:
+    def setup():
+        # Compositing needs a QApplication, but no display
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication
+        from mugshot.components.feed import Feed, RectFloat
+
+        app = QApplication.instance() or QApplication([])
+        feed = Feed(mapArea=RectFloat(0.2, 0.2, 0.8, 0.8))
+
+        def step(frame):
+            feed.setFeed(frame)
+
+        # The application must outlive the benchmark
+        step.app = app
+        return step
+
+    return SuiteCase("Feed.setFeed", setup)
+
+
+def _mouse_case() -> SuiteCase:
+    def setup():
+        from mugshot.mouse_input import (
+            MouseAction,
+            RecordingBackend,
+            Screen,
+            set_output_backend,
+        )
+
+        backend = RecordingBackend()
+        previous = set_output_backend(backend, close_previous=False)
+        positions = np.random.default_rng(0).random((256, 2)).tolist()
+        area = (0.2, 0.2, 0.8, 0.8)
+        index = 0
+
+        def step(frame):
+            # The path of a cursor position from `MainWindow.doInputs` to the output backend
+            nonlocal index
+            x, y = Screen.map_from_area(positions[index % len(positions)], area)
+            MouseAction.move_to(round(x), round(y))
+            index += 1
+            if len(backend.events) > 4096:
+                backend.events.clear()
+
+        def teardown():
+            set_output_backend(previous)
+
+        return (step, teardown)
+
+    return SuiteCase("MouseAction.move_to", setup)
+
+
+def default_cases() -> list[SuiteCase]:
+    """Returns the benchmarks of the regression suite: both detectors, the preview
+    compositing, and the mouse mapping path against a `RecordingBackend`, which replaces the
+    current output backend while it runs."""
+    return [
+        _detector_case("AltCVDetection"),
+        _detector_case("CVDetection"),
+        _feed_case(),
+        _mouse_case(),
+    ]
+
+
+def run_suite(
+    frames: list[np.ndarray],
+    cases: Optional[list[SuiteCase]] = None,
+    warmup: int = 3,
+    repeat: int = 1,
+) -> dict:
+    """Runs every benchmark of the suite over `frames`.
+
+    Arguments:
+    - `frames`: list[np.ndarray] -- BGR fixture frames, e.g. from `synthetic_frames`
+    - `cases`: Optional[list[SuiteCase]] -- Benchmarks to run, `default_cases()` if None
+    - `warmup`: int -- Number of leading frames processed but excluded from measurements
+    - `repeat`: int -- Number of passes over `frames`
+
+    Returns:
+    - A JSON-serializable dictionary of the summary of each benchmark under "cases", and the reason each skipped benchmark was skipped under "skipped".
+    """
+    results: dict[str, Any] = {"frames": len(frames), "cases": {}, "skipped": {}}
+    for case in default_cases() if cases is None else cases:
+        try:
+            prepared = case.setup()
+        except (ImportError, OSError, RuntimeError) as error:
+            logging.warning(f"Skipping {case.name}: {error}")
+            results["skipped"][case.name] = str(error)
+            continue
+        step, teardown = prepared if isinstance(prepared, tuple) else (prepared, None)
+
+        result = BenchmarkResult(detector=case.name)
+        try:
+            for i, frame in enumerate(frames * repeat):
+                start = time.perf_counter()
+                step(frame)
+                latency = time.perf_counter() - start
+                if i < warmup:
+                    continue
+                result.frames += 1
+                result.elapsed += latency
+                result.latencies_ms.append(latency * 1000)
+        finally:
+            if teardown is not None:
+                teardown()
+
+        result.peak_rss = peak_rss()
+        results["cases"][case.name] = result.summary()
+    return results
+
+
+def compare_results(
+    current: dict,
+    baseline: dict,
+    tolerance: float = 0.25,
+    min_delta_ms: float = 0.1,
+    statistic: str = "p50",
+) -> list[str]:
+    """Compares suite results with baseline results.
+
+    A benchmark regresses when its `statistic` latency exceeds the baseline's by more than
+    `tolerance` times the baseline, and by more than `min_delta_ms`, so that timer noise on very
+    fast benchmarks is not a regression. Benchmarks missing from either side are ignored.
+
+    Returns:
+    - A description of each regression, empty if there are none.
+    """
+    regressions = []
+    for name, case in current["cases"].items():
+        if name not in baseline["cases"]:
+            continue
+        now = case["latency_ms"][statistic]
+        before = baseline["cases"][name]["latency_ms"][statistic]
+        if now - before > max(before * tolerance, min_delta_ms):
+            regressions.append(
+                f"{name}: {statistic} {now:.2f} ms, {now - before:+.2f} ms over the baseline's {before:.2f} ms"
+            )
+    return regressions
+
+
+def save_results(results: dict, path: str):
+    """Writes suite results to a JSON file, e.g. as a baseline."""
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+def load_results(path: str) -> dict:
+    """Reads suite results from a JSON file written by `save_results`."""
+    with open(path) as file:
+        return json.load(file)
@@ -1,11 +1,14 @@
 from dataclasses import dataclass
 from enum import Flag, auto
-from PySide6.QtCore import Qt, QSize, Signal
+from PySide6.QtCore import QEvent, QObject, Qt, QSize, Signal
 from PySide6.QtWidgets import QLabel
 from PySide6.QtGui import QImage, QMouseEvent, QPixmap
+import time
 import cv2
 import numpy as np
 
+from mugshot.telemetry import format_stats, snapshot, span
+
 
 @dataclass
 class Rect:
@@ -33,8 +36,21 @@ class Border(Flag):
 class Feed(QLabel):
     SIZE = QSize(640, 480)
 
+    DIM_ALPHA = 0.6
+    """Brightness factor of the feed outside the map area."""
+
+    _DIM_LUT = (np.arange(256, dtype=np.float32) * np.float32(DIM_ALPHA)).astype(
+        np.uint8
+    )
+
+    STATS_INTERVAL = 0.5
+    """Seconds between refreshes of the stats overlay."""
+
     mapAreaChanged = Signal(RectFloat)
 
+    previewVisibilityChanged = Signal(bool)
+    """Public signal `bool`, whether the feed can be seen, emitted when its window is shown, hidden, minimized or restored."""
+
     def __init__(self, *args, mapArea: RectFloat, **kwargs):
         super().__init__(*args, **kwargs)
         placeHolderImage = QImage(self.SIZE, QImage.Format.Format_BGR888)
@@ -48,22 +64,110 @@ class Feed(QLabel):
         )
         self.dragging = Border(0)
 
+        # Preallocated buffers for compositing the preview
+        self._preview = np.empty((self.SIZE.height(), self.SIZE.width(), 3), np.uint8)
+        self._resized = np.empty_like(self._preview)
+        self._mapAreaKey = None
+        self._mapSlices = (slice(0), slice(0))
+
+        self._previewVisible = False
+        self._watchedWindow = None
+
+        self.statsOverlay = False
+        """Whether the timing statistics of every stage are drawn over the feed."""
+        self._statsLines: list[str] = []
+        self._statsRefreshed = 0.0
+
+    def _mapAreaSlices(self) -> tuple[slice, slice]:
+        """Returns the `(rows, columns)` slices of the map area, recomputed only when it changes."""
+        key = (self.mapArea.x1, self.mapArea.y1, self.mapArea.x2, self.mapArea.y2)
+        if key != self._mapAreaKey:
+            self._mapAreaKey = key
+            # Same pixels as a filled cv2.rectangle, which includes both corners
+            x1, x2 = sorted((self.mapArea.x1, self.mapArea.x2))
+            y1, y2 = sorted((self.mapArea.y1, self.mapArea.y2))
+            self._mapSlices = (slice(max(y1, 0), y2 + 1), slice(max(x1, 0), x2 + 1))
+        return self._mapSlices
+
     def setFeed(self, frame: cv2.typing.MatLike):
-        alpha = 0.6
-        mask = np.zeros((self.SIZE.height(), self.SIZE.width(), 3), np.float32)
-        mask.fill(alpha)
-        topLeft = (self.mapArea.x1, self.mapArea.y1)
-        bottomRight = (self.mapArea.x2, self.mapArea.y2)
-        cv2.rectangle(mask, topLeft, bottomRight, (1.0, 1.0, 1.0), -1)
-
-        dst = cv2.multiply(mask, frame.astype(np.float32)).astype(np.uint8)
+        """Public slot to show a BGR frame, dimmed outside the map area.
+
+        Compositing is done in place in integer arithmetic, into preallocated buffers.
+        """
+        with span("preview"):
+            self._showFeed(frame)
+
+    def _showFeed(self, frame: cv2.typing.MatLike):
+        width, height = self.SIZE.width(), self.SIZE.height()
+        if frame.shape[:2] != (height, width):
+            frame = cv2.resize(frame, (width, height), dst=self._resized)
+
+        # Dim the whole frame with a lookup table, then restore the map area
+        cv2.LUT(frame, self._DIM_LUT, dst=self._preview)
+        rows, columns = self._mapAreaSlices()
+        self._preview[rows, columns] = frame[rows, columns]
+        if self.statsOverlay:
+            self._drawStats()
+
         image = QImage(
-            dst.data, dst.shape[1], dst.shape[0], QImage.Format.Format_BGR888
+            self._preview.data, width, height, 3 * width, QImage.Format.Format_BGR888
         )
-
-        image = image.scaled(self.SIZE, Qt.AspectRatioMode.KeepAspectRatio)
         self.setPixmap(QPixmap.fromImage(image))
 
+    def setStatsOverlay(self, enabled: bool):
+        """Public slot to show or hide the timing statistics of every stage over the feed.
+
+        Statistics are only collected while metrics are enabled, see `mugshot.telemetry`.
+        """
+        self.statsOverlay = enabled
+
+    def _drawStats(self):
+        """Draws the timing statistics over the preview, refreshed every `STATS_INTERVAL`."""
+        now = time.monotonic()
+        if now - self._statsRefreshed >= self.STATS_INTERVAL:
+            self._statsRefreshed = now
+            self._statsLines = format_stats(snapshot())
+
+        for i, line in enumerate(self._statsLines):
+            origin = (8, 18 + 16 * i)
+            # Outlined, to be readable on any background
+            for color, thickness in (((0, 0, 0), 3), ((255, 255, 255), 1)):
+                cv2.putText(
+                    self._preview,
+                    line,
+                    origin,
+                    cv2.FONT_HERSHEY_PLAIN,
+                    1.0,
+                    color,
+                    thickness,
+                    cv2.LINE_AA,
+                )
+
+    def _updatePreviewVisibility(self):
+        visible = self.isVisible() and not self.window().isMinimized()
+        if visible != self._previewVisible:
+            self._previewVisible = visible
+            self.previewVisibilityChanged.emit(visible)
+
+    def showEvent(self, ev) -> None:
+        # Minimizing does not hide child widgets, so watch the window's state too
+        if self._watchedWindow is not self.window():
+            if self._watchedWindow is not None:
+                self._watchedWindow.removeEventFilter(self)
+            self._watchedWindow = self.window()
+            self._watchedWindow.installEventFilter(self)
+        super().showEvent(ev)
+        self._updatePreviewVisibility()
+
+    def hideEvent(self, ev) -> None:
+        super().hideEvent(ev)
+        self._updatePreviewVisibility()
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.WindowStateChange:
+            self._updatePreviewVisibility()
+        return super().eventFilter(watched, event)
+
     def mouseMoveEvent(self, ev) -> None:
         if Border.LEFT in self.dragging:
             self.mapArea.x1 = int(ev.position().x())
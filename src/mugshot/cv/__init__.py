@@ -1,4 +1,35 @@
 from ._cv_worker import CVWorker
-from ._alt_cv_detection import AltCVDetection
-from ._cv_detection import CVDetection
-from ._base_cv_detection import BaseCVDetection
\ No newline at end of file
+from ._base_cv_detection import BaseCVDetection
+from ._detector_registry import DetectorRegistry
+from ._detections import Detections, FaceResult, EyesResult, TongueResult
+from ._overlay import draw_detections
+from ._primary_face import PrimaryFaceSelector, box_iou
+from ._detection_image import DetectionImage
+from ._landmarks import (
+    LandmarkBuffer,
+    LandmarkMetrics,
+    eye_aspect_ratios,
+    mouth_aspect_ratios,
+    head_pose_ratios,
+    landmark_metrics,
+)
+from ._render_policy import RenderMode, RenderPolicy
+from ._quality_governor import QualityGovernor, QualityLevel, DEFAULT_QUALITY_LEVELS
+from ._model_registry import ModelRegistry
+from ._artifact_cache import ArtifactCache
+from ._pipeline import PipelineScheduler, Stage, StageResult
+from ._process_pool import ProcessPoolDetection, SharedFrameRing
+from ._yolo_backend import (
+    YoloBackend,
+    YoloDetection,
+    UltralyticsBackend,
+    OnnxBackend,
+    create_yolo_backend,
+)
+
+
+def __getattr__(name: str):
+    # Detectors are imported on first use, see `DetectorRegistry`
+    if name in ("AltCVDetection", "CVDetection"):
+        return DetectorRegistry.load(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
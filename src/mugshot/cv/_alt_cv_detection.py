@@ -1,14 +1,26 @@
 from ._base_cv_detection import BaseCVDetection
+from ._detection_image import DetectionImage
+from ._detections import Box, Detections, EyesResult, FaceResult, TongueResult
+from ._face_tracker import FaceTracker
+from ._model_registry import ModelRegistry
+from ._pipeline import PipelineScheduler, Stage
+from ._primary_face import PrimaryFaceSelector
+from ._quality_governor import QualityLevel
+from ._yolo_backend import create_yolo_backend
 
 from mugshot.mouse_input import FrameInput
+from mugshot.telemetry import span
 import os
+import time
+from typing import Optional
 import cv2
-from ultralytics import YOLO
 
 # Set up paths
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_DIR = os.path.join(CURRENT_DIR, "best_alt.pt")
 LANDMARK_MODEL_DIR = os.path.join(CURRENT_DIR, "shape_predictor_68_face_landmarks.dat")
+FACE_CASCADE = "haarcascade_frontalface_default.xml"
+EYE_CASCADE = "haarcascade_eye.xml"
 
 
 class AltCVDetection(BaseCVDetection):
@@ -16,165 +28,365 @@ class AltCVDetection(BaseCVDetection):
     EYE_AR_THRESH = 0.45
     """Threshold for eye closure"""
 
-    EYE_AR_CONSEC_FRAMES = 3
-    """Minimum consecutive frames to consider eye closed"""
+    def __init__(
+        self,
+        track: bool = False,
+        detect_interval: int = 10,
+        min_track_confidence: float = 0.5,
+        roi_padding: float = 0.15,
+        yolo_backend: str = "ultralytics",
+        yolo_imgsz: Optional[int] = None,
+        stage_rates: Optional[dict[str, Optional[float]]] = None,
+        detection_scale: float = 1.0,
+        max_detection_width: Optional[int] = 640,
+        min_face_size: int = 0,
+    ):
+        """Arguments:
+        - `track`: bool -- Whether to track a single face between full detections instead of detecting every frame
+        - `detect_interval`: int -- In tracking mode, the number of frames between full detections
+        - `min_track_confidence`: float -- In tracking mode, a full detection is run early when the tracker's confidence drops below this
+        - `roi_padding`: float -- In tracking mode, the fraction of the face size by which eye and tongue searches are padded, to absorb tracking error
+        - `yolo_backend`: str -- Inference backend for the tongue model, one of "ultralytics", "onnx" or "onnx-int8"
+        - `yolo_imgsz`: Optional[int] -- Inference size of the tongue model, 640 if None. The ONNX backends use it as a fixed input shape
+        - `stage_rates`: Optional[dict[str, Optional[float]]] -- Maximum rates in Hz of the "eyes" and "tongue" stages, e.g. `{"eyes": 15, "tongue": 5}`. Stages with a rate run asynchronously on the largest face, and their latest results are merged into every frame's inputs. None to run every stage on every frame
+        - `detection_scale`: float -- Factor by which frames are downscaled for face detection and tracking, eyes and tongue are still searched at full resolution
+        - `max_detection_width`: Optional[int] -- Frames are further downscaled for face detection to at most this width, None for no limit
+        - `min_face_size`: int -- Minimum face size in frame pixels, smaller faces are ignored
+        """
+        # Load the YOLO model and Haar cascades in parallel, shared with other detectors
+        self.yolo, self.face_cascade, self.eye_cascade = (
+            ModelRegistry.load_concurrently(
+                lambda: create_yolo_backend(yolo_backend, MODEL_DIR, imgsz=yolo_imgsz),
+                lambda: ModelRegistry.cascade(FACE_CASCADE),
+                lambda: ModelRegistry.cascade(EYE_CASCADE),
+            )
+        )
+
+        # Only the primary user's face gets eye and tongue detection
+        self.primary_face = PrimaryFaceSelector()
+
+        # Faces are located on a downscaled copy of the frame
+        self.detection_image = DetectionImage(detection_scale, max_detection_width)
+        self.min_face_size = min_face_size
+        self.detection_scale = detection_scale
+
+        # Detect-then-track mode
+        self.track = track
+        self.detect_interval = detect_interval
+        self.min_track_confidence = min_track_confidence
+        self.roi_padding = roi_padding if track else 0.0
+        self.tracker = FaceTracker()
+        self._frames_since_detection = 0
+        self._base_detect_interval = detect_interval
+
+        # Maximum tongue rate outside of multi-rate mode, set by `apply_quality`, the latest
+        # result is reused in between
+        self.tongue_rate: Optional[float] = None
+        self._next_tongue = 0.0
+        self._last_tongue: Optional[TongueResult] = None
+
+        # Multi-rate mode, the face stage always runs on every frame for the cursor
+        self.scheduler = None
+        self._stage_rates = stage_rates or {}
+        if stage_rates is not None:
+            self.scheduler = PipelineScheduler(
+                [
+                    Stage("face", self._face_stage),
+                    Stage(
+                        "eyes",
+                        self._eyes_stage,
+                        rate=stage_rates.get("eyes"),
+                        asynchronous=stage_rates.get("eyes") is not None,
+                    ),
+                    Stage(
+                        "tongue",
+                        self._tongue_stage,
+                        rate=stage_rates.get("tongue"),
+                        asynchronous=stage_rates.get("tongue") is not None,
+                    ),
+                ]
+            )
+
+    def apply_quality(self, level: QualityLevel):
+        scale = self.detection_scale * level.detection_scale
+        if scale != self.detection_image.scale:
+            # The tracker's previous image has the old size, so start over from a detection
+            self.detection_image.scale = scale
+            self.tracker.reset()
+        self.detect_interval = max(
+            round(self._base_detect_interval * level.detect_interval_scale), 1
+        )
+
+        if self.scheduler is None:
+            self.tongue_rate = level.tongue_rate
+            return
+        for stage in self.scheduler.stages:
+            if stage.name == "tongue":
+                stage.rate = self._slowest_rate(
+                    self._stage_rates.get("tongue"), level.tongue_rate
+                )
+
+    @staticmethod
+    def _slowest_rate(a: Optional[float], b: Optional[float]) -> Optional[float]:
+        """Returns the lower of two rates, where None means unlimited."""
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return min(a, b)
+
+    def _tongue_due(self) -> bool:
+        """Returns whether the tongue should be detected on this frame, according to
+        `tongue_rate`."""
+        if self.tongue_rate is None:
+            return True
+        now = time.monotonic()
+        if now < self._next_tongue:
+            return False
+        self._next_tongue = now + 1 / self.tongue_rate
+        return True
 
-    def __init__(self):
-        # Load the YOLO model
-        self.yolo_model = YOLO(MODEL_DIR)
+    def close(self):
+        if self.scheduler is not None:
+            self.scheduler.close()
+        self.yolo.close()
+        ModelRegistry.release(self.face_cascade)
+        ModelRegistry.release(self.eye_cascade)
+
+    def _locate_faces(
+        self, small: cv2.typing.MatLike
+    ) -> tuple[list[Box], Optional[int]]:
+        """Locates faces from `small`, the grayscale detection image prepared by
+        `detection_image`.
+
+        Faces are detected and tracked on the downscaled detection image, and their boxes are
+        mapped back to the frame. In tracking mode, only the primary face is returned, and it is
+        followed by the tracker between full detections.
+
+        Returns:
+        - A tuple of `(faces, primary)`, referring to the `(x, y, w, h)` face boxes in the frame and the index of the primary face among them, None if it is not in view.
+        """
+        image = self.detection_image
+        min_size = image.min_size(self.min_face_size)
+
+        if not self.track:
+            with span("haar_face"):
+                detected = self.face_cascade.detectMultiScale(
+                    small, 1.3, 5, minSize=min_size
+                )
+            faces = [image.to_frame(face) for face in detected]
+            return (faces, self.primary_face.select(faces))
+
+        if self.tracker.active and self._frames_since_detection < self.detect_interval:
+            with span("track"):
+                box = self.tracker.update(small)
+            if box is not None and self.tracker.confidence >= self.min_track_confidence:
+                self._frames_since_detection += 1
+                face = image.to_frame(self._clip_box(box, small.shape))
+                self.primary_face.follow(face)
+                return ([face], 0)
+
+        self._frames_since_detection = 0
+        with span("haar_face"):
+            detected = self.face_cascade.detectMultiScale(
+                small, 1.3, 5, minSize=min_size
+            )
+        faces = [image.to_frame(face) for face in detected]
+        primary = self.primary_face.select(faces)
+        if primary is None:
+            self.tracker.reset()
+            return ([], None)
+
+        x, y, w, h = detected[primary]
+        self.tracker.start(small, (int(x), int(y), int(w), int(h)))
+        return ([faces[primary]], 0)
+
+    @staticmethod
+    def _clip_box(box, shape) -> Box:
+        """Clips an `(x, y, w, h)` box to a frame of the given shape."""
+        frame_h, frame_w = shape[:2]
+        x1, y1 = max(box[0], 0), max(box[1], 0)
+        x2, y2 = min(box[0] + box[2], frame_w), min(box[1] + box[3], frame_h)
+        return (x1, y1, max(x2 - x1, 0), max(y2 - y1, 0))
+
+    def _search_region(self, face: Box) -> tuple[int, int, int, int]:
+        """Returns the `(x1, y1, x2, y2)` region to search for eyes and tongue in, padded in
+        tracking mode."""
+        face_x, face_y, face_w, face_h = face
+        pad_x = int(face_w * self.roi_padding)
+        pad_y = int(face_h * self.roi_padding)
+        return (
+            max(face_x - pad_x, 0),
+            max(face_y - pad_y, 0),
+            face_x + face_w + pad_x,
+            face_y + face_h + pad_y,
+        )
 
-    def process_frame(
-        self, frame: cv2.typing.MatLike
-    ) -> tuple[cv2.typing.MatLike, FrameInput]:
-        """Processes a BGR frame and returns an annotated frame and inputs to be executed.
+    def _detect_eyes(self, gray: cv2.typing.MatLike, face: Box) -> EyesResult:
+        """Detects open eyes in a face with Haar cascades. An eye is closed if it is not found."""
+        face_x, face_y, face_w, face_h = face
+        face_center_x = face_x + face_w // 2
+        roi_x, roi_y, roi_x2, roi_y2 = self._search_region(face)
+        gray_face = gray[roi_y:roi_y2, roi_x:roi_x2]
 
-        Annotate the frame and detect the tongue using YOLO and eyes using Haar cascades.
+        # Detect eyes using Haar cascades
+        with span("haar_eye"):
+            eyes = self.eye_cascade.detectMultiScale(gray_face, 1.1, minNeighbors=7)
+        left_eye_detected = False
+        right_eye_detected = False
+        boxes = []
+
+        for ex, ey, ew, eh in eyes:
+            # too small of an eye width, must be an error
+            if ew <= face_w * 0.2:
+                continue
+
+            boxes.append((roi_x + int(ex), roi_y + int(ey), int(ew), int(eh)))
+
+            # Classify as left or right eye
+            eye_center_x = roi_x + ex + ew // 2
+            if eye_center_x < face_center_x:
+                left_eye_detected = True
+            else:
+                right_eye_detected = True
+
+        return EyesResult(not left_eye_detected, not right_eye_detected, boxes)
+
+    def _detect_tongue(self, frame: cv2.typing.MatLike, face: Box) -> TongueResult:
+        """Detects a tongue below a face using YOLO."""
+        face_x, face_y, face_w, face_h = face
+        roi_x, roi_y, roi_x2, roi_y2 = self._search_region(face)
+
+        # Extend face shape down to include tongue
+        crop = frame[roi_y : roi_y2 + int(face_h * 0.2), roi_x:roi_x2]
+
+        # Perform YOLO inference to detect the tongue
+        result = TongueResult()
+        with span("yolo"):
+            predictions = self.yolo.predict(crop, conf=0.5)
+        for detection in predictions:  # Iterate through detections
+            if (
+                detection.cls == 0
+            ):  # Assuming class 0 corresponds to "tongue" in your YOLO model
+                x1, y1, x2, y2 = map(
+                    int, detection.xyxy
+                )  # Coordinates of the bounding box
+                if roi_y + y1 - face_y < face_h * 0.6:
+                    continue
+                result.boxes.append((roi_x + x1, roi_y + y1, x2 - x1, y2 - y1))
+                result.is_tongue_down = (y2 - y1) / (x2 - x1) > 2 / 3
+
+        return result
+
+    def _face_stage(self, inputs: dict) -> tuple[list[Box], Optional[int]]:
+        return self._locate_faces(inputs["small"])
+
+    @staticmethod
+    def _primary_box(
+        located: Optional[tuple[list[Box], Optional[int]]],
+    ) -> Optional[Box]:
+        """Returns the primary face's box from the face stage's result, None if there is none."""
+        if located is None or located[1] is None:
+            return None
+        faces, primary = located
+        return faces[primary]
+
+    def _eyes_stage(self, inputs: dict) -> Optional[EyesResult]:
+        box = self._primary_box(inputs["face"])
+        if box is None:
+            return None
+        return self._detect_eyes(inputs["gray"], box)
+
+    def _tongue_stage(self, inputs: dict) -> Optional[TongueResult]:
+        box = self._primary_box(inputs["face"])
+        if box is None:
+            return None
+        return self._detect_tongue(inputs["frame"], box)
+
+    def detect(self, frame: cv2.typing.MatLike) -> tuple[Detections, FrameInput]:
+        """Detects faces with Haar cascades, then eyes with Haar cascades and the tongue with YOLO
+        on the primary face.
 
         Arguments:
         - `frame`: cv2.Mat -- A 24-bit BGR image
 
         Returns:
-        - A tuple of `(cv2.Mat, FrameInput)`, referring to an annotated frame and the corresponding inputs to be executed.
+        - A tuple of `(Detections, FrameInput)`, referring to the faces found and the corresponding inputs to be executed.
         """
         frame_input = FrameInput(is_left_eye_closed=False, is_right_eye_closed=False)
 
-        # Load Haar cascades
-        face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"  # type: ignore
-        )
-        eye_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + "haarcascade_eye.xml"  # type: ignore
+        with span("preprocess"):
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            small = self.detection_image.prepare(gray)
+
+        if self.scheduler is not None:
+            return self._detect_scheduled(frame, gray, small, frame_input)
+
+        faces, primary = self._locate_faces(small)
+        detections = Detections(
+            faces=[FaceResult(face, primary=False) for face in faces]
         )
+        if primary is None:
+            self._last_tongue = None
+            return (detections, frame_input)
 
-        (frame_h, frame_w, _) = frame.shape
-
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = face_cascade.detectMultiScale(gray, 1.3, 5)
-        annotated_frame = frame
-
-        for face_x, face_y, face_w, face_h in faces:
-            # Calculate center of the face
-            face_center_x = face_x + face_w // 2
-            face_center_y = face_y + face_h // 2
-            frame_input.cursor_pos = (face_center_x / frame_w, face_center_y / frame_h)
-
-            # Display the center of the face
-            cv2.circle(
-                annotated_frame, (face_center_x, face_center_y), 5, (0, 255, 0), -1
-            )  # Green dot at the center
-            cv2.putText(
-                annotated_frame,
-                f"Center: ({face_center_x}, {face_center_y})",
-                (face_center_x + 10, face_center_y - 10),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.5,
-                (0, 255, 0),
-                2,
-            )
+        # Eyes and tongue are only detected on the primary face
+        face = detections.faces[primary]
+        face.primary = True
+        face.eyes = self._detect_eyes(gray, face.box)
+        if self._tongue_due():
+            self._last_tongue = self._detect_tongue(frame, face.box)
+        face.tongue = self._last_tongue
+        self._merge_input(frame_input, frame.shape, face)
 
-            cv2.rectangle(
-                annotated_frame,
-                (face_x, face_y),
-                (face_x + face_w, face_y + face_h),
-                color=(0, 255, 0),
-                thickness=2,
-            )
+        return (detections, frame_input)
 
-            # Extend face shape down to include tongue
-            face = annotated_frame[
-                face_y : face_y + int(face_h * 1.2), face_x : face_x + face_w
-            ]
-            gray_face = gray[face_y : face_y + face_h, face_x : face_x + face_w]
+    def _detect_scheduled(
+        self,
+        frame: cv2.typing.MatLike,
+        gray: cv2.typing.MatLike,
+        small: cv2.typing.MatLike,
+        frame_input: FrameInput,
+    ) -> tuple[Detections, FrameInput]:
+        """Runs the stages through the scheduler, merging the latest result of each stage."""
+        assert self.scheduler is not None
 
-            # Detect eyes using Haar cascades
-            eyes = eye_cascade.detectMultiScale(gray_face, 1.1, minNeighbors=7)
-            left_eye_detected = False
-            right_eye_detected = False
+        results = self.scheduler.run({"frame": frame, "gray": gray, "small": small})
 
-            for ex, ey, ew, eh in eyes:
-                # too small of an eye width, must be an error
-                if ew <= face_w * 0.2:
-                    continue
+        faces, primary = results["face"].value
+        detections = Detections(
+            faces=[FaceResult(face, primary=False) for face in faces]
+        )
+        if primary is None:
+            # Eye and tongue results of the lost face must not be merged once a face is back
+            self.scheduler.reset()
+            return (detections, frame_input)
 
-                eye_center_x = face_x + ex + ew // 2
-                cv2.rectangle(
-                    annotated_frame,
-                    (face_x + ex, face_y + ey),
-                    (face_x + ex + ew, face_y + ey + eh),
-                    color=(255, 0, 0),
-                    thickness=2,
-                )
-                cv2.putText(
-                    annotated_frame,
-                    "Eye",
-                    (face_x + ex, face_y + ey - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (255, 0, 0),
-                    2,
-                )
+        face = detections.faces[primary]
+        face.primary = True
+        face.eyes = results["eyes"].value if "eyes" in results else None
+        face.tongue = results["tongue"].value if "tongue" in results else None
+        self._merge_input(frame_input, frame.shape, face)
+        frame_input.stage_ages = {name: result.age for name, result in results.items()}
 
-                # Classify as left or right eye
-                if eye_center_x < face_center_x:
-                    left_eye_detected = True
-                else:
-                    right_eye_detected = True
-
-            # Display closed eye status if no eye is detected
-            if not left_eye_detected:
-                cv2.putText(
-                    annotated_frame,
-                    "Left Eye Closed",
-                    (face_x, face_y - 20),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (0, 0, 255),
-                    2,
-                )
+        return (detections, frame_input)
+
+    @staticmethod
+    def _merge_input(frame_input: FrameInput, shape, face: FaceResult):
+        """Merges the results for a face into the inputs to be executed."""
+        frame_h, frame_w = shape[:2]
+        face_x, face_y, face_w, face_h = face.box
+
+        # Calculate center of the face
+        face_center_x = face_x + face_w // 2
+        face_center_y = face_y + face_h // 2
+        frame_input.cursor_pos = (face_center_x / frame_w, face_center_y / frame_h)
+
+        if face.eyes is not None:
+            if face.eyes.is_left_eye_closed:
                 frame_input.is_left_eye_closed = True
-            if not right_eye_detected:
-                cv2.putText(
-                    annotated_frame,
-                    "Right Eye Closed",
-                    (face_x + face_w // 2, face_y - 20),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (0, 0, 255),
-                    2,
-                )
+            if face.eyes.is_right_eye_closed:
                 frame_input.is_right_eye_closed = True
 
-            # Perform YOLO inference to detect the tongue
-            results = self.yolo_model.predict(source=face, conf=0.5, save=False)
-
-            assert results[0].boxes is not None
-
-            for box in results[0].boxes:  # Iterate through detections
-                cls = int(box.cls[0])  # Class index
-                if (
-                    cls == 0
-                ):  # Assuming class 0 corresponds to "tongue" in your YOLO model
-                    x1, y1, x2, y2 = map(
-                        int, box.xyxy[0]
-                    )  # Coordinates of the bounding box
-                    if y1 < face_h * 0.6:
-                        continue
-                    cv2.rectangle(
-                        annotated_frame,
-                        (face_x + x1, face_y + y1),
-                        (face_x + x2, face_y + y2),
-                        color=(0, 0, 255),
-                        thickness=2,
-                    )
-                    cv2.putText(
-                        annotated_frame,
-                        "Tongue",
-                        (face_x + x1, face_y + y1 - 10),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.5,
-                        (0, 0, 255),
-                        2,
-                    )
-                    frame_input.is_tongue_down = (y2 - y1) / (x2 - x1) > 2 / 3
-
-        return (annotated_frame, frame_input)
\ No newline at end of file
+        if face.tongue is not None and face.tongue.is_tongue_down is not None:
+            frame_input.is_tongue_down = face.tongue.is_tongue_down
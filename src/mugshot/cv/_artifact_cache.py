@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable
+
+MODEL_CACHE_DIR = os.environ.get(
+    "MUGSHOT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "mugshot")
+)
+"""Directory for prepared model artifacts, overridable with the `MUGSHOT_CACHE_DIR` environment variable."""
+
+
+class ArtifactCache:
+    """A persistent on-disk cache of artifacts prepared from model files, e.g. exported ONNX
+    models, so that they are only prepared on the first (cold) start.
+
+    Artifacts are keyed by the contents of their source model, so a retrained model is prepared
+    again. The digest of each source is remembered in an index along with its size and
+    modification time, so warm starts do not read whole models to find their artifacts.
+
+    Arguments:
+    - `directory`: str -- Directory of the cache, created if needed
+    """
+
+    INDEX_FILE = "index.json"
+    """Name of the file remembering the digest of each source model."""
+
+    _lock = threading.Lock()
+
+    def __init__(self, directory: str = MODEL_CACHE_DIR):
+        self.directory = directory
+
+    def digest(self, source: str) -> str:
+        """Returns a short digest of the contents of the file `source`."""
+        stat = os.stat(source)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        key = os.path.abspath(source)
+
+        with self._lock:
+            index = self._read_index()
+            entry = index.get(key)
+            if entry is not None and entry["signature"] == signature:
+                return entry["digest"]
+
+            with open(source, "rb") as file:
+                digest = hashlib.sha1(file.read()).hexdigest()[:12]
+            index[key] = {"signature": signature, "digest": digest}
+            self._write(self.INDEX_FILE, json.dumps(index, indent=2))
+        return digest
+
+    def path(self, source: str, variant: str, suffix: str) -> str:
+        """Returns the path of the artifact prepared from `source`, whether it exists or not.
+
+        Arguments:
+        - `source`: str -- Path of the source model
+        - `variant`: str -- How the artifact is prepared, e.g. "640-int8"
+        - `suffix`: str -- Extension of the artifact, e.g. ".onnx"
+        """
+        stem = os.path.splitext(os.path.basename(source))[0]
+        return os.path.join(
+            self.directory, f"{stem}-{self.digest(source)}-{variant}{suffix}"
+        )
+
+    def get(
+        self,
+        source: str,
+        variant: str,
+        suffix: str,
+        prepare: Callable[[str], None],
+    ) -> str:
+        """Returns the path of the artifact prepared from `source`, preparing it on a cache miss.
+
+        Arguments:
+        - `source`, `variant`, `suffix` -- Identify the artifact, see `path`
+        - `prepare`: function(path) -- Writes the artifact to `path`, only called on a cache miss. It is written to a temporary path first, so interrupted preparations never leave a broken artifact behind
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(source, variant, suffix)
+        if os.path.exists(path):
+            return path
+
+        start = time.perf_counter()
+        temporary = f"{os.path.splitext(path)[0]}.{os.getpid()}.tmp{suffix}"
+        try:
+            prepare(temporary)
+            os.replace(temporary, path)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        logging.info(
+            f"Prepared {os.path.basename(path)} in {time.perf_counter() - start:.2f} s"
+        )
+        return path
+
+    def _read_index(self) -> dict:
+        try:
+            with open(os.path.join(self.directory, self.INDEX_FILE)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, name: str, text: str):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            file.write(text)
+        os.replace(temporary, path)
@@ -1,10 +1,46 @@
 from abc import ABC
+from typing import Optional
 from mugshot.mouse_input import FrameInput
+from mugshot.telemetry import span
 import cv2
 
+from ._detections import Detections
+from ._overlay import draw_detections
+from ._quality_governor import QualityLevel
+
 
 class BaseCVDetection(ABC):
-    """An abstract base class for implementing CV detection."""
+    """An abstract base class for implementing CV detection.
+
+    Subclasses implement `detect`, which only detects, and get an annotated `process_frame` for
+    free. Detectors that draw while detecting may override `process_frame` instead. Detectors
+    overriding neither raise `TypeError` when used."""
+
+    INPUT_SIZE: Optional[tuple[int, int]] = (640, 480)
+    """`(width, height)` of the smallest frames the detector is designed for, e.g. to select a
+    capture profile, None for any size. Smaller frames work, with less reliable detections."""
+
+    def detect(
+        self, frame: cv2.typing.MatLike
+    ) -> tuple[Optional[Detections], FrameInput]:
+        """Processes a BGR frame without drawing on it.
+
+        Arguments:
+        - `frame`: cv2.Mat -- A 24-bit BGR image
+
+        Returns:
+        - A tuple of `(Detections, FrameInput)`, referring respectively to the structured detections to draw with `draw_detections` and the inputs to be executed. The detections are None for detectors that only implement `process_frame`.
+
+        Raises:
+        - `TypeError` if the detector implements neither `detect` nor `process_frame`.
+        """
+        # Either default calls the other, so at least one of them must be overridden
+        if type(self).process_frame is BaseCVDetection.process_frame:
+            raise TypeError(
+                f"{type(self).__name__} must implement detect or process_frame"
+            )
+        _, frame_input = self.process_frame(frame)
+        return (None, frame_input)
 
     def process_frame(
         self, frame: cv2.typing.MatLike
@@ -15,6 +51,25 @@ class BaseCVDetection(ABC):
         - `frame`: cv2.Mat -- A 24-bit BGR image
 
         Returns:
-        - A tuple of `(cv2.Mat, FrameInput)`, referring respectively to an annotated frame and the corresponding inputs to be executed.
+        - A tuple of `(cv2.Mat, FrameInput)`, referring respectively to an annotated frame and the corresponding inputs to be executed. The frame is `frame` itself when there is nothing to draw.
         """
-        ...
+        detections, frame_input = self.detect(frame)
+        if detections is None:
+            return (frame, frame_input)
+        with span("annotate"):
+            annotated_frame = frame.copy()
+            draw_detections(annotated_frame, detections)
+        return (annotated_frame, frame_input)
+
+    def apply_quality(self, level: QualityLevel):
+        """Applies the quality settings chosen by a `QualityGovernor`, relative to the settings
+        the detector was created with. Detectors ignore the settings they do not support.
+        """
+        pass
+
+    def close(self):
+        """Releases the models held by this detector, e.g. before swapping detectors at runtime.
+
+        Models are shared through `ModelRegistry`, so this releases them to the registry, which
+        only frees them once no other detector uses them."""
+        pass
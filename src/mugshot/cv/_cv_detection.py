@@ -1,12 +1,17 @@
 from ._base_cv_detection import BaseCVDetection
+from ._detection_image import DetectionImage
+from ._detections import Detections
+from ._landmarks import LandmarkBuffer, landmark_metrics
+from ._model_registry import ModelRegistry
+from ._primary_face import PrimaryFaceSelector
+from ._quality_governor import QualityLevel
+from ._yolo_backend import create_yolo_backend
 from mugshot.mouse_input import FrameInput
+from mugshot.telemetry import span
 import os
+import time
+from typing import Optional
 import cv2
-from ultralytics import YOLO
-import dlib
-import imutils
-from imutils import face_utils
-from scipy.spatial import distance as dist
 
 # Set up paths
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -15,130 +20,148 @@ LANDMARK_MODEL_DIR = os.path.join(CURRENT_DIR, "shape_predictor_68_face_landmark
 
 
 class CVDetection(BaseCVDetection):
-    def __init__(self):
-        # Load the YOLO model
-        self.yolo_model = YOLO(MODEL_DIR)
-
-        # Initializing the Models for Landmark and face Detection
-        self.detector = dlib.get_frontal_face_detector()  # type: ignore
-        self.landmark_predict = dlib.shape_predictor(LANDMARK_MODEL_DIR)  # type: ignore
-
-        # Initialize frame counters
-        self.left_eye_counter = 0
-        self.right_eye_counter = 0
-
-    def process_frame(
-        self, frame: cv2.typing.MatLike
-    ) -> tuple[cv2.typing.MatLike, FrameInput]:
-
-        # Function to calculate Eye Aspect Ratio (EAR)
-        def calculate_EAR(eye):
-            y1 = dist.euclidean(eye[1], eye[5])  # Vertical distance
-            y2 = dist.euclidean(eye[2], eye[4])  # Vertical distance
-            x1 = dist.euclidean(eye[0], eye[3])  # Horizontal distance
-            ear = (y1 + y2) / x1
-            return ear
-
-        # Define constants
-        EYE_AR_THRESH = 0.45  # Threshold for eye closure
-        EYE_AR_CONSEC_FRAMES = 3  # Minimum consecutive frames to consider eye closed
 
-        frame_input = FrameInput()
-
-        # Eye landmarks
-        (L_start, L_end) = face_utils.FACIAL_LANDMARKS_IDXS["left_eye"]
-        (R_start, R_end) = face_utils.FACIAL_LANDMARKS_IDXS["right_eye"]
-
-        # Perform YOLO inference on the frame
-        results = self.yolo_model.predict(
-            source=frame, conf=0.5, save=False
-        )  # Set confidence threshold as needed
-
-        # Visualize detections
-        annotated_frame = results[0].plot()  # Draw boxes and labels on the frame
-
-        # Resize the frame
-        frame = imutils.resize(frame, width=640)
-
-        # Convert the frame to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-        # Detect faces in the frame
-        faces = self.detector(gray)
-        for face in faces:
-            # Get the facial landmarks
-            shape = self.landmark_predict(gray, face)
-            landmarks = [[p.x, p.y] for p in shape.parts()]
-
-            # Converting the shape class directly to a list of (x,y) coordinates
-            shape = face_utils.shape_to_np(shape)
-
-            # Extract the left and right eye coordinates
-            left_eye = landmarks[L_start:L_end]
-            right_eye = landmarks[R_start:R_end]
-
-            # Calculate EAR for both eyes
-            left_ear = calculate_EAR(left_eye)
-            right_ear = calculate_EAR(right_eye)
-
-            # Check if the left eye is closed
-            if left_ear < EYE_AR_THRESH:
-                self.left_eye_counter += 1
-            else:
-                self.left_eye_counter = 0
-
-            # Check if the right eye is closed
-            if right_ear < EYE_AR_THRESH:
-                self.right_eye_counter += 1
-            else:
-                self.right_eye_counter = 0
-
-            # Draw results on the frame
-            cv2.putText(
-                annotated_frame,
-                f"Left EAR: {left_ear:.2f}",
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.7,
-                (0, 255, 0),
-                2,
+    EYE_AR_THRESH = 0.45
+    """Threshold for eye closure. Eyes are reported closed on every frame below it, and
+    `GestureEngine` counts the consecutive frames"""
+
+    def __init__(
+        self,
+        yolo_backend: str = "ultralytics",
+        yolo_imgsz: Optional[int] = None,
+        detection_scale: float = 1.0,
+        max_detection_width: Optional[int] = 640,
+        min_face_size: int = 0,
+    ):
+        """Arguments:
+        - `yolo_backend`: str -- Inference backend for the YOLO model, one of "ultralytics", "onnx" or "onnx-int8"
+        - `yolo_imgsz`: Optional[int] -- Inference size of the YOLO model, 640 if None. The ONNX backends use it as a fixed input shape
+        - `detection_scale`: float -- Factor by which frames are downscaled for face and landmark detection
+        - `max_detection_width`: Optional[int] -- Frames are further downscaled for face and landmark detection to at most this width, None for no limit
+        - `min_face_size`: int -- Minimum face width in frame pixels, smaller faces are ignored
+        """
+        # Load the YOLO model and the models for landmark and face detection in parallel, shared
+        # with other detectors
+        self.yolo, self.detector, self.landmark_predict = (
+            ModelRegistry.load_concurrently(
+                lambda: create_yolo_backend(yolo_backend, MODEL_DIR, imgsz=yolo_imgsz),
+                ModelRegistry.dlib_face_detector,
+                lambda: ModelRegistry.dlib_shape_predictor(LANDMARK_MODEL_DIR),
             )
-            cv2.putText(
-                annotated_frame,
-                f"Right EAR: {right_ear:.2f}",
-                (10, 60),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.7,
-                (0, 255, 0),
-                2,
+        )
+
+        # Landmarks of the primary face, reused between frames
+        self.landmarks = LandmarkBuffer()
+        self.primary_face = PrimaryFaceSelector()
+
+        # Faces are detected on a downscaled copy of the frame
+        self.detection_image = DetectionImage(detection_scale, max_detection_width)
+        self.min_face_size = min_face_size
+        self.detection_scale = detection_scale
+
+        # Maximum YOLO rate, set by `apply_quality`, the latest boxes are reused in between
+        self.yolo_rate: Optional[float] = None
+        self._next_yolo = 0.0
+        self._labelled_boxes = []
+
+    def apply_quality(self, level: QualityLevel):
+        self.detection_image.scale = self.detection_scale * level.detection_scale
+        self.yolo_rate = level.tongue_rate
+
+    def _detect_objects(self, frame: cv2.typing.MatLike) -> list:
+        """Returns labelled boxes of the objects detected with YOLO, or the latest ones if YOLO
+        is not due according to `yolo_rate`."""
+        if self.yolo_rate is not None:
+            now = time.monotonic()
+            if now < self._next_yolo:
+                return list(self._labelled_boxes)
+            self._next_yolo = now + 1 / self.yolo_rate
+
+        labelled_boxes = []
+        with span("yolo"):
+            predictions = self.yolo.predict(
+                frame, conf=0.5
+            )  # Set confidence threshold as needed
+        for detection in predictions:
+            x1, y1, x2, y2 = map(int, detection.xyxy)
+            labelled_boxes.append(
+                (
+                    (x1, y1, x2 - x1, y2 - y1),
+                    f"{self.yolo.names.get(detection.cls, detection.cls)} {detection.conf:.2f}",
+                )
             )
+        self._labelled_boxes = labelled_boxes
+        return list(labelled_boxes)
 
-            if self.left_eye_counter >= EYE_AR_CONSEC_FRAMES:
-                cv2.putText(
-                    annotated_frame,
-                    "Left Eye Closed",
-                    (10, 90),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    (0, 0, 255),
-                    2,
-                )
-                frame_input.is_left_eye_closed = True
-            else:
-                frame_input.is_left_eye_closed = False
-
-            if self.right_eye_counter >= EYE_AR_CONSEC_FRAMES:
-                cv2.putText(
-                    annotated_frame,
-                    "Right Eye Closed",
-                    (10, 120),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    (0, 0, 255),
-                    2,
-                )
-                frame_input.is_right_eye_closed = True
-            else:
-                frame_input.is_right_eye_closed
+    def close(self):
+        self.yolo.close()
+        ModelRegistry.release(self.detector)
+        ModelRegistry.release(self.landmark_predict)
 
-        return (annotated_frame, frame_input)
+    def detect(self, frame: cv2.typing.MatLike) -> tuple[Detections, FrameInput]:
+        """Detects objects with YOLO, and eye closure from the landmarks of the primary face.
+
+        Arguments:
+        - `frame`: cv2.Mat -- A 24-bit BGR image
+
+        Returns:
+        - A tuple of `(Detections, FrameInput)`, referring to the detections with the primary face's landmarks and ratios, and the corresponding inputs to be executed.
+        """
+        frame_input = FrameInput()
+
+        # Perform YOLO inference on the frame, and collect detections to visualize
+        results = Detections(labelled_boxes=self._detect_objects(frame))
+
+        # Downscale the frame, landmarks are scaled back to the frame's size
+        with span("preprocess"):
+            small = self.detection_image.prepare(frame)
+            gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        factor = self.detection_image.factor
+
+        # Detect faces in the frame, and only predict the landmarks of the primary face
+        self.landmarks.clear()
+        with span("dlib_face"):
+            faces = [
+                face
+                for face in self.detector(gray)
+                if face.width() * factor >= self.min_face_size
+            ]
+        primary = self.primary_face.select(
+            [
+                (
+                    round(face.left() * factor),
+                    round(face.top() * factor),
+                    round(face.width() * factor),
+                    round(face.height() * factor),
+                )
+                for face in faces
+            ]
+        )
+        if primary is not None:
+            with span("dlib_landmarks"):
+                self.landmarks.add(self.landmark_predict(gray, faces[primary]), factor)
+
+        if self.landmarks.count == 0:
+            return (results, frame_input)
+
+        # Compute the ratios of the primary face
+        results.landmarks = self.landmarks.points
+        results.metrics = landmark_metrics(results.landmarks)
+
+        for left_ear, right_ear in zip(
+            results.metrics.left_ear.tolist(), results.metrics.right_ear.tolist()
+        ):
+            # Status lines to draw on the frame
+            results.status.append((f"Left EAR: {left_ear:.2f}", (0, 255, 0)))
+            results.status.append((f"Right EAR: {right_ear:.2f}", (0, 255, 0)))
+
+            # Closures are reported per frame, and debounced by the gesture engine
+            frame_input.is_left_eye_closed = left_ear < self.EYE_AR_THRESH
+            if frame_input.is_left_eye_closed:
+                results.status.append(("Left Eye Closed", (0, 0, 255)))
+
+            frame_input.is_right_eye_closed = right_ear < self.EYE_AR_THRESH
+            if frame_input.is_right_eye_closed:
+                results.status.append(("Right Eye Closed", (0, 0, 255)))
+
+        return (results, frame_input)
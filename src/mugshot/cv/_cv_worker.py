@@ -1,41 +1,250 @@
 import logging
 import time
+from typing import Optional
 from PySide6.QtCore import QThread, Signal
 import cv2
+import numpy as np
 
-from ._base_cv_detection import BaseCVDetection
+from ._detector_registry import DetectorRegistry
+from ._process_pool import ProcessPoolDetection
+from ._quality_governor import QualityGovernor
+from ._render_policy import RenderMode, RenderPolicy
+from mugshot.feed import FrameBuffer, FrameEnvelope
 from mugshot.mouse_input import FrameInput
+from mugshot.recording import SessionRecorder
+from mugshot.telemetry import record
 
 
 class CVWorker(QThread):
-    """A worker thread for cv."""
+    """A worker thread for cv.
+
+    Detection runs in a loop on this thread. Frames submitted with `processFrame` go into a
+    single-slot mailbox, and frames arriving while a detection is in flight overwrite each other,
+    so only the newest one is processed next.
+
+    Frames are annotated according to `renderPolicy` while the preview is visible, and to
+    `hiddenRenderPolicy` otherwise. Frames that are not annotated only go through
+    `BaseCVDetection.detect`, skipping drawing entirely.
+
+    With a `QualityGovernor`, the time taken to process each frame is measured, and the
+    governor's quality level is applied to the detector with `BaseCVDetection.apply_quality`
+    whenever it changes. While the preview is visible, frames are then annotated according to
+    the level's annotation policy instead of `renderPolicy`.
+
+    Before processing frames, the detector is warmed up end to end on a blank frame of
+    `warmUpSize`, so that the first real frame is not slow.
+
+    With a `SessionRecorder`, the inputs of every processed frame are recorded along with the
+    frame, to replay the session later.
+    """
+
+    DEFAULT_DETECTOR = "AltCVDetection"
+    """Name in `DetectorRegistry` of the detector used when no `cv_detection_class` is given."""
 
     frameProcessed = Signal(cv2.Mat)
-    """Public signal `cv2.Mat` for an annotated frame."""
+    """Public signal `cv2.Mat` for an annotated (or raw) frame, not emitted for frames the render policy skips."""
 
     inputsMade = Signal(FrameInput)
     """Public signal `FrameInput` for inputs to be executed."""
 
-    def __init__(self, *args, cv_detection_class=BaseCVDetection, **kwargs):
+    qualityChanged = Signal(int)
+    """Public signal `int` for the index of the governor's new quality level, 0 being the best."""
+
+    detectorReady = Signal()
+    """Public signal for a detector being initialized, with its models loaded."""
+
+    detectorFailed = Signal(str)
+    """Public signal `str` for the reason the initial detector could not be initialized, after which no frame is processed."""
+
+    warmedUp = Signal()
+    """Public signal for the initial detector having processed a blank frame, ready for real frames."""
+
+    def __init__(
+        self,
+        *args,
+        cv_detection_class=None,
+        quality_governor: Optional[QualityGovernor] = None,
+        recorder: Optional[SessionRecorder] = None,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self._cvDetectionClass = cv_detection_class
+        self._swapCVDetection = False
         self.cvDetection = None
+        self.mailbox = FrameBuffer()
+        """Holds the newest `(frame, FrameEnvelope)` waiting to be processed."""
+
+        self.submittedCount = 0
+        """Number of frames submitted to `processFrame`."""
+
+        self.processedCount = 0
+        """Number of frames processed."""
+
+        self.renderPolicy = RenderPolicy()
+        """How processed frames are rendered while the preview is visible."""
+
+        self.hiddenRenderPolicy = RenderPolicy(RenderMode.NONE)
+        """How processed frames are rendered while the preview is hidden."""
+
+        self._previewVisible = True
+
+        self.qualityGovernor = quality_governor
+        """Adjusts the detector's quality to the time taken per frame, None to keep it fixed."""
+
+        self.processingTime = 0.0
+        """Seconds taken to process the latest frame."""
+
+        self.recorder = recorder
+        """Records the inputs and frames processed, None not to record them. Closed by its owner."""
+
+        self.warmUpSize: Optional[tuple[int, int]] = (640, 480)
+        """`(width, height)` of the blank frame the detector is warmed up on, None to skip the warm-up."""
+
+    @property
+    def droppedCount(self) -> int:
+        """Number of frames dropped because a newer frame arrived before they were processed."""
+        return self.mailbox.overwritten
 
     def run(self):
-        """Overrides QThreads.run, initializes CV functionalities asynchronously"""
+        """Overrides QThreads.run, initializes CV functionalities asynchronously, then processes
+        frames from the mailbox until interrupted by `quit`."""
         if self.cvDetection is None:
-            logging.info(f"Initializing CV detection at {time.ctime()}.")
-            self.cvDetection = self._cvDetectionClass()
-            logging.info(f"Finished initializing CV detection at {time.ctime()}.")
+            try:
+                self._initCVDetection()
+            except Exception as error:
+                logging.exception("Failed to initialize CV detection")
+                self.detectorFailed.emit(str(error) or type(error).__name__)
+                return
+            self._warmUp()
 
-    def processFrame(self, frame: cv2.Mat):
-        """Public slot to process frames."""
+        while not self.isInterruptionRequested():
+            item = self.mailbox.take()
+            if item is None:
+                continue
+            frame, envelope = item
+            envelope.mark("dequeued")
 
-        if self.cvDetection is None:
-            logging.error(f"Expected self.cvDetection to be initialized.")
+            if self._swapCVDetection:
+                self._swapCVDetection = False
+                self.cvDetection.close()
+                self._initCVDetection()
+
+            # Pooled detection lags behind, so results carry their own frame's capture time
+            options = {}
+            if isinstance(self.cvDetection, ProcessPoolDetection):
+                options["timestamp"] = envelope.captured
+
+            start = time.perf_counter()
+            policy = self._currentRenderPolicy()
+            if policy.should_annotate(self.processedCount):
+                annotatedFrame, frameInput = self.cvDetection.process_frame(
+                    frame, **options
+                )
+            else:
+                _, frameInput = self.cvDetection.detect(frame, **options)
+                annotatedFrame = frame if policy.emit_raw else None
+            self.processedCount += 1
+            self.processingTime = time.perf_counter() - start
+            record("process", self.processingTime)
+            self._governQuality()
+            envelope.mark("processed")
+            frameInput.envelope = envelope
+            if frameInput.timestamp is None:
+                frameInput.timestamp = envelope.captured
+            if self.recorder is not None and not frameInput.is_placeholder:
+                self.recorder.record(frameInput, frame, self.processingTime)
+
+            if annotatedFrame is not None:
+                self.frameProcessed.emit(annotatedFrame)
+            self.inputsMade.emit(frameInput)
+
+    def _initCVDetection(self):
+        logging.info(f"Initializing CV detection at {time.ctime()}.")
+        if self._cvDetectionClass is None:
+            # Imported on this thread, so the import does not delay the window
+            self._cvDetectionClass = DetectorRegistry.load(self.DEFAULT_DETECTOR)
+        self.cvDetection = self._cvDetectionClass()
+        if self.qualityGovernor is not None:
+            self.cvDetection.apply_quality(self.qualityGovernor.level)
+        logging.info(f"Finished initializing CV detection at {time.ctime()}.")
+        self.detectorReady.emit()
+
+    def _warmUp(self):
+        """Runs the detector on a blank frame of `warmUpSize`, without emitting anything for it."""
+        if self.warmUpSize is not None:
+            width, height = self.warmUpSize
+            start = time.perf_counter()
+            self.cvDetection.detect(np.zeros((height, width, 3), np.uint8))
+            logging.info(
+                f"Warmed up CV detection in {time.perf_counter() - start:.2f} s"
+            )
+        self.warmedUp.emit()
+
+    def _currentRenderPolicy(self) -> RenderPolicy:
+        if not self._previewVisible:
+            return self.hiddenRenderPolicy
+        if self.qualityGovernor is not None:
+            return self.qualityGovernor.level.annotation
+        return self.renderPolicy
+
+    def _governQuality(self):
+        """Records the latest processing time, and applies the governor's new quality level if
+        it changed."""
+        if self.qualityGovernor is None:
+            return
+        level = self.qualityGovernor.record(self.processingTime)
+        if level is None:
             return
+        index = self.qualityGovernor.index
+        logging.info(
+            f"Quality level {index} for a budget of {self.qualityGovernor.budget * 1000:.0f} ms: {level}"
+        )
+        self.cvDetection.apply_quality(level)
+        self.qualityChanged.emit(index)
+
+    def setCVDetectionClass(self, cv_detection_class):
+        """Public slot to swap the CV detection class at runtime.
+
+        The current detector is closed, releasing its models, and the new one is initialized on
+        the worker thread before the next frame is processed. `cv_detection_class` may be any
+        callable returning a `BaseCVDetection`, e.g. a `functools.partial` with options.
+        """
+
+        self._cvDetectionClass = cv_detection_class
+        self._swapCVDetection = self.cvDetection is not None
+
+    def setRenderPolicy(self, policy: RenderPolicy):
+        """Public slot to set how processed frames are rendered while the preview is visible."""
+
+        self.renderPolicy = policy
+
+    def setPreviewVisible(self, visible: bool):
+        """Public slot to switch between `renderPolicy` and `hiddenRenderPolicy`, e.g. when the
+        window is minimized."""
+
+        self._previewVisible = visible
+
+    def processFrame(self, frame: cv2.Mat, envelope: Optional[FrameEnvelope] = None):
+        """Public slot to submit frames for processing.
+
+        Only puts the frame into the mailbox, so it is safe to call from any thread. Connect it
+        with `Qt.ConnectionType.DirectConnection` to avoid queueing frames in an event loop.
+
+        Arguments:
+        - `frame`: cv2.Mat -- A 24-bit BGR image
+        - `envelope`: Optional[FrameEnvelope] -- The frame's sequence number and capture time, e.g. from `FeedWorker.frameRead`. If None, the frame is numbered here and stamped with the current time
+        """
+
+        if envelope is None:
+            envelope = FrameEnvelope(self.submittedCount, time.monotonic())
+        self.submittedCount += 1
+        envelope.mark("queued")
+        self.mailbox.put((frame, envelope))
 
-        annotatedFrame, frameInput = self.cvDetection.process_frame(frame)
+    def quit(self):
+        """Overrides QThread.quit() to stop the processing loop."""
 
-        self.frameProcessed.emit(annotatedFrame)
-        self.inputsMade.emit(frameInput)
+        self.requestInterruption()
+        self.mailbox.close()
+        self.wait()
+        super().quit()
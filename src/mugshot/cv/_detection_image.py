@@ -0,0 +1,58 @@
+import math
+from typing import Optional
+import cv2
+import numpy as np
+
+from ._detections import Box
+
+
+class DetectionImage:
+    """Builds a downscaled copy of each frame for face detection, and maps results back.
+
+    Face detection cost grows with the number of pixels, while faces in front of a webcam stay
+    large enough to find at a lower resolution. The copy is resized into a reused buffer.
+
+    Arguments:
+    - `scale`: float -- Factor by which frames are downscaled, 1.0 to keep their size
+    - `max_width`: Optional[int] -- Frames are further downscaled to at most this width, None for no limit
+    """
+
+    def __init__(self, scale: float = 1.0, max_width: Optional[int] = 640):
+        self.scale = scale
+        self.max_width = max_width
+
+        self.factor = 1.0
+        """Frame pixels per pixel of the latest detection image."""
+
+        self._buffer: Optional[np.ndarray] = None
+
+    def prepare(self, image: cv2.typing.MatLike) -> cv2.typing.MatLike:
+        """Returns the detection image of `image`, which is `image` itself if it is not
+        downscaled. The returned buffer is overwritten by the next call."""
+        h, w = image.shape[:2]
+        scale = self.scale
+        if self.max_width is not None:
+            scale = min(scale, self.max_width / w)
+        if scale >= 1.0:
+            self.factor = 1.0
+            return image
+
+        size = (max(round(w * scale), 1), max(round(h * scale), 1))
+        shape = (size[1], size[0], *image.shape[2:])
+        if self._buffer is None or self._buffer.shape != shape:
+            self._buffer = np.empty(shape, image.dtype)
+
+        cv2.resize(image, size, dst=self._buffer, interpolation=cv2.INTER_AREA)
+        self.factor = w / size[0]
+        return self._buffer
+
+    def to_frame(self, box) -> Box:
+        """Maps an `(x, y, w, h)` box from the detection image to the frame."""
+        x, y, w, h = box
+        f = self.factor
+        return (round(x * f), round(y * f), round(w * f), round(h * f))
+
+    def min_size(self, min_face_size: int) -> tuple[int, int]:
+        """Returns the size in the detection image of a square of `min_face_size` frame pixels."""
+        size = math.ceil(min_face_size / self.factor)
+        return (size, size)
@@ -0,0 +1,74 @@
+from dataclasses import dataclass, field
+from typing import Optional
+import numpy as np
+
+from ._landmarks import LandmarkMetrics
+
+type Box = tuple[int, int, int, int]
+"""An `(x, y, w, h)` bounding box in pixels."""
+
+
+@dataclass
+class EyesResult:
+    """A dataclass for the result of eye detection on a face."""
+
+    is_left_eye_closed: bool
+    """Whether no open left eye was found."""
+
+    is_right_eye_closed: bool
+    """Whether no open right eye was found."""
+
+    boxes: list[Box] = field(default_factory=list)
+    """Boxes of the open eyes found."""
+
+
+@dataclass
+class TongueResult:
+    """A dataclass for the result of tongue detection on a face."""
+
+    is_tongue_down: Optional[bool] = None
+    """Whether the tongue extends downwards, None if no tongue was found."""
+
+    boxes: list[Box] = field(default_factory=list)
+    """Boxes of the tongues found."""
+
+
+type Color = tuple[int, int, int]
+"""A `(b, g, r)` color."""
+
+
+@dataclass
+class FaceResult:
+    """A dataclass for the results of detection on a single face."""
+
+    box: Box
+    """Box of the face."""
+
+    eyes: Optional[EyesResult] = None
+    """Result of eye detection, None if it did not run."""
+
+    tongue: Optional[TongueResult] = None
+    """Result of tongue detection, None if it did not run."""
+
+    primary: bool = True
+    """Whether this is the primary user's face. Other faces are only located, without eye or tongue detection."""
+
+
+@dataclass
+class Detections:
+    """A dataclass for the structured detections of a frame, drawn by `draw_detections`."""
+
+    faces: list[FaceResult] = field(default_factory=list)
+    """Faces found, with their eyes and tongue."""
+
+    labelled_boxes: list[tuple[Box, str]] = field(default_factory=list)
+    """Other boxes to draw with a label, e.g. raw YOLO detections."""
+
+    status: list[tuple[str, Color]] = field(default_factory=list)
+    """Lines of status text to draw in the top-left corner, with their color."""
+
+    landmarks: Optional[np.ndarray] = None
+    """Facial landmarks of shape `(N, 68, 2)` in frame coordinates, None if not computed. May be a view into the detector's buffers, valid until it processes the next frame."""
+
+    metrics: Optional[LandmarkMetrics] = None
+    """Ratios computed from `landmarks`, None if not computed."""
@@ -0,0 +1,81 @@
+from abc import ABC
+import importlib
+from importlib.metadata import EntryPoint, entry_points
+import logging
+import threading
+
+from ._base_cv_detection import BaseCVDetection
+
+
+class DetectorRegistry(ABC):
+    """Abstract class for a process-wide registry of detectors, selected by name.
+
+    Detectors are registered as `module:Class` references, and their modules are only imported
+    when they are loaded, so unused detectors and their dependencies never slow down startup.
+
+    Besides the built-in detectors, packages can provide detectors through the
+    `mugshot.detectors` entry point group, e.g. in their `pyproject.toml`:
+    ```
+    [project.entry-points."mugshot.detectors"]
+    MyDetection = "my_package.detection:MyDetection"
+    ```
+    """
+
+    ENTRY_POINT_GROUP = "mugshot.detectors"
+    """Entry point group in which installed packages register detectors."""
+
+    _targets: dict[str, str | EntryPoint] = {
+        "AltCVDetection": "mugshot.cv._alt_cv_detection:AltCVDetection",
+        "CVDetection": "mugshot.cv._cv_detection:CVDetection",
+    }
+    _discovered = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, name: str, target: str):
+        """Registers the detector `target`, a `module:Class` reference, under `name`."""
+        with cls._lock:
+            cls._targets[name] = target
+
+    @classmethod
+    def _discover(cls):
+        """Collects the detectors of the entry point group once, without loading them."""
+        with cls._lock:
+            if cls._discovered:
+                return
+            cls._discovered = True
+            for entry_point in entry_points(group=cls.ENTRY_POINT_GROUP):
+                cls._targets.setdefault(entry_point.name, entry_point)
+
+    @classmethod
+    def names(cls) -> list[str]:
+        """Returns the names of every registered detector, including entry points."""
+        cls._discover()
+        return sorted(cls._targets)
+
+    @classmethod
+    def load(cls, name: str) -> type[BaseCVDetection]:
+        """Imports and returns a detector class.
+
+        Arguments:
+        - `name`: str -- A registered detector name, or a `module:Class` reference
+        """
+        cls._discover()
+        target = cls._targets.get(name)
+        if target is None:
+            if ":" not in name:
+                raise ValueError(
+                    f"Unknown detector {name!r}, expected one of {cls.names()} or a module:Class reference"
+                )
+            target = name
+
+        if isinstance(target, EntryPoint):
+            logging.info(f"Loading detector {name} from entry point {target.value}")
+            detector = target.load()
+        else:
+            module_name, _, class_name = target.partition(":")
+            detector = getattr(importlib.import_module(module_name), class_name, None)
+
+        if not (isinstance(detector, type) and issubclass(detector, BaseCVDetection)):
+            raise ValueError(f"Detector {name!r} is not a BaseCVDetection subclass")
+        return detector
@@ -0,0 +1,143 @@
+from typing import Optional
+import cv2
+import numpy as np
+
+type Box = tuple[int, int, int, int]
+
+
+class FaceTracker:
+    """Follows a face bounding box between detections with sparse Lucas-Kanade optical flow.
+
+    Corner features are picked inside the box when tracking starts. On every update, the box is
+    moved and scaled by the median motion of the features that pass a forward-backward
+    consistency check.
+
+    Arguments:
+    - `max_corners`: int -- Maximum number of features to track
+    - `min_points`: int -- Tracking is lost when fewer features survive
+    - `max_fb_error`: float -- Maximum forward-backward error in pixels for a feature to survive
+    """
+
+    LK_PARAMS = dict(
+        winSize=(15, 15),
+        maxLevel=2,
+        criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
+    )
+    """Parameters for `cv2.calcOpticalFlowPyrLK`."""
+
+    def __init__(
+        self, max_corners: int = 50, min_points: int = 6, max_fb_error: float = 1.0
+    ):
+        self.max_corners = max_corners
+        self.min_points = min_points
+        self.max_fb_error = max_fb_error
+
+        self.confidence = 0.0
+        """Fraction of the initial features still tracked, 0.0 when not tracking."""
+
+        self._box: Optional[tuple[float, float, float, float]] = None
+        self._prev_gray: Optional[cv2.typing.MatLike] = None
+        self._buffer: Optional[np.ndarray] = None
+        self._points: Optional[np.ndarray] = None
+        self._initial_points = 0
+
+    @property
+    def box(self) -> Optional[Box]:
+        """The tracked `(x, y, w, h)` box, None when not tracking."""
+        if self._box is None:
+            return None
+        x, y, w, h = self._box
+        return (round(x), round(y), round(w), round(h))
+
+    @property
+    def active(self) -> bool:
+        """Whether a face is being tracked."""
+        return self._box is not None
+
+    def start(self, gray: cv2.typing.MatLike, box: Box) -> bool:
+        """Starts tracking `box` in the grayscale frame `gray`.
+
+        Returns whether enough features were found inside the box to track it."""
+        x, y, w, h = box
+        mask = np.zeros(gray.shape[:2], np.uint8)
+        mask[y : y + h, x : x + w] = 255
+
+        points = cv2.goodFeaturesToTrack(
+            gray,
+            maxCorners=self.max_corners,
+            qualityLevel=0.01,
+            minDistance=max(3, w // 20),
+            mask=mask,
+        )
+        if points is None or len(points) < self.min_points:
+            self.reset()
+            return False
+
+        self._box = (float(x), float(y), float(w), float(h))
+        self._remember(gray)
+        self._points = points.astype(np.float32)
+        self._initial_points = len(points)
+        self.confidence = 1.0
+        return True
+
+    def update(self, gray: cv2.typing.MatLike) -> Optional[Box]:
+        """Tracks the box into the grayscale frame `gray`.
+
+        Returns:
+        - The updated `(x, y, w, h)` box, or None if tracking was lost.
+        """
+        if self._box is None or self._points is None or self._prev_gray is None:
+            return None
+
+        forward, status, _ = cv2.calcOpticalFlowPyrLK(
+            self._prev_gray, gray, self._points, None, **self.LK_PARAMS  # type: ignore
+        )
+        backward, back_status, _ = cv2.calcOpticalFlowPyrLK(
+            gray, self._prev_gray, forward, None, **self.LK_PARAMS  # type: ignore
+        )
+        fb_error = np.linalg.norm(self._points - backward, axis=2).ravel()
+        good = (status.ravel() == 1) & (back_status.ravel() == 1)
+        good &= fb_error < self.max_fb_error
+
+        if np.count_nonzero(good) < self.min_points:
+            self.reset()
+            return None
+
+        old = self._points[good].reshape(-1, 2)
+        new = forward[good].reshape(-1, 2)
+
+        # Translation and scale are the median motion and the median change in spread
+        dx, dy = np.median(new - old, axis=0)
+        old_spread = np.linalg.norm(old - np.median(old, axis=0), axis=1)
+        new_spread = np.linalg.norm(new - np.median(new, axis=0), axis=1)
+        valid = old_spread > 1e-3
+        scale = (
+            float(np.median(new_spread[valid] / old_spread[valid]))
+            if valid.any()
+            else 1.0
+        )
+
+        x, y, w, h = self._box
+        center_x, center_y = x + w / 2 + dx, y + h / 2 + dy
+        w, h = w * scale, h * scale
+        self._box = (center_x - w / 2, center_y - h / 2, w, h)
+
+        self._remember(gray)
+        self._points = new.reshape(-1, 1, 2)
+        self.confidence = len(new) / self._initial_points
+        return self.box
+
+    def _remember(self, gray: cv2.typing.MatLike):
+        """Copies `gray` as the previous frame, so callers may reuse their buffers."""
+        if self._buffer is None or self._buffer.shape != gray.shape:
+            self._buffer = np.empty_like(gray)
+        np.copyto(self._buffer, gray)
+        self._prev_gray = self._buffer
+
+    def reset(self):
+        """Stops tracking."""
+        self._box = None
+        self._prev_gray = None
+        self._points = None
+        self._initial_points = 0
+        self.confidence = 0.0
@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+from itertools import chain
+import numpy as np
+
+# Indices into the 68-point iBUG 300-W landmarks predicted by dlib, see imutils.face_utils
+JAW = slice(0, 17)
+NOSE_TIP = 30
+RIGHT_EYE = slice(36, 42)
+LEFT_EYE = slice(42, 48)
+INNER_MOUTH = slice(60, 68)
+CHIN = 8
+RIGHT_EYE_OUTER = 36
+LEFT_EYE_OUTER = 45
+
+
+@dataclass
+class LandmarkMetrics:
+    """A dataclass for ratios computed from the landmarks of N faces at once."""
+
+    left_ear: np.ndarray
+    """Eye aspect ratio of the left eyes, of shape `(N,)`. Lower when the eye is closed."""
+
+    right_ear: np.ndarray
+    """Eye aspect ratio of the right eyes, of shape `(N,)`. Lower when the eye is closed."""
+
+    mar: np.ndarray
+    """Mouth aspect ratio, of shape `(N,)`. Higher when the mouth is open."""
+
+    yaw: np.ndarray
+    """Horizontal offset of the nose tip from the middle of the eyes, relative to their distance, of shape `(N,)`. 0.0 when facing the camera, positive when turned towards the image's right."""
+
+    pitch: np.ndarray
+    """Vertical position of the nose tip between the eyes and the chin, relative to a frontal face, of shape `(N,)`. 0.0 when facing the camera, positive when looking down."""
+
+
+class LandmarkBuffer:
+    """Preallocated storage for the 68 landmarks of up to `capacity` faces.
+
+    Arguments:
+    - `capacity`: int -- Initial number of faces, grown as needed
+    """
+
+    def __init__(self, capacity: int = 4):
+        self._points = np.empty((capacity, 68, 2), np.float32)
+        self.count = 0
+        """Number of faces filled since `clear`."""
+
+    def clear(self):
+        """Empties the buffer, keeping its memory."""
+        self.count = 0
+
+    def add(self, shape, scale: float = 1.0, offset: tuple[float, float] = (0.0, 0.0)):
+        """Adds the landmarks of a dlib `full_object_detection`, mapped with `scale` and `offset`
+        into another coordinate space, e.g. from a downscaled image to the full frame.
+        """
+        if self.count == len(self._points):
+            self._points = np.concatenate((self._points, np.empty_like(self._points)))
+
+        points = self._points[self.count]
+        # Read straight from dlib's points, without building a list per face
+        points.reshape(-1)[:] = np.fromiter(
+            chain.from_iterable((p.x, p.y) for p in shape.parts()),
+            np.float32,
+            points.size,
+        )
+        if scale != 1.0:
+            points *= scale
+        if offset != (0.0, 0.0):
+            points += offset
+        self.count += 1
+
+    @property
+    def points(self) -> np.ndarray:
+        """Landmarks of the filled faces, of shape `(count, 68, 2)`. A view, overwritten by later
+        calls to `add`."""
+        return self._points[: self.count]
+
+
+def _distance(points: np.ndarray, a, b) -> np.ndarray:
+    return np.linalg.norm(points[..., a, :] - points[..., b, :], axis=-1)
+
+
+def eye_aspect_ratios(landmarks: np.ndarray) -> np.ndarray:
+    """Computes the eye aspect ratio of both eyes of N faces at once.
+
+    Arguments:
+    - `landmarks`: np.ndarray -- Landmarks of shape `(N, 68, 2)`
+
+    Returns:
+    - An array of shape `(N, 2)` of `(left, right)` ratios, the sum of the eyelids' two vertical distances over the eye's width.
+    """
+    # (N, 2, 6, 2) array of the left and right eyes' six points
+    eyes = np.stack((landmarks[:, LEFT_EYE], landmarks[:, RIGHT_EYE]), axis=1)
+    vertical = _distance(eyes, 1, 5) + _distance(eyes, 2, 4)
+    horizontal = _distance(eyes, 0, 3)
+    return vertical / np.maximum(horizontal, 1e-6)
+
+
+def mouth_aspect_ratios(landmarks: np.ndarray) -> np.ndarray:
+    """Computes the mouth aspect ratio of N faces at once, from the inner lips.
+
+    Returns:
+    - An array of shape `(N,)` of the mean opening of the mouth over its width.
+    """
+    mouth = landmarks[:, INNER_MOUTH]
+    vertical = _distance(mouth, 1, 7) + _distance(mouth, 2, 6) + _distance(mouth, 3, 5)
+    horizontal = _distance(mouth, 0, 4)
+    return vertical / np.maximum(3 * horizontal, 1e-6)
+
+
+NEUTRAL_PITCH = 0.4
+"""Position of the nose tip between the eyes and the chin on a typical frontal face."""
+
+
+def head_pose_ratios(landmarks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Estimates the head yaw and pitch of N faces at once, as ratios rather than angles.
+
+    Returns:
+    - A tuple of `(yaw, pitch)` arrays of shape `(N,)`, see `LandmarkMetrics`.
+    """
+    right_eye = landmarks[:, RIGHT_EYE_OUTER]
+    left_eye = landmarks[:, LEFT_EYE_OUTER]
+    nose = landmarks[:, NOSE_TIP]
+    chin = landmarks[:, CHIN]
+
+    eyes_middle = (right_eye + left_eye) / 2
+    eyes_width = np.maximum(np.linalg.norm(left_eye - right_eye, axis=-1), 1e-6)
+    yaw = (nose[:, 0] - eyes_middle[:, 0]) / eyes_width
+
+    face_height = np.maximum(chin[:, 1] - eyes_middle[:, 1], 1e-6)
+    pitch = (nose[:, 1] - eyes_middle[:, 1]) / face_height - NEUTRAL_PITCH
+    return yaw, pitch
+
+
+def landmark_metrics(landmarks: np.ndarray) -> LandmarkMetrics:
+    """Computes every ratio of `LandmarkMetrics` for N faces with `(N, 68, 2)` landmarks."""
+    ears = eye_aspect_ratios(landmarks)
+    yaw, pitch = head_pose_ratios(landmarks)
+    return LandmarkMetrics(
+        left_ear=ears[:, 0],
+        right_ear=ears[:, 1],
+        mar=mouth_aspect_ratios(landmarks),
+        yaw=yaw,
+        pitch=pitch,
+    )
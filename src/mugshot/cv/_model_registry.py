@@ -0,0 +1,239 @@
+from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+import cv2
+import numpy as np
+
+type ModelKey = tuple[str, str, tuple[tuple[str, Any], ...]]
+
+
+class ModelRegistry(ABC):
+    """Abstract class for a process-wide cache of loaded models and classifiers.
+
+    Each asset is loaded once, memoized by its kind, path and options, and warmed up with a dummy
+    inference so that the first real frame is not slow.
+
+    Every `get` takes a reference to the asset, which its user gives back with `release`, e.g.
+    when a detector is closed. Assets are evicted on their last release, so detectors sharing an
+    asset keep it loaded. `evict` removes assets regardless of their references, e.g. for
+    process-wide teardown.
+    """
+
+    _models: dict[ModelKey, Any] = {}
+    _references: dict[ModelKey, int] = {}
+    _locks: dict[ModelKey, threading.Lock] = {}
+    _lock = threading.Lock()
+
+    WARM_UP_SIZE = (640, 480)
+    """(width, height) of the blank frame used to warm up models."""
+
+    @classmethod
+    def get(
+        cls,
+        kind: str,
+        path: str,
+        loader: Callable[[], Any],
+        warm_up: Optional[Callable[[Any], None]] = None,
+        **options,
+    ) -> Any:
+        """Returns the asset identified by `kind`, `path` and `options`, loading it if needed,
+        and takes a reference to it.
+
+        Arguments:
+        - `kind`: str -- Kind of asset, e.g. "cascade" or "yolo"
+        - `path`: str -- Path of the asset
+        - `loader`: function() -> Any -- Loads the asset, only called on a cache miss
+        - `warm_up`: Optional[function(model)] -- Runs a dummy inference on a freshly loaded asset
+        - `**options`: Hashable options the asset was loaded with, part of the cache key
+
+        Different assets may be loaded concurrently from different threads, and concurrent
+        requests for the same asset wait for a single load.
+        """
+        key = (kind, path, tuple(sorted(options.items())))
+
+        with cls._lock:
+            if key in cls._models:
+                cls._references[key] += 1
+                return cls._models[key]
+            key_lock = cls._locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have loaded the asset while this one waited
+            with cls._lock:
+                if key in cls._models:
+                    cls._references[key] += 1
+                    return cls._models[key]
+
+            start = time.perf_counter()
+            model = loader()
+            if warm_up is not None:
+                warm_up(model)
+            logging.info(
+                f"Loaded {kind} {os.path.basename(path)} in {time.perf_counter() - start:.2f} s"
+            )
+
+            with cls._lock:
+                cls._models[key] = model
+                cls._references[key] = 1
+            return model
+
+    @classmethod
+    def release(cls, model: Any) -> bool:
+        """Gives back a reference to an asset returned by `get`, and evicts the asset if it was
+        the last one. Assets that are not cached, e.g. already evicted, are ignored.
+
+        Returns:
+        - Whether the asset was evicted.
+        """
+        with cls._lock:
+            key = next(
+                (key for key, cached in cls._models.items() if cached is model), None
+            )
+            if key is None:
+                return False
+            cls._references[key] -= 1
+            if cls._references[key] > 0:
+                return False
+            del cls._models[key]
+            del cls._references[key]
+            cls._locks.pop(key, None)
+        logging.info(f"Released {key[0]} {os.path.basename(key[1])}")
+        return True
+
+    @classmethod
+    def load_concurrently(cls, *loaders: Callable[[], Any]) -> list[Any]:
+        """Calls each loader on its own thread, e.g. to load the models of a detector in parallel.
+        Most of the loading happens in native code, which releases the GIL.
+
+        If a loader raises, the results of the others are given back once every loader is done,
+        so that a failed start does not leak their references: results with a `close` method,
+        e.g. a `YoloBackend`, are closed, and others are released with `release`. The exception
+        of the first loader that raised is then re-raised.
+
+        Returns:
+        - The result of each loader, in order.
+        """
+        if len(loaders) < 2:
+            return [loader() for loader in loaders]
+        with ThreadPoolExecutor(len(loaders), thread_name_prefix="model-load") as pool:
+            futures = [pool.submit(loader) for loader in loaders]
+
+        errors = [future.exception() for future in futures]
+        if not any(errors):
+            return [future.result() for future in futures]
+
+        for future, error in zip(futures, errors):
+            if error is not None:
+                continue
+            result = future.result()
+            if callable(getattr(result, "close", None)):
+                result.close()
+            else:
+                cls.release(result)
+        raise next(error for error in errors if error is not None)
+
+    @classmethod
+    def evict(cls, path: Optional[str] = None, kind: Optional[str] = None) -> int:
+        """Removes cached assets matching `path` and `kind`, or all assets if both are None,
+        however many references they have.
+
+        The memory of an evicted asset is freed once no detector references it anymore.
+
+        Returns:
+        - The number of evicted assets.
+        """
+        with cls._lock:
+            keys = [
+                key
+                for key in cls._models
+                if (kind is None or key[0] == kind) and (path is None or key[1] == path)
+            ]
+            for key in keys:
+                del cls._models[key]
+                cls._references.pop(key, None)
+                cls._locks.pop(key, None)
+        return len(keys)
+
+    @classmethod
+    def loaded(cls) -> list[ModelKey]:
+        """Returns the keys of the currently cached assets."""
+        with cls._lock:
+            return list(cls._models)
+
+    @classmethod
+    def _blank_frame(cls) -> np.ndarray:
+        width, height = cls.WARM_UP_SIZE
+        return np.zeros((height, width, 3), np.uint8)
+
+    @classmethod
+    def cascade(cls, path: str, warm_up: bool = True) -> cv2.CascadeClassifier:
+        """Returns a Haar cascade classifier.
+
+        `path` is either a path to a cascade XML file, or the filename of a cascade bundled with
+        OpenCV (e.g. "haarcascade_eye.xml")."""
+        if not os.path.dirname(path):
+            path = os.path.join(cv2.data.haarcascades, path)  # type: ignore
+
+        def load():
+            classifier = cv2.CascadeClassifier(path)
+            if classifier.empty():
+                raise FileNotFoundError(f"Failed to load Haar cascade {path}")
+            return classifier
+
+        def run_warm_up(classifier: cv2.CascadeClassifier):
+            gray = cv2.cvtColor(cls._blank_frame(), cv2.COLOR_BGR2GRAY)
+            classifier.detectMultiScale(gray)
+
+        return cls.get("cascade", path, load, run_warm_up if warm_up else None)
+
+    @classmethod
+    def yolo(cls, path: str, warm_up: bool = True, **options):
+        """Returns an ultralytics YOLO model loaded from `path`.
+
+        `options` are passed to the `YOLO` constructor (e.g. `task="detect"`)."""
+
+        def load():
+            from ultralytics import YOLO
+
+            return YOLO(path, **options)
+
+        def run_warm_up(model):
+            model.predict(source=cls._blank_frame(), save=False, verbose=False)
+
+        return cls.get("yolo", path, load, run_warm_up if warm_up else None, **options)
+
+    @classmethod
+    def dlib_face_detector(cls, warm_up: bool = True):
+        """Returns dlib's HOG-based frontal face detector."""
+
+        def load():
+            import dlib
+
+            return dlib.get_frontal_face_detector()  # type: ignore
+
+        def run_warm_up(detector):
+            detector(cv2.cvtColor(cls._blank_frame(), cv2.COLOR_BGR2GRAY))
+
+        return cls.get("dlib_face", "", load, run_warm_up if warm_up else None)
+
+    @classmethod
+    def dlib_shape_predictor(cls, path: str, warm_up: bool = True):
+        """Returns a dlib facial landmark predictor loaded from `path`."""
+
+        def load():
+            import dlib
+
+            return dlib.shape_predictor(path)  # type: ignore
+
+        def run_warm_up(predictor):
+            import dlib
+
+            width, height = cls.WARM_UP_SIZE
+            gray = cv2.cvtColor(cls._blank_frame(), cv2.COLOR_BGR2GRAY)
+            predictor(gray, dlib.rectangle(0, 0, width // 2, height // 2))  # type: ignore
+
+        return cls.get("dlib_shape", path, load, run_warm_up if warm_up else None)
@@ -0,0 +1,105 @@
+import cv2
+
+from ._detections import Detections, FaceResult
+
+GREEN = (0, 255, 0)
+BLUE = (255, 0, 0)
+RED = (0, 0, 255)
+GRAY = (160, 160, 160)
+
+
+def draw_detections(
+    frame: cv2.typing.MatLike, detections: Detections
+) -> cv2.typing.MatLike:
+    """Draws structured detections onto a BGR frame in place.
+
+    Arguments:
+    - `frame`: cv2.Mat -- A 24-bit BGR image to draw on
+    - `detections`: Detections -- The detections to draw
+
+    Returns:
+    - `frame`, for convenience.
+    """
+    for face in detections.faces:
+        _draw_face(frame, face)
+
+    for (x, y, w, h), label in detections.labelled_boxes:
+        cv2.rectangle(frame, (x, y), (x + w, y + h), RED, 2)
+        cv2.putText(frame, label, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, RED, 2)
+
+    for i, (text, color) in enumerate(detections.status):
+        cv2.putText(
+            frame, text, (10, 30 * (i + 1)), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2
+        )
+
+    return frame
+
+
+def _draw_face(frame: cv2.typing.MatLike, face: FaceResult):
+    """Draws the results for a face onto a frame. Faces other than the primary face are only
+    outlined."""
+    face_x, face_y, face_w, face_h = face.box
+    if not face.primary:
+        cv2.rectangle(
+            frame, (face_x, face_y), (face_x + face_w, face_y + face_h), GRAY, 1
+        )
+        return
+
+    face_center_x = face_x + face_w // 2
+    face_center_y = face_y + face_h // 2
+
+    # Display the center of the face
+    cv2.circle(frame, (face_center_x, face_center_y), 5, GREEN, -1)
+    cv2.putText(
+        frame,
+        f"Center: ({face_center_x}, {face_center_y})",
+        (face_center_x + 10, face_center_y - 10),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.5,
+        GREEN,
+        2,
+    )
+
+    cv2.rectangle(
+        frame,
+        (face_x, face_y),
+        (face_x + face_w, face_y + face_h),
+        color=GREEN,
+        thickness=2,
+    )
+
+    if face.eyes is not None:
+        for x, y, w, h in face.eyes.boxes:
+            cv2.rectangle(frame, (x, y), (x + w, y + h), color=BLUE, thickness=2)
+            cv2.putText(
+                frame, "Eye", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, BLUE, 2
+            )
+
+        # Display closed eye status if no eye is detected
+        if face.eyes.is_left_eye_closed:
+            cv2.putText(
+                frame,
+                "Left Eye Closed",
+                (face_x, face_y - 20),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                RED,
+                2,
+            )
+        if face.eyes.is_right_eye_closed:
+            cv2.putText(
+                frame,
+                "Right Eye Closed",
+                (face_x + face_w // 2, face_y - 20),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                RED,
+                2,
+            )
+
+    if face.tongue is not None:
+        for x, y, w, h in face.tongue.boxes:
+            cv2.rectangle(frame, (x, y), (x + w, y + h), color=RED, thickness=2)
+            cv2.putText(
+                frame, "Tongue", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, RED, 2
+            )
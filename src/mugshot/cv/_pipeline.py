@@ -0,0 +1,149 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class Stage:
+    """A dataclass describing a stage of a `PipelineScheduler`."""
+
+    name: str
+    """Name of the stage, also the key of its result."""
+
+    run: Callable[[dict[str, Any]], Any]
+    """Computes the stage's result from the pipeline inputs and the latest results of earlier stages, keyed by name."""
+
+    rate: Optional[float] = None
+    """Maximum number of runs per second, None to run on every frame."""
+
+    asynchronous: bool = False
+    """Whether to run on a worker thread, so that a slow stage never delays the frame."""
+
+
+@dataclass
+class StageResult:
+    """A dataclass for the latest result of a stage."""
+
+    value: Any
+    """The value returned by the stage."""
+
+    timestamp: float
+    """Time of the frame the value was computed from."""
+
+    age: float = 0.0
+    """Seconds between `timestamp` and the frame the result was returned for."""
+
+
+class PipelineScheduler:
+    """Runs a sequence of stages, each at its own rate, and merges their latest results.
+
+    Stages run in order. Synchronous stages run on the calling thread. Asynchronous stages run on
+    their own worker thread, and are skipped while a previous run is still in flight, so the
+    frame rate never depends on them. Every call returns the latest result of each stage together
+    with its age.
+
+    Arguments:
+    - `stages`: list[Stage] -- The stages, in dependency order
+    - `clock`: function() -> float -- Monotonic clock in seconds
+    """
+
+    def __init__(
+        self, stages: list[Stage], clock: Callable[[], float] = time.monotonic
+    ):
+        self.stages = stages
+        self.clock = clock
+        self._executors = {
+            stage.name: ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"stage-{stage.name}"
+            )
+            for stage in stages
+            if stage.asynchronous
+        }
+        self._pending: dict[str, tuple[Future, float]] = {}
+        self._results: dict[str, StageResult] = {}
+        self._next_run: dict[str, float] = {}
+
+    def run(
+        self, inputs: dict[str, Any], timestamp: Optional[float] = None
+    ) -> dict[str, StageResult]:
+        """Runs the stages that are due on a frame.
+
+        Arguments:
+        - `inputs`: dict[str, Any] -- Pipeline inputs for this frame, passed to every stage
+        - `timestamp`: Optional[float] -- Time of the frame, the current time if None
+
+        Returns:
+        - The latest result of every stage that has produced one, keyed by stage name.
+        """
+        now = self.clock() if timestamp is None else timestamp
+        values = dict(inputs)
+
+        for stage in self.stages:
+            self._collect(stage.name)
+
+            if self._is_due(stage, now):
+                self._schedule_next(stage, now)
+                if stage.asynchronous:
+                    future = self._executors[stage.name].submit(stage.run, dict(values))
+                    self._pending[stage.name] = (future, now)
+                else:
+                    self._results[stage.name] = StageResult(stage.run(values), now)
+
+            result = self._results.get(stage.name)
+            values[stage.name] = result.value if result is not None else None
+
+        return {
+            name: StageResult(result.value, result.timestamp, now - result.timestamp)
+            for name, result in self._results.items()
+        }
+
+    def _is_due(self, stage: Stage, now: float) -> bool:
+        if stage.name in self._pending:
+            return False
+        if stage.rate is None or stage.name not in self._next_run:
+            return True
+        # Tolerate rounding, so a stage at an exact divisor of the frame rate is not skipped
+        return now >= self._next_run[stage.name] - 1e-9
+
+    def _schedule_next(self, stage: Stage, now: float):
+        if stage.rate is None:
+            return
+
+        # Runs are kept on a fixed grid, so frame jitter does not lower the average rate
+        period = 1 / stage.rate
+        next_run = self._next_run.get(stage.name, now) + period
+        self._next_run[stage.name] = next_run if next_run > now else now + period
+
+    def _collect(self, name: str):
+        """Stores the result of a finished asynchronous run of a stage."""
+        if name not in self._pending:
+            return
+
+        future, timestamp = self._pending[name]
+        if not future.done():
+            return
+
+        del self._pending[name]
+        exception = future.exception()
+        if exception is not None:
+            logging.error(f"Pipeline stage {name!r} failed: {exception!r}")
+            return
+        self._results[name] = StageResult(future.result(), timestamp)
+
+    def drain(self, timeout: Optional[float] = None):
+        """Waits for in-flight asynchronous runs, which are collected by the next `run`."""
+        wait([future for future, _ in self._pending.values()], timeout=timeout)
+
+    def reset(self):
+        """Forgets all results and ignores in-flight runs, e.g. when the tracked subject is lost."""
+        self._results.clear()
+        self._next_run.clear()
+        self._pending.clear()
+
+    def close(self):
+        """Shuts down the worker threads, without waiting for in-flight runs."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
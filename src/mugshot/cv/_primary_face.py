@@ -0,0 +1,108 @@
+from typing import Optional, Sequence
+
+from ._detections import Box
+
+
+def box_iou(a: Box, b: Box) -> float:
+    """Returns the intersection over union of two `(x, y, w, h)` boxes."""
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2 = min(a[0] + a[2], b[0] + b[2])
+    y2 = min(a[1] + a[3], b[1] + b[3])
+    intersection = max(x2 - x1, 0) * max(y2 - y1, 0)
+    union = a[2] * a[3] + b[2] * b[3] - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+class PrimaryFaceSelector:
+    """Picks the primary user's face among the faces found in each frame, and keeps its identity
+    across frames, so the cursor follows one person and only their face gets eye and tongue
+    detection.
+
+    The largest face becomes the primary face. On later frames, the primary face is the face that
+    best matches its previous box, by IoU, then by distance. Faces that moved by more than
+    `max_distance` times the primary face's width, or whose size changed by more than
+    `max_size_ratio`, never match. When no face matches, no face is primary, e.g. while the
+    detector misses the user for a few frames, until `max_missed` frames pass and the largest face
+    becomes the primary face again.
+
+    Arguments:
+    - `max_distance`: float -- Maximum move of the center between frames, as a fraction of the face's width
+    - `max_size_ratio`: float -- Maximum ratio between the widths of the face in consecutive frames
+    - `max_missed`: int -- Number of consecutive frames without a match after which the primary face is lost
+    """
+
+    def __init__(
+        self,
+        max_distance: float = 0.5,
+        max_size_ratio: float = 1.5,
+        max_missed: int = 5,
+    ):
+        self.max_distance = max_distance
+        self.max_size_ratio = max_size_ratio
+        self.max_missed = max_missed
+
+        self.box: Optional[Box] = None
+        """Latest box of the primary face, None when there is none."""
+
+        self.missed = 0
+        """Number of consecutive frames in which the primary face was not found."""
+
+    def select(self, faces: Sequence[Box]) -> Optional[int]:
+        """Finds the primary face among the faces of a new frame.
+
+        Arguments:
+        - `faces`: Sequence[Box] -- `(x, y, w, h)` boxes of the faces found in the frame, in frame pixels
+
+        Returns:
+        - The index of the primary face in `faces`, or None if it is not among them.
+        """
+        if self.box is None:
+            if len(faces) == 0:
+                return None
+            index = max(range(len(faces)), key=lambda i: faces[i][2] * faces[i][3])
+            return self._lock(faces, index)
+
+        best, best_key = None, None
+        for i, face in enumerate(faces):
+            distance = self._distance(self.box, face)
+            if distance > self.max_distance or not self._similar_size(self.box, face):
+                continue
+            key = (box_iou(self.box, face), -distance)
+            if best_key is None or key > best_key:
+                best, best_key = i, key
+
+        if best is not None:
+            return self._lock(faces, best)
+
+        self.missed += 1
+        if self.missed > self.max_missed:
+            # The user is gone, so start over from the largest face
+            self.reset()
+            return self.select(faces)
+        return None
+
+    def follow(self, box: Box):
+        """Moves the primary face to `box`, e.g. as followed by a tracker between detections."""
+        self.box = box
+        self.missed = 0
+
+    def reset(self):
+        """Forgets the primary face."""
+        self.box = None
+        self.missed = 0
+
+    def _lock(self, faces: Sequence[Box], index: int) -> int:
+        face = faces[index]
+        self.follow((int(face[0]), int(face[1]), int(face[2]), int(face[3])))
+        return index
+
+    @staticmethod
+    def _distance(a: Box, b: Box) -> float:
+        """Returns the distance between the centers of two boxes, relative to the width of `a`."""
+        dx = (b[0] + b[2] / 2) - (a[0] + a[2] / 2)
+        dy = (b[1] + b[3] / 2) - (a[1] + a[3] / 2)
+        return (dx * dx + dy * dy) ** 0.5 / max(a[2], 1)
+
+    def _similar_size(self, a: Box, b: Box) -> bool:
+        ratio = max(a[2], 1) / max(b[2], 1)
+        return 1 / self.max_size_ratio <= ratio <= self.max_size_ratio
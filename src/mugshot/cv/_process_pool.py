@@ -0,0 +1,333 @@
+import logging
+import multiprocessing
+from multiprocessing import shared_memory
+import queue
+import time
+import traceback
+from typing import Optional
+import cv2
+import numpy as np
+
+from ._base_cv_detection import BaseCVDetection
+from mugshot.mouse_input import FrameInput
+
+
+class SharedFrameRing:
+    """A ring of preallocated BGR frame buffers in shared memory.
+
+    Frames are written into and read from the slots in place, so they never need to be pickled
+    to cross a process boundary.
+
+    Arguments:
+    - `slots`: int -- Number of frame buffers
+    - `shape`: tuple[int, int, int] -- Shape `(height, width, 3)` of every frame
+    - `name`: Optional[str] -- Name of existing shared memory to attach to, None to create it
+    """
+
+    def __init__(
+        self, slots: int, shape: tuple[int, int, int], name: Optional[str] = None
+    ):
+        self.slots = slots
+        self.shape = shape
+        size = slots * int(np.prod(shape))
+
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            # Child processes share the creator's resource tracker, which unlinks the memory
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.frames = np.ndarray((slots, *shape), np.uint8, buffer=self.shm.buf)
+        """Array of shape `(slots, height, width, 3)` viewing the shared memory."""
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory, to attach to it from another process."""
+        return self.shm.name
+
+    def close(self, unlink: bool = False):
+        """Detaches from the shared memory, and frees it if `unlink` is True."""
+        del self.frames
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _detection_worker(
+    detection_class, detection_kwargs, ring_name, slots, shape, tasks, results
+):
+    """Entry point of a detector process.
+
+    Posts `(None, None, None, None)` once the detector is created, or
+    `(None, None, None, error)` if it could not be, then processes `(slot, sequence, annotate)`
+    tasks in place in the shared ring, writing the annotated frame back into the slot if
+    `annotate` is True. Returns `(slot, sequence, FrameInput, None)` results, or
+    `(slot, sequence, None, error)` for frames that raised, `error` being a traceback.
+    """
+    ring = SharedFrameRing(slots, shape, name=ring_name)
+    try:
+        detection = detection_class(**detection_kwargs)
+    except Exception:
+        results.put((None, None, None, traceback.format_exc()))
+        ring.close()
+        return
+    results.put((None, None, None, None))  # Ready
+
+    try:
+        while (task := tasks.get()) is not None:
+            slot, sequence, annotate = task
+            try:
+                frame_input = _process_task(detection, ring.frames[slot], annotate)
+            except Exception:
+                results.put((slot, sequence, None, traceback.format_exc()))
+                continue
+            results.put((slot, sequence, frame_input, None))
+    finally:
+        detection.close()
+        ring.close()
+
+
+def _process_task(detection, frame, annotate: bool) -> FrameInput:
+    """Processes a frame of the shared ring in place, and returns its inputs."""
+    if not annotate:
+        _, frame_input = detection.detect(frame)
+        return frame_input
+
+    annotated_frame, frame_input = detection.process_frame(frame)
+    if annotated_frame is not None and annotated_frame is not frame:
+        if annotated_frame.shape == frame.shape:
+            np.copyto(frame, annotated_frame)
+    return frame_input
+
+
+class ProcessPoolDetection(BaseCVDetection):
+    """Runs another detector in a pool of processes, to use more than one core.
+
+    Frames are copied into a `SharedFrameRing` and only slot indices are sent to the detector
+    processes, which return compact `FrameInput` results. Detection is pipelined, so
+    `process_frame` returns immediately with the newest result that has arrived, which may be a
+    few frames old, or with placeholder inputs if no new result arrived. Results are stamped with
+    the capture time of their own frame. When every slot is in flight, incoming frames are dropped. Frames the
+    detector raises on are logged and skipped.
+
+    To use it with `CVWorker`, pass e.g. `functools.partial(ProcessPoolDetection, AltCVDetection)`
+    as the detection class.
+
+    Arguments:
+    - `detection_class`: type[BaseCVDetection] -- Detector to run in each process, must be importable
+    - `workers`: int -- Number of detector processes
+    - `shape`: tuple[int, int, int] -- Frame shape `(height, width, 3)`, other frames are resized to it
+    - `start_method`: str -- Multiprocessing start method, "spawn" by default as Qt and PyTorch threads do not survive a fork
+    - `ready_timeout`: Optional[float] -- Seconds to wait for the detectors to load, None to wait indefinitely
+    - `**detection_kwargs`: Arguments for `detection_class`
+
+    Raises:
+    - `RuntimeError` if a detector process could not create its detector or exited while loading it.
+    - `TimeoutError` if the detectors did not load within `ready_timeout`.
+    """
+
+    POLL_INTERVAL = 0.1
+    """Seconds between checks that the detector processes are alive while waiting on them."""
+
+    def __init__(
+        self,
+        detection_class: type[BaseCVDetection],
+        workers: int = 2,
+        shape: tuple[int, int, int] = (480, 640, 3),
+        start_method: str = "spawn",
+        ready_timeout: Optional[float] = 120.0,
+        **detection_kwargs,
+    ):
+        self.shape = shape
+        self.ring = SharedFrameRing(2 * workers + 1, shape)
+
+        context = multiprocessing.get_context(start_method)
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        self.processes = [
+            context.Process(
+                target=_detection_worker,
+                args=(
+                    detection_class,
+                    detection_kwargs,
+                    self.ring.name,
+                    self.ring.slots,
+                    shape,
+                    self._tasks,
+                    self._results,
+                ),
+                name=f"mugshot-detection-{i}",
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+        for process in self.processes:
+            process.start()
+
+        try:
+            self._wait_ready(ready_timeout)
+        except BaseException:
+            self._terminate()
+            raise
+
+        self._sequence = 0
+        self._next_slot = 0
+        self._in_flight: set[int] = set()
+        self._captured: dict[int, float] = {}
+        self._latest_sequence = -1
+        self._latest_slot: Optional[int] = None
+        self._new_input: Optional[FrameInput] = None
+
+        self.dropped = 0
+        """Number of frames dropped because every slot was in flight."""
+
+    def _wait_ready(self, timeout: Optional[float]):
+        """Waits until every detector process has created its detector."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ready = 0
+        while ready < len(self.processes):
+            try:
+                *_, error = self._results.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                self._check_alive()
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(
+                        f"Detector processes did not load within {timeout} s"
+                    )
+                continue
+            if error is not None:
+                raise RuntimeError(f"Failed to create the detector:\n{error}")
+            ready += 1
+
+    def _check_alive(self):
+        """Raises `RuntimeError` if a detector process has exited."""
+        for process in self.processes:
+            if process.exitcode is not None:
+                raise RuntimeError(
+                    f"{process.name} exited with code {process.exitcode}"
+                )
+
+    def _collect(self, timeout: Optional[float] = 0):
+        """Collects finished results, keeping only the newest one."""
+        block = timeout is None or timeout > 0
+        while True:
+            try:
+                slot, sequence, frame_input, error = self._results.get(block, timeout)
+            except queue.Empty:
+                return
+            block = False
+
+            self._in_flight.discard(slot)
+            captured = self._captured.pop(sequence, None)
+            if error is not None:
+                logging.error(f"Detection failed on frame {sequence}:\n{error}")
+                continue
+            if frame_input.timestamp is None:
+                frame_input.timestamp = captured
+            if sequence > self._latest_sequence:
+                self._latest_sequence = sequence
+                self._latest_slot = slot
+                self._new_input = frame_input
+
+    def _free_slot(self) -> Optional[int]:
+        for i in range(self.ring.slots):
+            slot = (self._next_slot + i) % self.ring.slots
+            if slot not in self._in_flight and slot != self._latest_slot:
+                self._next_slot = (slot + 1) % self.ring.slots
+                return slot
+        return None
+
+    def _submit(
+        self, frame: cv2.typing.MatLike, annotate: bool, timestamp: Optional[float]
+    ) -> FrameInput:
+        """Submits a BGR frame, and returns the newest inputs that have arrived."""
+        self._collect()
+
+        slot = self._free_slot()
+        if slot is None:
+            self.dropped += 1
+        else:
+            if frame.shape == self.shape:
+                np.copyto(self.ring.frames[slot], frame)
+            else:
+                h, w = self.shape[:2]
+                cv2.resize(frame, (w, h), dst=self.ring.frames[slot])
+            self._in_flight.add(slot)
+            # Results lag behind, so stamp them with the time their own frame was captured
+            self._captured[self._sequence] = (
+                time.monotonic() if timestamp is None else timestamp
+            )
+            self._tasks.put((slot, self._sequence, annotate))
+            self._sequence += 1
+
+        frame_input = self._new_input or FrameInput(is_placeholder=True)
+        self._new_input = None
+        return frame_input
+
+    def detect(
+        self, frame: cv2.typing.MatLike, timestamp: Optional[float] = None
+    ) -> tuple[None, FrameInput]:
+        """Submits a BGR frame to be processed without annotation, and returns the newest inputs
+        that have arrived.
+
+        Arguments:
+        - `frame`: cv2.Mat -- A 24-bit BGR image
+        - `timestamp`: Optional[float] -- `time.monotonic()` capture time of the frame, now if None
+
+        Returns:
+        - A tuple of `(None, FrameInput)`. The inputs are a placeholder if no new result arrived since the last call.
+        """
+        return (None, self._submit(frame, False, timestamp))
+
+    def process_frame(
+        self, frame: cv2.typing.MatLike, timestamp: Optional[float] = None
+    ) -> tuple[cv2.typing.MatLike, FrameInput]:
+        """Submits a BGR frame, and returns the newest annotated frame and inputs that have arrived.
+
+        Arguments:
+        - `frame`: cv2.Mat -- A 24-bit BGR image
+        - `timestamp`: Optional[float] -- `time.monotonic()` capture time of the frame, now if None
+
+        Returns:
+        - A tuple of `(cv2.Mat, FrameInput)`. The inputs are a placeholder if no new result arrived since the last call, and the frame is `frame` itself until the first result arrives.
+        """
+        frame_input = self._submit(frame, True, timestamp)
+        if self._latest_slot is None:
+            return (frame, frame_input)
+
+        # The slot may be reused once a newer result arrives, so hand out a copy
+        return (self.ring.frames[self._latest_slot].copy(), frame_input)
+
+    def drain(self, timeout: Optional[float] = None):
+        """Waits until every submitted frame has been processed.
+
+        Raises:
+        - `RuntimeError` if a detector process exited, as its frames will never be processed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._in_flight:
+            remaining = self.POLL_INTERVAL
+            if deadline is not None:
+                remaining = min(deadline - time.monotonic(), remaining)
+                if remaining <= 0:
+                    return
+            self._collect(timeout=remaining)
+            if self._in_flight:
+                self._check_alive()
+
+    def close(self):
+        """Stops the detector processes and frees the shared memory."""
+        for _ in self.processes:
+            self._tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=5)
+        self._terminate()
+
+    def _terminate(self):
+        """Terminates the detector processes still running and frees the shared memory."""
+        for process in self.processes:
+            if process.is_alive():
+                logging.error(f"Terminating unresponsive {process.name}")
+                process.terminate()
+                process.join(timeout=5)
+        self.ring.close(unlink=True)
@@ -0,0 +1,97 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+import numpy as np
+
+from ._render_policy import RenderMode, RenderPolicy
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """A dataclass for a set of quality settings, applied with `BaseCVDetection.apply_quality`."""
+
+    detection_scale: float = 1.0
+    """Factor applied to the detector's configured face detection scale."""
+
+    detect_interval_scale: float = 1.0
+    """Factor applied to the detector's configured number of frames between full face detections, in tracking mode."""
+
+    tongue_rate: Optional[float] = None
+    """Maximum rate in Hz of tongue (YOLO) detection, None for the configured rate."""
+
+    annotation: RenderPolicy = field(default_factory=RenderPolicy)
+    """How frames are annotated while the preview is visible."""
+
+
+DEFAULT_QUALITY_LEVELS = (
+    QualityLevel(),
+    QualityLevel(0.75, 1.5, 15.0),
+    QualityLevel(0.5, 2.0, 5.0, RenderPolicy(RenderMode.DECIMATED, interval=2)),
+    QualityLevel(0.35, 3.0, 2.0, RenderPolicy(RenderMode.DECIMATED, interval=4)),
+)
+"""Quality levels from best to cheapest, used by `QualityGovernor` by default."""
+
+
+class QualityGovernor:
+    """Picks a quality level that keeps per-frame processing time within a budget.
+
+    Processing times are collected over a window of frames. When their 90th percentile exceeds
+    the budget, quality drops by one level. When it stays under `headroom` times the budget for
+    a whole window, quality rises by one level. Levels change at most once per window, so the
+    governor does not oscillate.
+
+    Arguments:
+    - `budget`: float -- Target processing time per frame in seconds, e.g. 0.033 for 30 fps
+    - `levels`: tuple[QualityLevel, ...] -- Quality levels from best to cheapest
+    - `window`: int -- Number of frames measured before each decision
+    - `headroom`: float -- Fraction of the budget under which quality is raised again
+    """
+
+    def __init__(
+        self,
+        budget: float = 0.033,
+        levels: tuple[QualityLevel, ...] = DEFAULT_QUALITY_LEVELS,
+        window: int = 30,
+        headroom: float = 0.7,
+    ):
+        self.budget = budget
+        self.levels = levels
+        self.window = window
+        self.headroom = headroom
+
+        self.index = 0
+        """Index of the current level in `levels`."""
+
+        self._times: deque[float] = deque(maxlen=window)
+
+    @property
+    def level(self) -> QualityLevel:
+        """The current quality level."""
+        return self.levels[self.index]
+
+    def record(self, elapsed: float) -> Optional[QualityLevel]:
+        """Records the processing time of a frame in seconds.
+
+        Returns:
+        - The new quality level if it changed, otherwise None.
+        """
+        self._times.append(elapsed)
+        if len(self._times) < self.window:
+            return None
+
+        p90 = float(np.percentile(self._times, 90))
+        if p90 > self.budget and self.index < len(self.levels) - 1:
+            self.index += 1
+        elif p90 < self.budget * self.headroom and self.index > 0:
+            self.index -= 1
+        else:
+            return None
+
+        # Measure the new level from scratch
+        self._times.clear()
+        return self.level
+
+    def reset(self):
+        """Returns to the best level and forgets measurements."""
+        self.index = 0
+        self._times.clear()
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from enum import Enum, auto
+
+
+class RenderMode(Enum):
+    FULL = auto()
+    """Annotate and emit every frame."""
+
+    DECIMATED = auto()
+    """Annotate and emit every Nth frame only."""
+
+    NONE = auto()
+    """Never annotate, and emit the raw frame or nothing."""
+
+
+@dataclass
+class RenderPolicy:
+    """A dataclass for how `CVWorker` renders the preview of processed frames."""
+
+    mode: RenderMode = RenderMode.FULL
+    """How frames are annotated."""
+
+    interval: int = 1
+    """With `RenderMode.DECIMATED`, the number of frames per annotated frame."""
+
+    emit_raw: bool = False
+    """Whether frames that are not annotated are still emitted raw for the preview, instead of nothing."""
+
+    def should_annotate(self, index: int) -> bool:
+        """Returns whether the `index`-th processed frame is annotated."""
+        if self.mode is RenderMode.FULL:
+            return True
+        if self.mode is RenderMode.DECIMATED:
+            return index % max(self.interval, 1) == 0
+        return False
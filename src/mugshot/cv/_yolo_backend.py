@@ -0,0 +1,292 @@
+from abc import ABC, abstractmethod
+import ast
+from dataclasses import dataclass
+import logging
+import shutil
+from typing import Optional
+import cv2
+import numpy as np
+
+from ._artifact_cache import MODEL_CACHE_DIR, ArtifactCache
+from ._model_registry import ModelRegistry
+
+
+@dataclass
+class YoloDetection:
+    """A dataclass for a single YOLO detection."""
+
+    xyxy: tuple[float, float, float, float]
+    """Bounding box `(x1, y1, x2, y2)` in pixels of the image passed to `predict`."""
+
+    conf: float
+    """Confidence score between 0.0 and 1.0."""
+
+    cls: int
+    """Class index."""
+
+
+class YoloBackend(ABC):
+    """An abstract base class for running YOLO inference."""
+
+    names: dict[int, str] = {}
+    """Class names by class index."""
+
+    @abstractmethod
+    def predict(
+        self, image: cv2.typing.MatLike, conf: float = 0.5
+    ) -> list[YoloDetection]:
+        """Detects objects in a BGR image.
+
+        Arguments:
+        - `image`: cv2.Mat -- A 24-bit BGR image of any size
+        - `conf`: float -- Minimum confidence of returned detections
+
+        Returns:
+        - Detections in descending order of confidence, in pixel coordinates of `image`.
+        """
+        ...
+
+    def close(self):
+        """Releases the models used by this backend to `ModelRegistry`."""
+        pass
+
+
+class UltralyticsBackend(YoloBackend):
+    """Runs a YOLO model with ultralytics and PyTorch.
+
+    Arguments:
+    - `path`: str -- Path to a `.pt` model
+    - `imgsz`: int -- Inference size, the longer side of the letterboxed input
+    """
+
+    def __init__(self, path: str, imgsz: int = 640):
+        self.path = path
+        self.imgsz = imgsz
+        self.model = ModelRegistry.yolo(path)
+        self.names = dict(self.model.names)
+
+    def predict(
+        self, image: cv2.typing.MatLike, conf: float = 0.5
+    ) -> list[YoloDetection]:
+        results = self.model.predict(
+            source=image, conf=conf, imgsz=self.imgsz, save=False, verbose=False
+        )
+
+        boxes = results[0].boxes
+        assert boxes is not None
+
+        return [
+            YoloDetection(
+                tuple(float(v) for v in xyxy),  # type: ignore
+                float(score),
+                int(cls),
+            )
+            for xyxy, score, cls in zip(
+                boxes.xyxy.tolist(), boxes.conf.tolist(), boxes.cls.tolist()
+            )
+        ]
+
+    def close(self):
+        ModelRegistry.release(self.model)
+
+
+class OnnxBackend(YoloBackend):
+    """Runs a YOLO model exported to ONNX with ONNX Runtime on the CPU, at a fixed input size.
+
+    The `.pt` model is exported once (optionally with int8 dynamic quantization) and cached in
+    `MODEL_CACHE_DIR`. Letterboxing and normalization write into preallocated buffers, so
+    `predict` allocates little per call.
+
+    Arguments:
+    - `path`: str -- Path to a `.pt` model, or to an already exported `.onnx` model
+    - `imgsz`: int -- Fixed square inference size
+    - `int8`: bool -- Whether to use an int8-quantized model
+    - `iou`: float -- IoU threshold for non-maximum suppression
+    """
+
+    PAD_VALUE = 114
+    """Gray value used to pad letterboxed inputs, as ultralytics does."""
+
+    def __init__(
+        self, path: str, imgsz: int = 640, int8: bool = False, iou: float = 0.7
+    ):
+        self.imgsz = imgsz
+        self.iou = iou
+        self.onnx_path = (
+            path if path.endswith(".onnx") else export_onnx(path, imgsz, int8=int8)
+        )
+
+        self.session = ModelRegistry.get(
+            "onnx", self.onnx_path, self._load_session, self._warm_up
+        )
+        self._input_name = self.session.get_inputs()[0].name
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.names = ast.literal_eval(metadata["names"]) if "names" in metadata else {}
+        self._end2end = metadata.get("end2end") == "True"
+
+        # Preallocated buffers for preprocessing
+        self._canvas = np.empty((imgsz, imgsz, 3), np.uint8)
+        self._input = np.empty((1, 3, imgsz, imgsz), np.float32)
+        self._affine = np.zeros((2, 3), np.float64)
+
+    def _load_session(self):
+        import onnxruntime
+
+        return onnxruntime.InferenceSession(
+            self.onnx_path, providers=["CPUExecutionProvider"]
+        )
+
+    def _warm_up(self, session):
+        name = session.get_inputs()[0].name
+        session.run(None, {name: np.zeros((1, 3, self.imgsz, self.imgsz), np.float32)})
+
+    def _letterbox(self, image: cv2.typing.MatLike) -> tuple[float, float, int, int]:
+        """Scales and pads `image` into the input buffer, the same way ultralytics does.
+
+        Returns:
+        - The `(scale_x, scale_y, pad_x, pad_y)` used, to map boxes back to `image`.
+        """
+        h, w = image.shape[:2]
+        ratio = min(self.imgsz / h, self.imgsz / w)
+        new_w, new_h = round(w * ratio), round(h * ratio)
+        scale_x, scale_y = new_w / w, new_h / h
+        pad_x = round((self.imgsz - new_w) / 2 - 0.1)
+        pad_y = round((self.imgsz - new_h) / 2 - 0.1)
+
+        # A single affine warp scales, centers and pads into the preallocated canvas. The
+        # half-pixel terms match the pixel centers of cv2.resize.
+        self._affine[0, 0] = scale_x
+        self._affine[1, 1] = scale_y
+        self._affine[0, 2] = pad_x + (scale_x - 1) / 2
+        self._affine[1, 2] = pad_y + (scale_y - 1) / 2
+        cv2.warpAffine(
+            image,
+            self._affine,
+            (self.imgsz, self.imgsz),
+            dst=self._canvas,
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=(self.PAD_VALUE,) * 3,
+        )
+
+        # HWC BGR uint8 -> NCHW RGB float32 in [0, 1]
+        np.multiply(
+            self._canvas[..., ::-1].transpose(2, 0, 1),
+            1 / 255,
+            out=self._input[0],
+            casting="unsafe",
+        )
+        return scale_x, scale_y, pad_x, pad_y
+
+    def predict(
+        self, image: cv2.typing.MatLike, conf: float = 0.5
+    ) -> list[YoloDetection]:
+        scale_x, scale_y, pad_x, pad_y = self._letterbox(image)
+        output = self.session.run(None, {self._input_name: self._input})[0][0]
+
+        if self._end2end:
+            # Rows of (x1, y1, x2, y2, conf, cls), already suppressed
+            keep = output[:, 4] >= conf
+            xyxy = output[keep, :4]
+            scores = output[keep, 4]
+            classes = output[keep, 5].astype(np.int32)
+            indices = np.argsort(-scores)
+        else:
+            # Columns of (cx, cy, w, h, class scores...)
+            class_scores = output[4:]
+            classes = class_scores.argmax(axis=0)
+            scores = class_scores[classes, np.arange(class_scores.shape[1])]
+            keep = scores >= conf
+            boxes, scores, classes = output[:4, keep].T, scores[keep], classes[keep]
+
+            xyxy = np.empty_like(boxes)
+            xyxy[:, :2] = boxes[:, :2] - boxes[:, 2:] / 2
+            xyxy[:, 2:] = boxes[:, :2] + boxes[:, 2:] / 2
+
+            indices = cv2.dnn.NMSBoxesBatched(
+                np.column_stack((xyxy[:, :2], boxes[:, 2:])).tolist(),
+                scores.tolist(),
+                classes.tolist(),
+                conf,
+                self.iou,
+            )
+            indices = np.asarray(indices, np.int32).reshape(-1)
+            indices = indices[np.argsort(-scores[indices])]
+
+        # Undo letterboxing
+        h, w = image.shape[:2]
+        xyxy = (xyxy - (pad_x, pad_y, pad_x, pad_y)) / (
+            scale_x,
+            scale_y,
+            scale_x,
+            scale_y,
+        )
+        xyxy = np.clip(xyxy, 0, (w, h, w, h))
+
+        return [
+            YoloDetection(
+                tuple(float(v) for v in xyxy[i]),  # type: ignore
+                float(scores[i]),
+                int(classes[i]),
+            )
+            for i in indices
+        ]
+
+    def close(self):
+        ModelRegistry.release(self.session)
+
+
+def export_onnx(path: str, imgsz: int, int8: bool = False) -> str:
+    """Exports a `.pt` YOLO model to ONNX with a fixed input size, caching the result in an
+    `ArtifactCache` in `MODEL_CACHE_DIR`.
+
+    Returns:
+    - The path of the exported (and optionally int8-quantized) `.onnx` model.
+    """
+    cache = ArtifactCache(MODEL_CACHE_DIR)
+
+    def export(destination: str):
+        from ultralytics import YOLO
+
+        logging.info(f"Exporting {path} to ONNX at {imgsz}x{imgsz}")
+        exported = YOLO(path).export(
+            format="onnx", imgsz=imgsz, dynamic=False, simplify=False
+        )
+        shutil.move(exported, destination)
+
+    fp32_path = cache.get(path, str(imgsz), ".onnx", export)
+    if not int8:
+        return fp32_path
+
+    def quantize(destination: str):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logging.info(f"Quantizing {fp32_path} to int8")
+        quantize_dynamic(fp32_path, destination, weight_type=QuantType.QUInt8)
+
+    return cache.get(path, f"{imgsz}-int8", ".onnx", quantize)
+
+
+YOLO_BACKENDS = ("ultralytics", "onnx", "onnx-int8")
+"""Names of the YOLO backends accepted by `create_yolo_backend`."""
+
+
+def create_yolo_backend(
+    name: str, path: str, imgsz: Optional[int] = None
+) -> YoloBackend:
+    """Creates a YOLO backend by name, one of `YOLO_BACKENDS`.
+
+    Arguments:
+    - `name`: str -- "ultralytics" for PyTorch, "onnx" for ONNX Runtime, or "onnx-int8" for an int8-quantized ONNX Runtime model
+    - `path`: str -- Path to a `.pt` model
+    - `imgsz`: Optional[int] -- Inference size, 640 if None
+    """
+    imgsz = imgsz or 640
+    if name == "ultralytics":
+        return UltralyticsBackend(path, imgsz=imgsz)
+    if name == "onnx":
+        return OnnxBackend(path, imgsz=imgsz)
+    if name == "onnx-int8":
+        return OnnxBackend(path, imgsz=imgsz, int8=True)
+    raise ValueError(f"Unknown YOLO backend {name!r}, expected one of {YOLO_BACKENDS}")
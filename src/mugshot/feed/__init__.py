@@ -1 +1,20 @@
-from ._feed_worker import FeedWorker
\ No newline at end of file
+from ._feed_worker import FeedWorker
+from ._frame_buffer import FrameBuffer
+from ._frame_envelope import FrameEnvelope
+from ._frame_source import (
+    FrameSource,
+    CameraSource,
+    VideoFileSource,
+    ImageDirectorySource,
+    open_source,
+)
+from ._capture_profile import (
+    CAPTURE_BACKENDS,
+    CAPTURE_PROFILES,
+    CaptureProfile,
+    CaptureSettings,
+    apply_profile,
+    candidate_profiles,
+    get_capture_profile,
+    read_settings,
+)
@@ -0,0 +1,186 @@
+from dataclasses import dataclass
+import logging
+import sys
+from typing import Optional
+import cv2
+
+CAPTURE_BACKENDS = {
+    "any": cv2.CAP_ANY,
+    "v4l2": cv2.CAP_V4L2,
+    "dshow": cv2.CAP_DSHOW,
+    "msmf": cv2.CAP_MSMF,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+}
+"""OpenCV capture backends accepted by `CaptureProfile.backend`, keyed by name."""
+
+
+def default_backend() -> str:
+    """Returns the name of the capture backend used by default, V4L2 on Linux."""
+    return "v4l2" if sys.platform.startswith("linux") else "any"
+
+
+@dataclass(frozen=True)
+class CaptureProfile:
+    """A dataclass for the settings requested from a camera when it is opened.
+
+    Devices may not support the requested settings, and fall back to the closest ones they do
+    support, so the settings in effect are read back as `CaptureSettings`.
+    """
+
+    name: str
+    """Name of the profile, e.g. for `MUGSHOT_CAPTURE_PROFILE`."""
+
+    width: int
+    """Requested frame width in pixels."""
+
+    height: int
+    """Requested frame height in pixels."""
+
+    fps: float = 30.0
+    """Requested frame rate."""
+
+    fourcc: Optional[str] = "MJPG"
+    """Requested pixel format as a four character code, None for the driver's default. Compressed formats reach higher resolutions and frame rates over USB."""
+
+    buffer_size: Optional[int] = 1
+    """Number of frames buffered by the driver, None for the driver's default. Every buffered frame adds a frame of latency."""
+
+    backend: Optional[str] = None
+    """Name of the capture backend in `CAPTURE_BACKENDS`, None for `default_backend()`."""
+
+    @property
+    def cost(self) -> float:
+        """Pixels captured per second, what auto-selection minimizes."""
+        return self.width * self.height * self.fps
+
+    def satisfies(self, size: Optional[tuple[int, int]]) -> bool:
+        """Returns whether frames of this profile are at least `size`, `(width, height)`."""
+        return size is None or (self.width >= size[0] and self.height >= size[1])
+
+
+CAPTURE_PROFILES = (
+    CaptureProfile("qvga", 320, 240),
+    CaptureProfile("vga", 640, 480),
+    CaptureProfile("hd", 1280, 720),
+    CaptureProfile("fhd", 1920, 1080),
+)
+"""Built-in capture profiles, from cheapest to most expensive."""
+
+
+@dataclass(frozen=True)
+class CaptureSettings:
+    """A dataclass for the settings a camera actually accepted, read back from the device."""
+
+    backend: str
+    """Name of the capture backend in use, as reported by OpenCV."""
+
+    width: int
+    """Frame width in pixels."""
+
+    height: int
+    """Frame height in pixels."""
+
+    fps: float
+    """Frame rate reported by the driver, 0 if unknown."""
+
+    fourcc: str
+    """Pixel format as a four character code, empty if unknown."""
+
+    buffer_size: int
+    """Number of frames buffered by the driver, 0 if unknown or unsupported by the backend."""
+
+    def satisfies(self, size: Optional[tuple[int, int]]) -> bool:
+        """Returns whether frames are at least `size`, `(width, height)`."""
+        return size is None or (self.width >= size[0] and self.height >= size[1])
+
+    def __str__(self) -> str:
+        return (
+            f"{self.width}x{self.height} {self.fourcc or '?'} at {self.fps:g} fps "
+            f"via {self.backend}, buffering {self.buffer_size or '?'} frames"
+        )
+
+
+def decode_fourcc(value: float) -> str:
+    """Decodes a `cv2.CAP_PROP_FOURCC` value into its four characters, empty if unknown."""
+    code = int(value)
+    if code <= 0:
+        return ""
+    return "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip("\0 ")
+
+
+def read_settings(capture: cv2.VideoCapture) -> CaptureSettings:
+    """Reads the settings in effect on an opened capture."""
+    try:
+        backend = capture.getBackendName()
+    except cv2.error:
+        backend = "unknown"
+    return CaptureSettings(
+        backend=backend,
+        width=int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        height=int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        fps=float(capture.get(cv2.CAP_PROP_FPS)),
+        fourcc=decode_fourcc(capture.get(cv2.CAP_PROP_FOURCC)),
+        buffer_size=int(capture.get(cv2.CAP_PROP_BUFFERSIZE)),
+    )
+
+
+def apply_profile(
+    capture: cv2.VideoCapture, profile: CaptureProfile
+) -> CaptureSettings:
+    """Requests the settings of a profile from an opened capture.
+
+    The pixel format is requested first, as V4L2 drivers only offer some resolutions and frame
+    rates in some formats. Settings the device rejects are left as they were.
+
+    Returns:
+    - The settings the device accepted.
+    """
+    if profile.fourcc is not None:
+        capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter.fourcc(*profile.fourcc))
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, profile.width)
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, profile.height)
+    capture.set(cv2.CAP_PROP_FPS, profile.fps)
+    if profile.buffer_size is not None:
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, profile.buffer_size)
+
+    settings = read_settings(capture)
+    if (settings.width, settings.height) != (profile.width, profile.height):
+        logging.info(
+            f"Capture profile {profile.name} requested {profile.width}x{profile.height}, "
+            f"the device accepted {settings.width}x{settings.height}"
+        )
+    return settings
+
+
+def candidate_profiles(
+    min_size: Optional[tuple[int, int]],
+    profiles: tuple[CaptureProfile, ...] = CAPTURE_PROFILES,
+) -> list[CaptureProfile]:
+    """Orders profiles for auto-selection: the profiles meeting `min_size` from cheapest to most
+    expensive, then the others from largest to smallest, as fallbacks.
+
+    Arguments:
+    - `min_size`: Optional[tuple[int, int]] -- `(width, height)` the frames should have at least, None for any size
+    - `profiles`: tuple[CaptureProfile, ...] -- Profiles to choose from
+    """
+    meeting = sorted(
+        (profile for profile in profiles if profile.satisfies(min_size)),
+        key=lambda profile: profile.cost,
+    )
+    others = sorted(
+        (profile for profile in profiles if not profile.satisfies(min_size)),
+        key=lambda profile: profile.cost,
+        reverse=True,
+    )
+    return meeting + others
+
+
+def get_capture_profile(name: str) -> CaptureProfile:
+    """Returns the built-in capture profile `name`, one of `CAPTURE_PROFILES`."""
+    for profile in CAPTURE_PROFILES:
+        if profile.name == name:
+            return profile
+    raise ValueError(
+        f"Unknown capture profile {name!r}, expected one of "
+        f"{[profile.name for profile in CAPTURE_PROFILES]}, 'auto' or 'default'"
+    )
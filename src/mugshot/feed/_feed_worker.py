@@ -1,63 +1,114 @@
 from dataclasses import dataclass
 import logging
 import time
+from typing import Optional
 from PySide6.QtCore import QThread, Signal
 import cv2
 
+from mugshot.telemetry import span
+from ._frame_envelope import FrameEnvelope
+from ._frame_source import CameraSource, FrameSource
+
 
 # Thread for camera feed
 class FeedWorker(QThread):
     """A worker thread for camera feed.
 
-    Public signals:
-    - `frameRead`: Signal(cv2.Mat) -- Indicates that a frame is read, and emits that frame
+    Frames are read in a loop on this thread and emitted with `frameRead` from it, so consumers
+    should only hand them over without blocking, e.g. into `CVWorker`'s latest-frame mailbox.
 
-    Public slots:
-    - `readFrame`: function(frame: cv2.Mat) -- Read a frame, then emits signal `frameRead`
+    Public signals:
+    - `frameRead`: Signal(cv2.Mat, FrameEnvelope) -- Indicates that a frame is read, and emits that frame with its sequence number and capture time. Emitted from the capture thread for every frame
+    - `sourceOpened`: Signal() -- Indicates that the frame source is opened, before the first frame is read
+    - `sourceFailed`: Signal(str) -- Indicates that the frame source could not be opened, and emits the reason
     """
 
-    # Public signal to indicate that a frame has been read and emits that frame
-    frameRead = Signal(cv2.Mat)
+    # Public signal to indicate that a frame has been read and emits that frame and its envelope
+    frameRead = Signal(cv2.Mat, FrameEnvelope)
+
+    # Public signals to indicate whether the frame source could be opened
+    sourceOpened = Signal()
+    sourceFailed = Signal(str)
 
-    def __init__(self):
+    MAX_READ_FAILURES = 30
+    """Number of consecutive failed reads after which the capture loop stops."""
+
+    READ_RETRY_MS = 10
+    """Milliseconds to wait before retrying a failed read."""
+
+    def __init__(self, source: Optional[FrameSource] = None):
         super().__init__()
-        self.capture = None
+        self.source = source if source is not None else CameraSource(0)
+        """The `FrameSource` to read from, the default camera by default."""
+
+        self.capture: Optional[FrameSource] = None
+        """The opened `FrameSource`, None until `run` has opened it."""
+
+        self.readCount = 0
+        """Number of frames read, the sequence number of the next frame."""
 
     # Run Thread
     def run(self):
-        """Overrides QThread.run(). Initializes a cv2.VideoCapture object asynchronously, and kickstarts an update loop.
+        """Overrides QThread.run(). Opens the frame source asynchronously, then reads frames in a loop
+        until interrupted by `quit`.
 
-        The initialization takes a few seconds."""
+        The initialization takes a few seconds for a camera."""
 
-        logging.info(f"Initializing VideoCapture in FeedWorker at {time.ctime()}")
+        logging.info(f"Initializing frame source in FeedWorker at {time.ctime()}")
         if self.capture == None:
-            self.capture = cv2.VideoCapture(0)  # Slow operation (~ 3 secs)
+            self.source.open()  # Slow operation for cameras (~ 3 secs)
+            self.capture = self.source
 
-        self.readFrame()  # Call once to kickstart update loop (readFrame -> repaint -> readFrame -> ...)
+        if not self.capture.is_opened():
+            logging.error("Video capture is not opened")
+            self.sourceFailed.emit("Video capture is not opened")
+            return
+        self.sourceOpened.emit()
+
+        failures = 0
+        while not self.isInterruptionRequested():
+            if self.readFrame():
+                failures = 0
+                continue
+
+            failures += 1
+            if failures >= self.MAX_READ_FAILURES:
+                logging.error(f"Stopping capture after {failures} failed reads")
+                break
+            self.msleep(self.READ_RETRY_MS)
 
-    def readFrame(self):
-        """Public slot to read from a camera."""
+    def readFrame(self) -> bool:
+        """Reads a frame from the source, then emits it mirrored with `frameRead`.
+
+        Returns whether a frame was read."""
 
         assert self.capture != None
 
         # Checks if camera is not open
-        if not self.capture.isOpened():
+        if not self.capture.is_opened():
             logging.error("Video capture is not opened")
-            return
+            return False
 
-        # ret (boolean) indicates whether frame was successfully read
-        ret, frame = self.capture.read()
-        if not ret:
+        with span("capture"):
+            frame = self.capture.read()
+        if frame is None:
             logging.error("Failed to read frame")
-            return
+            return False
+        envelope = FrameEnvelope(self.readCount, time.monotonic())
+        self.readCount += 1
 
         # Emits flipped image to mirror user
-        flippedImage = cv2.flip(frame, 1)
-        self.frameRead.emit(flippedImage)
+        with span("mirror"):
+            flippedImage = cv2.flip(frame, 1)
+        self.frameRead.emit(flippedImage, envelope)
+        return True
 
     # Stop Thread
     def quit(self):
-        """Overrides QThread.quit() to clean up 'cv2.videoCapture' object."""
+        """Overrides QThread.quit() to stop the capture loop and clean up the frame source."""
+
+        self.requestInterruption()
+        self.wait()
 
         if self.capture is not None:
             self.capture.release()
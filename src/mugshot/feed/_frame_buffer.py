@@ -0,0 +1,65 @@
+import threading
+from typing import Optional
+import cv2
+
+
+class FrameBuffer:
+    """A thread-safe single-slot frame buffer where the newest frame always wins.
+
+    A producer `put`s frames into the slot, overwriting any frame that has not been taken yet, and
+    a consumer `take`s the newest frame. A slow consumer therefore never sees a backlog of stale
+    frames, and the producer never blocks.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._frame: Optional[cv2.typing.MatLike] = None
+        self._closed = False
+
+        self.written = 0
+        """Number of frames put into the buffer."""
+
+        self.overwritten = 0
+        """Number of frames overwritten before being taken."""
+
+    def put(self, frame: cv2.typing.MatLike) -> bool:
+        """Puts a frame into the slot, overwriting any untaken frame.
+
+        Returns:
+        - True if the slot was empty, i.e. the consumer has taken every previous frame.
+        """
+        with self._condition:
+            was_empty = self._frame is None
+            if not was_empty:
+                self.overwritten += 1
+            self._frame = frame
+            self.written += 1
+            self._condition.notify_all()
+            return was_empty
+
+    def take(self, timeout: Optional[float] = None) -> Optional[cv2.typing.MatLike]:
+        """Removes and returns the newest untaken frame.
+
+        Arguments:
+        - `timeout`: Optional[float] -- Seconds to wait for a frame, None to wait indefinitely
+
+        Returns:
+        - The newest frame, or None if the timeout expired or the buffer was closed.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._frame is not None or self._closed, timeout
+            )
+            frame, self._frame = self._frame, None
+            return frame
+
+    def close(self):
+        """Wakes up any waiting consumer. Subsequent `take`s return without waiting."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        """Whether `close` has been called."""
+        return self._closed
@@ -0,0 +1,30 @@
+from dataclasses import dataclass, field
+import time
+from typing import Optional
+
+
+@dataclass
+class FrameEnvelope:
+    """A dataclass for the identity and timing of a frame as it flows through the pipeline, from
+    capture to the inputs executed for it."""
+
+    seq: int
+    """Sequence number of the frame, counted from 0 by the worker that read it."""
+
+    captured: float
+    """The `time.monotonic()` time the frame was read."""
+
+    stages: dict[str, float] = field(default_factory=dict)
+    """The `time.monotonic()` time each stage was done with the frame, keyed by stage name, in order."""
+
+    def mark(self, stage: str, timestamp: Optional[float] = None):
+        """Records that `stage` is done with the frame, at `timestamp` or now if None."""
+        self.stages[stage] = time.monotonic() if timestamp is None else timestamp
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Returns the seconds since the frame was read, at `now` or the current time if None."""
+        return (time.monotonic() if now is None else now) - self.captured
+
+    def latencies(self) -> dict[str, float]:
+        """Returns the seconds from capture to each stage, keyed by stage name."""
+        return {stage: t - self.captured for stage, t in self.stages.items()}
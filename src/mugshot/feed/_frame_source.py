@@ -0,0 +1,278 @@
+from abc import ABC, abstractmethod
+import logging
+import os
+from typing import Callable, Optional
+import cv2
+
+from ._capture_profile import (
+    CAPTURE_BACKENDS,
+    CaptureProfile,
+    CaptureSettings,
+    apply_profile,
+    candidate_profiles,
+    default_backend,
+    get_capture_profile,
+    read_settings,
+)
+
+
+class FrameSource(ABC):
+    """An abstract base class for anything that produces BGR frames.
+
+    Sources are opened lazily with `open`, so that slow initializations (e.g. a webcam) can be
+    done on a worker thread.
+    """
+
+    @abstractmethod
+    def open(self) -> bool:
+        """Opens the source. Returns whether the source was opened successfully."""
+        ...
+
+    @abstractmethod
+    def is_opened(self) -> bool:
+        """Returns whether the source is open and can be read from."""
+        ...
+
+    @abstractmethod
+    def read(self) -> Optional[cv2.typing.MatLike]:
+        """Reads the next frame.
+
+        Returns:
+        - A 24-bit BGR image, or None if no frame could be read (e.g. the source is exhausted).
+        """
+        ...
+
+    def release(self):
+        """Releases any resources held by the source."""
+        pass
+
+
+class CameraSource(FrameSource):
+    """A frame source reading from a camera device with `cv2.VideoCapture`.
+
+    Without a profile, the camera is opened with the driver's defaults, often an uncompressed
+    format at a high resolution with several frames buffered. With a `CaptureProfile`, the
+    backend, pixel format, resolution, frame rate and driver buffer depth are requested instead.
+    With "auto", the cheapest built-in profile meeting `min_size` is selected, trying more
+    expensive ones if the device does not accept it. The settings the device accepted are in
+    `settings` once opened.
+
+    Arguments:
+    - `index`: int -- Index of the camera
+    - `profile`: Optional[CaptureProfile | str] -- A profile, the name of a built-in profile, "auto", or None or "default" for the driver's defaults
+    - `min_size`: Optional[tuple[int, int] | function() -> Optional[tuple[int, int]]] -- `(width, height)` the frames should have at least with "auto", or a function returning it, called when opening the camera. None for any size
+    - `capture_factory`: function(index, [api_preference]) -> cv2.VideoCapture -- Creates the capture, e.g. a fake device in tests
+    """
+
+    def __init__(
+        self,
+        index: int = 0,
+        profile: Optional[CaptureProfile | str] = None,
+        min_size: Optional[
+            tuple[int, int] | Callable[[], Optional[tuple[int, int]]]
+        ] = None,
+        capture_factory: Callable[..., cv2.VideoCapture] = cv2.VideoCapture,
+    ):
+        self.index = index
+        if isinstance(profile, str) and profile not in ("auto", "default"):
+            profile = get_capture_profile(profile)
+        self.profile = None if profile == "default" else profile
+        """The requested `CaptureProfile`, "auto", or None for the driver's defaults."""
+
+        self.min_size = min_size
+        self.capture_factory = capture_factory
+        self.capture: Optional[cv2.VideoCapture] = None
+
+        self.selected_profile: Optional[CaptureProfile] = None
+        """The profile in effect once opened, None for the driver's defaults."""
+
+        self.settings: Optional[CaptureSettings] = None
+        """The settings the device accepted, None until opened."""
+
+    def open(self) -> bool:
+        if self.capture is None:
+            if isinstance(self.profile, CaptureProfile):
+                candidates, min_size = [self.profile], None
+            elif self.profile == "auto":
+                min_size = self.min_size() if callable(self.min_size) else self.min_size
+                candidates = candidate_profiles(min_size)
+            else:
+                candidates, min_size = [], None
+
+            # Slow operation (~ 3 secs)
+            self.capture = self._open_capture(candidates[0] if candidates else None)
+            if self.capture.isOpened():
+                self.settings = self._negotiate(candidates, min_size)
+                logging.info(f"Camera {self.index} is capturing {self.settings}")
+        return self.capture.isOpened()
+
+    def _open_capture(self, profile: Optional[CaptureProfile]) -> cv2.VideoCapture:
+        """Opens the camera with the backend of `profile`, falling back to any backend."""
+        if profile is None:
+            return self.capture_factory(self.index)
+
+        backend = profile.backend or default_backend()
+        capture = self.capture_factory(self.index, CAPTURE_BACKENDS[backend])
+        if not capture.isOpened() and backend != "any":
+            logging.warning(
+                f"Failed to open camera {self.index} with {backend}, trying any backend"
+            )
+            capture.release()
+            capture = self.capture_factory(self.index, cv2.CAP_ANY)
+        return capture
+
+    def _negotiate(
+        self,
+        candidates: list[CaptureProfile],
+        min_size: Optional[tuple[int, int]],
+    ) -> CaptureSettings:
+        """Applies the first candidate the device accepts with frames of at least `min_size`,
+        or the candidate giving the largest frames if none does."""
+        assert self.capture is not None
+
+        best: Optional[tuple[CaptureProfile, CaptureSettings]] = None
+        for profile in candidates:
+            settings = apply_profile(self.capture, profile)
+            if settings.satisfies(min_size):
+                self.selected_profile = profile
+                return settings
+            if best is None or settings.width * settings.height > (
+                best[1].width * best[1].height
+            ):
+                best = (profile, settings)
+
+        if best is None:
+            return read_settings(self.capture)
+        logging.warning(
+            f"Camera {self.index} accepted no capture profile of at least {min_size}"
+        )
+        self.selected_profile = best[0]
+        return apply_profile(self.capture, best[0])
+
+    def is_opened(self) -> bool:
+        return self.capture is not None and self.capture.isOpened()
+
+    def read(self) -> Optional[cv2.typing.MatLike]:
+        assert self.capture is not None
+
+        # ret (boolean) indicates whether frame was successfully read
+        ret, frame = self.capture.read()
+        return frame if ret else None
+
+    def release(self):
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+
+class VideoFileSource(FrameSource):
+    """A frame source reading from a recorded video file.
+
+    Arguments:
+    - `path`: str -- Path to a video file readable by `cv2.VideoCapture`
+    - `loop`: bool -- Whether to restart from the first frame when the video ends
+    """
+
+    def __init__(self, path: str, loop: bool = False):
+        self.path = path
+        self.loop = loop
+        self.capture: Optional[cv2.VideoCapture] = None
+
+    def open(self) -> bool:
+        if self.capture is None:
+            self.capture = cv2.VideoCapture(self.path)
+        return self.capture.isOpened()
+
+    def is_opened(self) -> bool:
+        return self.capture is not None and self.capture.isOpened()
+
+    def read(self) -> Optional[cv2.typing.MatLike]:
+        assert self.capture is not None
+
+        ret, frame = self.capture.read()
+        if not ret and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read()
+        return frame if ret else None
+
+    def release(self):
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+
+class ImageDirectorySource(FrameSource):
+    """A frame source reading image files from a directory in filename order. Files that cannot
+    be read as images are skipped with a warning.
+
+    Arguments:
+    - `path`: str -- Path to a directory of images
+    - `loop`: bool -- Whether to restart from the first image after the last one
+    """
+
+    EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+    """File extensions that are read as frames, compared case-insensitively."""
+
+    def __init__(self, path: str, loop: bool = False):
+        self.path = path
+        self.loop = loop
+        self.files: Optional[list[str]] = None
+        self._index = 0
+
+    def open(self) -> bool:
+        if self.files is None:
+            if not os.path.isdir(self.path):
+                return False
+            self.files = sorted(
+                os.path.join(self.path, name)
+                for name in os.listdir(self.path)
+                if name.lower().endswith(self.EXTENSIONS)
+            )
+            self._index = 0
+        return len(self.files) > 0
+
+    def is_opened(self) -> bool:
+        return self.files is not None and len(self.files) > 0
+
+    def read(self) -> Optional[cv2.typing.MatLike]:
+        assert self.files is not None
+
+        # Unreadable files are skipped, but at most once per read, so looping over a directory
+        # where nothing is readable still ends
+        for _ in range(len(self.files)):
+            if self._index >= len(self.files):
+                if not self.loop:
+                    return None
+                self._index = 0
+
+            path = self.files[self._index]
+            self._index += 1
+
+            frame = cv2.imread(path, cv2.IMREAD_COLOR)
+            if frame is not None:
+                return frame
+            logging.warning(f"Skipping {path}, it could not be read as an image")
+        return None
+
+    def release(self):
+        self.files = None
+        self._index = 0
+
+
+def open_source(
+    spec: str | int, profile: Optional[CaptureProfile | str] = None
+) -> FrameSource:
+    """Creates a frame source from a command line style specification.
+
+    An integer (or a string of digits) refers to a camera index, a directory refers to an image
+    directory, and anything else is treated as a video file. The source is not opened.
+
+    Arguments:
+    - `spec`: str | int -- The specification
+    - `profile`: Optional[CaptureProfile | str] -- Capture profile of cameras, see `CameraSource`
+    """
+    if isinstance(spec, int) or spec.isdigit():
+        return CameraSource(int(spec), profile)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec)
+    return VideoFileSource(spec)
@@ -1,5 +1,24 @@
 """Module for performing various mouse inputs"""
 
 from ._frame_input import FrameInput
+from ._gesture_engine import Gesture, GestureEngine, GestureEvent, GesturePhase
 from ._mouse_action import MouseAction
 from ._screen import Screen
+from ._output_backend import (
+    OutputBackend,
+    PyAutoGUIBackend,
+    XTestBackend,
+    UInputBackend,
+    RecordingBackend,
+    create_output_backend,
+    get_output_backend,
+    set_output_backend,
+)
+from ._output_worker import OutputWorker
+from ._scroll_controller import ScrollController
+from ._cursor_filter import (
+    CursorFilter,
+    OneEuroFilter,
+    KalmanFilter,
+    create_cursor_filter,
+)
@@ -0,0 +1,185 @@
+from abc import ABC, abstractmethod
+import math
+from typing import Optional
+import numpy as np
+
+
+class CursorFilter(ABC):
+    """An abstract base class for smoothing cursor positions measured at irregular times.
+
+    Filters estimate a position and a velocity at the time of the latest measurement, so the
+    position can be predicted at a later time, e.g. to make up for pipeline latency."""
+
+    def __init__(self):
+        self.position: Optional[np.ndarray] = None
+        """Estimated `(x, y)` position at `timestamp`, None before the first measurement."""
+
+        self.velocity: Optional[np.ndarray] = None
+        """Estimated `(x, y)` velocity per second at `timestamp`, None before the first measurement."""
+
+        self.timestamp: Optional[float] = None
+        """Time in seconds of the latest measurement, None before the first measurement."""
+
+    @abstractmethod
+    def update(self, position: tuple[float, float], timestamp: float):
+        """Adds a measured `(x, y)` position, taken at `timestamp` in seconds."""
+        ...
+
+    def predict(self, timestamp: float) -> Optional[tuple[float, float]]:
+        """Returns the `(x, y)` position extrapolated to `timestamp` at the estimated velocity,
+        None before the first measurement."""
+        if self.position is None or self.velocity is None or self.timestamp is None:
+            return None
+        x, y = self.position + self.velocity * (timestamp - self.timestamp)
+        return (float(x), float(y))
+
+    def reset(self):
+        """Forgets every measurement."""
+        self.position = None
+        self.velocity = None
+        self.timestamp = None
+
+
+class OneEuroFilter(CursorFilter):
+    """A One Euro filter, a low-pass filter whose cutoff frequency rises with speed.
+
+    Slow movements are smoothed heavily to remove jitter, and fast movements lightly to keep lag
+    low. See Casiez et al., "1€ Filter", CHI 2012.
+
+    The velocity is estimated from the measurements rather than from the filtered positions. A
+    low-pass filter lags a constant velocity by its time constant, so predictions add it back.
+
+    Arguments:
+    - `min_cutoff`: float -- Cutoff frequency in Hz at rest, lower for less jitter
+    - `beta`: float -- Increase of the cutoff frequency per unit of speed, higher for less lag
+    - `d_cutoff`: float -- Cutoff frequency in Hz for smoothing the velocity
+    """
+
+    def __init__(
+        self, min_cutoff: float = 1.0, beta: float = 0.01, d_cutoff: float = 1.0
+    ):
+        super().__init__()
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._measured: Optional[np.ndarray] = None
+        self._lag = np.zeros(2)
+
+    @staticmethod
+    def _alpha(cutoff, dt: float):
+        tau = 1 / (2 * math.pi * cutoff)
+        return 1 / (1 + tau / dt)
+
+    def update(self, position: tuple[float, float], timestamp: float):
+        measured = np.asarray(position, np.float64)
+        if self.position is None or self.velocity is None or self.timestamp is None:
+            self.position = measured
+            self.velocity = np.zeros(2)
+            self.timestamp = timestamp
+            self._measured = measured
+            return
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return
+
+        alpha_d = self._alpha(self.d_cutoff, dt)
+        self.velocity = (
+            alpha_d * (measured - self._measured) / dt + (1 - alpha_d) * self.velocity
+        )
+
+        cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+        alpha = self._alpha(cutoff, dt)
+        self.position = alpha * measured + (1 - alpha) * self.position
+        self.timestamp = timestamp
+        self._measured = measured
+        self._lag = 1 / (2 * math.pi * cutoff)
+
+    def predict(self, timestamp: float) -> Optional[tuple[float, float]]:
+        if self.position is None or self.velocity is None or self.timestamp is None:
+            return None
+        x, y = self.position + self.velocity * (timestamp - self.timestamp + self._lag)
+        return (float(x), float(y))
+
+    def reset(self):
+        super().reset()
+        self._measured = None
+        self._lag = np.zeros(2)
+
+
+class KalmanFilter(CursorFilter):
+    """A constant-velocity Kalman filter, with the state `(x, y, vx, vy)`.
+
+    Arguments:
+    - `acceleration`: float -- Standard deviation of the unmodelled acceleration, per second squared, higher for less lag
+    - `measurement_noise`: float -- Standard deviation of measured positions, higher for less jitter
+    """
+
+    def __init__(self, acceleration: float = 500.0, measurement_noise: float = 5.0):
+        super().__init__()
+        self.acceleration = acceleration
+        self.measurement_noise = measurement_noise
+        self._covariance = np.eye(4)
+
+    def update(self, position: tuple[float, float], timestamp: float):
+        measured = np.asarray(position, np.float64)
+        if self.position is None or self.velocity is None or self.timestamp is None:
+            self.position = measured
+            self.velocity = np.zeros(2)
+            self.timestamp = timestamp
+            # Start unsure of the velocity, so the first few measurements set it
+            self._covariance = np.diag([1.0, 1.0, 1e6, 1e6]) * self.measurement_noise**2
+            return
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return
+
+        # Predict the state at the measurement's time
+        transition = np.eye(4)
+        transition[0, 2] = transition[1, 3] = dt
+        state = transition @ np.concatenate((self.position, self.velocity))
+
+        # White-noise acceleration, independent per axis
+        q = self.acceleration**2
+        noise = np.zeros((4, 4))
+        noise[0, 0] = noise[1, 1] = q * dt**4 / 4
+        noise[0, 2] = noise[2, 0] = noise[1, 3] = noise[3, 1] = q * dt**3 / 2
+        noise[2, 2] = noise[3, 3] = q * dt**2
+        covariance = transition @ self._covariance @ transition.T + noise
+
+        # Correct it with the measured position, which is the first two state variables
+        innovation = measured - state[:2]
+        innovation_cov = covariance[:2, :2] + np.eye(2) * self.measurement_noise**2
+        gain = covariance[:, :2] @ np.linalg.inv(innovation_cov)
+        state = state + gain @ innovation
+        self._covariance = covariance - gain @ covariance[:2, :]
+
+        self.position = state[:2]
+        self.velocity = state[2:]
+        self.timestamp = timestamp
+
+    def reset(self):
+        super().reset()
+        self._covariance = np.eye(4)
+
+
+CURSOR_FILTERS = ("none", "one-euro", "kalman")
+"""Names of the cursor filters accepted by `create_cursor_filter`."""
+
+
+def create_cursor_filter(name: str) -> Optional[CursorFilter]:
+    """Creates a cursor filter by name with default parameters, one of `CURSOR_FILTERS`.
+
+    Returns:
+    - The filter, or None for "none".
+    """
+    if name == "none":
+        return None
+    if name == "one-euro":
+        return OneEuroFilter()
+    if name == "kalman":
+        return KalmanFilter()
+    raise ValueError(
+        f"Unknown cursor filter {name!r}, expected one of {CURSOR_FILTERS}"
+    )
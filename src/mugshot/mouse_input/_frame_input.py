@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from mugshot.feed import FrameEnvelope
+
 
 @dataclass
 class FrameInput:
@@ -19,3 +21,15 @@ class FrameInput:
 
     is_tongue_down: Optional[bool] = None
     """`Optional[bool]`, when the tongue is stuck out, whether the tongue extends downwards. None by default."""
+
+    stage_ages: Optional[dict[str, float]] = None
+    """`Optional[dict[str, float]]`, the age in seconds of the detection result each input was merged from, keyed by stage name. None when every input comes from the current frame."""
+
+    timestamp: Optional[float] = None
+    """`Optional[float]`, the `time.monotonic()` capture time of the frame the inputs were detected from. None if unknown."""
+
+    is_placeholder: bool = False
+    """`bool`, whether the inputs are a placeholder for a frame no result was detected from yet, e.g. while `ProcessPoolDetection` lags behind. Placeholders carry no observations, so consumers skip them rather than treating them as nothing being observed."""
+
+    envelope: Optional[FrameEnvelope] = None
+    """`Optional[FrameEnvelope]`, the sequence number and stage times of the frame that carried the inputs, which is newer than the frame they were detected from when detection lags, e.g. with `ProcessPoolDetection`. None if unknown."""
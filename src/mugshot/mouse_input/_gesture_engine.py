@@ -0,0 +1,189 @@
+from dataclasses import dataclass
+from enum import Enum
+import time
+from typing import Optional
+
+from ._frame_input import FrameInput
+
+
+class GesturePhase(Enum):
+    """Transitions of a gesture."""
+
+    PRESS = "press"
+    """The gesture started."""
+
+    HOLD = "hold"
+    """The gesture has been going on for the gesture's hold time."""
+
+    RELEASE = "release"
+    """The gesture ended."""
+
+
+@dataclass(frozen=True)
+class GestureEvent:
+    """A dataclass for a transition of a gesture."""
+
+    gesture: str
+    """Name of the gesture, e.g. "left_eye"."""
+
+    phase: GesturePhase
+    """The transition."""
+
+    timestamp: float
+    """The `time.monotonic()` capture time of the frame that caused the transition."""
+
+
+class Gesture:
+    """Debounces whether a gesture is observed in each frame into press, hold and release
+    transitions.
+
+    The gesture is pressed after being observed in `press_frames` consecutive frames, and released
+    after being missed in `release_frames` consecutive frames. The gap between both thresholds is
+    a hysteresis, so single-frame misdetections neither press nor release it.
+
+    Arguments:
+    - `name`: str -- Name of the gesture
+    - `press_frames`: int -- Number of consecutive frames with the gesture to press it
+    - `release_frames`: int -- Number of consecutive frames without the gesture to release it
+    - `hold_time`: Optional[float] -- Seconds after pressing at which a hold transition happens, None for no hold transition
+    """
+
+    def __init__(
+        self,
+        name: str,
+        press_frames: int = 3,
+        release_frames: int = 2,
+        hold_time: Optional[float] = 0.5,
+    ):
+        self.name = name
+        self.press_frames = press_frames
+        self.release_frames = release_frames
+        self.hold_time = hold_time
+
+        self.pressed = False
+        """Whether the gesture is pressed."""
+
+        self.held = False
+        """Whether the gesture has been pressed for `hold_time`."""
+
+        self.pressed_at: Optional[float] = None
+        """Time the gesture was pressed at, None when released."""
+
+        self._streak = 0
+
+    def update(self, observed: bool, timestamp: float) -> Optional[GestureEvent]:
+        """Updates the gesture with a new frame.
+
+        Arguments:
+        - `observed`: bool -- Whether the gesture is seen in the frame
+        - `timestamp`: float -- `time.monotonic()` capture time of the frame
+
+        Returns:
+        - The transition the frame caused, None if there is none.
+        """
+        # Counts consecutive frames contradicting the current state
+        self._streak = self._streak + 1 if observed != self.pressed else 0
+
+        if not self.pressed and self._streak >= self.press_frames:
+            self.pressed, self.pressed_at, self._streak = True, timestamp, 0
+            return GestureEvent(self.name, GesturePhase.PRESS, timestamp)
+
+        if self.pressed and self._streak >= self.release_frames:
+            return self.release(timestamp)
+
+        if (
+            self.pressed
+            and not self.held
+            and self.hold_time is not None
+            and timestamp - self.pressed_at >= self.hold_time  # type: ignore
+        ):
+            self.held = True
+            return GestureEvent(self.name, GesturePhase.HOLD, timestamp)
+
+        return None
+
+    def release(self, timestamp: float) -> Optional[GestureEvent]:
+        """Releases the gesture immediately.
+
+        Returns:
+        - The release transition, None if the gesture was not pressed.
+        """
+        was_pressed = self.pressed
+        self.pressed, self.held, self.pressed_at, self._streak = False, False, None, 0
+        if not was_pressed:
+            return None
+        return GestureEvent(self.name, GesturePhase.RELEASE, timestamp)
+
+
+class GestureEngine:
+    """Turns the stream of `FrameInput`s into gesture transitions, so that inputs are only
+    executed when a gesture starts or ends rather than on every frame.
+
+    The gestures are "left_eye" and "right_eye" for closed eyes, and "tongue_down" and "tongue_up"
+    for a tongue stuck out downwards or not. Inputs that are None count as the gesture not being
+    observed, and placeholder inputs are skipped.
+
+    Arguments:
+    - `press_frames`: int -- Number of consecutive frames with a gesture to press it
+    - `release_frames`: int -- Number of consecutive frames without a gesture to release it
+    - `hold_time`: Optional[float] -- Seconds after pressing at which a hold transition happens, None for no hold transitions
+    """
+
+    GESTURES = ("left_eye", "right_eye", "tongue_down", "tongue_up")
+    """Names of the gestures."""
+
+    def __init__(
+        self,
+        press_frames: int = 3,
+        release_frames: int = 2,
+        hold_time: Optional[float] = 0.5,
+    ):
+        self.gestures = {
+            name: Gesture(name, press_frames, release_frames, hold_time)
+            for name in self.GESTURES
+        }
+        """Every gesture, keyed by name."""
+
+    def update(self, frame_input: FrameInput) -> list[GestureEvent]:
+        """Updates every gesture with the inputs of a new frame.
+
+        Returns:
+        - The transitions caused by the frame, usually none.
+        """
+        if frame_input.is_placeholder:
+            return []
+
+        timestamp = (
+            time.monotonic() if frame_input.timestamp is None else frame_input.timestamp
+        )
+        observed = {
+            "left_eye": frame_input.is_left_eye_closed is True,
+            "right_eye": frame_input.is_right_eye_closed is True,
+            "tongue_down": frame_input.is_tongue_down is True,
+            "tongue_up": frame_input.is_tongue_down is False,
+        }
+
+        events = []
+        for name, gesture in self.gestures.items():
+            event = gesture.update(observed[name], timestamp)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def is_pressed(self, name: str) -> bool:
+        """Returns whether the gesture `name` is pressed."""
+        return self.gestures[name].pressed
+
+    def reset(self, timestamp: Optional[float] = None) -> list[GestureEvent]:
+        """Releases every gesture, e.g. when inputs are paused.
+
+        Returns:
+        - The release transitions of the gestures that were pressed.
+        """
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        events = []
+        for gesture in self.gestures.values():
+            event = gesture.release(timestamp)
+            if event is not None:
+                events.append(event)
+        return events
@@ -1,13 +1,15 @@
 from abc import ABC
-import pyautogui
 
+from mugshot.mouse_input._output_backend import get_output_backend
 from mugshot.mouse_input._screen import Screen
 
 type Point = tuple[int, int]
 
 
 class MouseAction(ABC):
-    """Abstract class for sending mouse actions."""
+    """Abstract class for sending mouse actions through the current output backend.
+
+    See `set_output_backend` to change the backend."""
 
     is_left_down = False
     is_right_down = False
@@ -24,53 +26,52 @@ class MouseAction(ABC):
             )
 
         bound_x, bound_y = bound((x, y), Screen.get_size())
-        pyautogui.moveTo(bound_x, bound_y)
+        get_output_backend().move_to(bound_x, bound_y)
 
     @staticmethod
     def get_position() -> Point:
         """Returns the cursor's current coordinates."""
-        pos = pyautogui.position()
-        return (int(pos.x), int(pos.y))
+        return get_output_backend().position()
 
     @classmethod
     def left_down(cls):
         """Presses the left mouse button down."""
         if not cls.is_left_down:
-            pyautogui.mouseDown(button="left")
+            get_output_backend().button("left", True)
             cls.is_left_down = True
 
     @classmethod
     def left_up(cls):
         """Releases the left mouse button if it was previously pressed down."""
         if cls.is_left_down:
-            pyautogui.mouseUp(button="left")
+            get_output_backend().button("left", False)
             cls.is_left_down = False
 
     @classmethod
     def left_click(cls):
         """Performs a left mouse button click."""
         if not cls.is_left_down:
-            pyautogui.leftClick()
+            get_output_backend().click("left")
 
     @classmethod
     def right_down(cls):
         """Presses the right mouse button down."""
         if not cls.is_right_down:
-            pyautogui.mouseDown(button="right")
+            get_output_backend().button("right", True)
             cls.is_right_down = True
 
     @classmethod
     def right_up(cls):
         """Releases the right mouse button if it was previously pressed down."""
         if cls.is_right_down:
-            pyautogui.mouseUp(button="right")
+            get_output_backend().button("right", False)
             cls.is_right_down = False
 
     @classmethod
     def right_click(cls):
         """Performs a right mouse button click."""
         if not cls.is_right_down:
-            pyautogui.rightClick()
+            get_output_backend().click("right")
 
     @staticmethod
     def clear_down():
@@ -81,9 +82,9 @@ class MouseAction(ABC):
     @staticmethod
     def v_scroll(clicks: int):
         """Performs vertical scrolling by `clicks` amount."""
-        pyautogui.vscroll(clicks)
+        get_output_backend().scroll(clicks)
 
     @staticmethod
     def h_scroll(clicks: int):
         """Performs horizontal scrolling by `clicks` amount. Functionality limited to Linux."""
-        pyautogui.hscroll(clicks)
+        get_output_backend().scroll(clicks, horizontal=True)
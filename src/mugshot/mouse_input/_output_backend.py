@@ -0,0 +1,316 @@
+from abc import ABC, abstractmethod
+import threading
+from typing import Optional
+
+type Button = str
+"""A mouse button, one of "left", "middle" or "right"."""
+
+
+class OutputBackend(ABC):
+    """An abstract base class for sending mouse events to the operating system.
+
+    The screen size is queried once and cached until `invalidate_screen` is called, e.g. when
+    the screen geometry changes."""
+
+    def __init__(self):
+        self._screen_size: Optional[tuple[int, int]] = None
+
+    def screen_size(self) -> tuple[int, int]:
+        """Returns the size of the screen in pixels as a (width, height) tuple."""
+        if self._screen_size is None:
+            self._screen_size = self._query_screen_size()
+        return self._screen_size
+
+    def invalidate_screen(self):
+        """Forgets the cached screen size, so it is queried again on next use."""
+        self._screen_size = None
+
+    @abstractmethod
+    def _query_screen_size(self) -> tuple[int, int]: ...
+
+    @abstractmethod
+    def move_to(self, x: int, y: int):
+        """Moves the cursor to coordinates (`x`, `y`) on the screen."""
+        ...
+
+    @abstractmethod
+    def position(self) -> tuple[int, int]:
+        """Returns the cursor's current coordinates."""
+        ...
+
+    @abstractmethod
+    def button(self, button: Button, down: bool):
+        """Presses `button` down if `down` is True, or releases it."""
+        ...
+
+    @abstractmethod
+    def scroll(self, clicks: int, horizontal: bool = False):
+        """Scrolls by `clicks`, up or right when positive."""
+        ...
+
+    def click(self, button: Button):
+        """Presses and releases `button`."""
+        self.button(button, True)
+        self.button(button, False)
+
+    def close(self):
+        """Releases the resources held by this backend."""
+        pass
+
+
+class PyAutoGUIBackend(OutputBackend):
+    """Sends mouse events with pyautogui.
+
+    Every call passes `_pause=False`, skipping the `pyautogui.PAUSE` sleep (0.1 s by default)
+    after each event."""
+
+    def __init__(self):
+        super().__init__()
+        from ._screen import _pyautogui
+
+        self.pyautogui = _pyautogui()
+
+    def _query_screen_size(self) -> tuple[int, int]:
+        width, height = self.pyautogui.size()
+        return (int(width), int(height))
+
+    def move_to(self, x: int, y: int):
+        self.pyautogui.moveTo(x, y, _pause=False)
+
+    def position(self) -> tuple[int, int]:
+        pos = self.pyautogui.position()
+        return (int(pos.x), int(pos.y))
+
+    def button(self, button: Button, down: bool):
+        if down:
+            self.pyautogui.mouseDown(button=button, _pause=False)
+        else:
+            self.pyautogui.mouseUp(button=button, _pause=False)
+
+    def click(self, button: Button):
+        self.pyautogui.click(button=button, _pause=False)
+
+    def scroll(self, clicks: int, horizontal: bool = False):
+        if horizontal:
+            self.pyautogui.hscroll(clicks, _pause=False)
+        else:
+            self.pyautogui.vscroll(clicks, _pause=False)
+
+
+class XTestBackend(OutputBackend):
+    """Sends mouse events directly to an X11 server with the XTest extension.
+
+    Requires `python-xlib`, which pyautogui already depends on under X11.
+
+    Arguments:
+    - `display`: Optional[str] -- X display to connect to, `$DISPLAY` if None
+    """
+
+    BUTTONS = {"left": 1, "middle": 2, "right": 3}
+    """X11 button numbers by button name."""
+
+    SCROLL_BUTTONS = {
+        (False, True): 4,
+        (False, False): 5,
+        (True, False): 6,
+        (True, True): 7,
+    }
+    """X11 button numbers for scrolling, by `(horizontal, positive)`."""
+
+    def __init__(self, display: Optional[str] = None):
+        super().__init__()
+        from Xlib import X
+        from Xlib.display import Display
+        from Xlib.ext import xtest
+
+        self._X = X
+        self._xtest = xtest
+        self.display = Display(display)
+
+    def _query_screen_size(self) -> tuple[int, int]:
+        screen = self.display.screen()
+        return (screen.width_in_pixels, screen.height_in_pixels)
+
+    def move_to(self, x: int, y: int):
+        self._xtest.fake_input(self.display, self._X.MotionNotify, x=x, y=y)
+        # Flush instead of sync, to not wait for a round trip to the server
+        self.display.flush()
+
+    def position(self) -> tuple[int, int]:
+        pointer = self.display.screen().root.query_pointer()
+        return (pointer.root_x, pointer.root_y)
+
+    def _press(self, number: int, down: bool):
+        event = self._X.ButtonPress if down else self._X.ButtonRelease
+        self._xtest.fake_input(self.display, event, number)
+
+    def button(self, button: Button, down: bool):
+        self._press(self.BUTTONS[button], down)
+        self.display.flush()
+
+    def scroll(self, clicks: int, horizontal: bool = False):
+        number = self.SCROLL_BUTTONS[(horizontal, clicks > 0)]
+        for _ in range(abs(clicks)):
+            self._press(number, True)
+            self._press(number, False)
+        self.display.flush()
+
+    def close(self):
+        self.display.close()
+
+
+class UInputBackend(OutputBackend):
+    """Sends mouse events through a virtual absolute pointer created with Linux uinput.
+
+    Works under X11 and Wayland alike, but requires `evdev` and write access to `/dev/uinput`.
+    The compositor maps the pointer's range onto the screen, so `size` must match the screen.
+
+    Arguments:
+    - `size`: Optional[tuple[int, int]] -- Size of the screen in pixels, queried with pyautogui if None
+    """
+
+    def __init__(self, size: Optional[tuple[int, int]] = None):
+        super().__init__()
+        from evdev import AbsInfo, UInput, ecodes
+
+        if size is None:
+            from ._screen import _pyautogui
+
+            width, height = _pyautogui().size()
+            size = (int(width), int(height))
+
+        self._size = size
+        self._ecodes = ecodes
+        self._position = (0, 0)
+        self.device = UInput(
+            {
+                ecodes.EV_KEY: [ecodes.BTN_LEFT, ecodes.BTN_MIDDLE, ecodes.BTN_RIGHT],
+                ecodes.EV_ABS: [
+                    (ecodes.ABS_X, AbsInfo(0, 0, size[0] - 1, 0, 0, 0)),
+                    (ecodes.ABS_Y, AbsInfo(0, 0, size[1] - 1, 0, 0, 0)),
+                ],
+                ecodes.EV_REL: [ecodes.REL_WHEEL, ecodes.REL_HWHEEL],
+            },
+            name="mugshot-pointer",
+        )
+        self.buttons = {
+            "left": ecodes.BTN_LEFT,
+            "middle": ecodes.BTN_MIDDLE,
+            "right": ecodes.BTN_RIGHT,
+        }
+
+    def _query_screen_size(self) -> tuple[int, int]:
+        return self._size
+
+    def move_to(self, x: int, y: int):
+        self.device.write(self._ecodes.EV_ABS, self._ecodes.ABS_X, x)
+        self.device.write(self._ecodes.EV_ABS, self._ecodes.ABS_Y, y)
+        self.device.syn()
+        self._position = (x, y)
+
+    def position(self) -> tuple[int, int]:
+        # uinput cannot read the cursor back, so this is the last position sent
+        return self._position
+
+    def button(self, button: Button, down: bool):
+        self.device.write(self._ecodes.EV_KEY, self.buttons[button], int(down))
+        self.device.syn()
+
+    def scroll(self, clicks: int, horizontal: bool = False):
+        axis = self._ecodes.REL_HWHEEL if horizontal else self._ecodes.REL_WHEEL
+        self.device.write(self._ecodes.EV_REL, axis, clicks)
+        self.device.syn()
+
+    def close(self):
+        self.device.close()
+
+
+class RecordingBackend(OutputBackend):
+    """Records mouse events in memory instead of sending them, for tests and benchmarks.
+
+    Arguments:
+    - `size`: tuple[int, int] -- Size of the pretend screen in pixels
+    """
+
+    def __init__(self, size: tuple[int, int] = (1920, 1080)):
+        super().__init__()
+        self._size = size
+        self._lock = threading.Lock()
+
+        self.events: list[tuple] = []
+        """Events sent, as `("move", x, y)`, `("button", button, down)` or `("scroll", clicks, horizontal)`."""
+
+        self.screen_queries = 0
+        """Number of times the screen size was queried, i.e. not served from the cache."""
+
+        self._position = (size[0] // 2, size[1] // 2)
+
+    def _query_screen_size(self) -> tuple[int, int]:
+        self.screen_queries += 1
+        return self._size
+
+    def move_to(self, x: int, y: int):
+        with self._lock:
+            self.events.append(("move", x, y))
+            self._position = (x, y)
+
+    def position(self) -> tuple[int, int]:
+        return self._position
+
+    def button(self, button: Button, down: bool):
+        with self._lock:
+            self.events.append(("button", button, down))
+
+    def scroll(self, clicks: int, horizontal: bool = False):
+        with self._lock:
+            self.events.append(("scroll", clicks, horizontal))
+
+
+OUTPUT_BACKENDS = ("pyautogui", "xtest", "uinput", "recording")
+"""Names of the output backends accepted by `create_output_backend`."""
+
+
+def create_output_backend(name: str) -> OutputBackend:
+    """Creates an output backend by name, one of `OUTPUT_BACKENDS`."""
+    if name == "pyautogui":
+        return PyAutoGUIBackend()
+    if name == "xtest":
+        return XTestBackend()
+    if name == "uinput":
+        return UInputBackend()
+    if name == "recording":
+        return RecordingBackend()
+    raise ValueError(
+        f"Unknown output backend {name!r}, expected one of {OUTPUT_BACKENDS}"
+    )
+
+
+_backend: Optional[OutputBackend] = None
+
+
+def get_output_backend() -> OutputBackend:
+    """Returns the output backend used by `MouseAction` and `Screen`, pyautogui by default."""
+    global _backend
+    if _backend is None:
+        _backend = PyAutoGUIBackend()
+    return _backend
+
+
+def set_output_backend(
+    backend: Optional[OutputBackend], close_previous: bool = True
+) -> Optional[OutputBackend]:
+    """Sets the output backend used by `MouseAction` and `Screen`.
+
+    Arguments:
+    - `backend`: Optional[OutputBackend] -- The new backend, None for the default one, created when first used
+    - `close_previous`: bool -- Whether to close the previous backend, False to restore it later
+
+    Returns:
+    - The previous backend, None if the default one was not created yet.
+    """
+    global _backend
+    previous = _backend
+    if close_previous and previous is not None and previous is not backend:
+        previous.close()
+    _backend = backend
+    return previous
@@ -0,0 +1,271 @@
+from collections import deque
+import logging
+import threading
+import time
+from typing import Callable, Optional
+from PySide6.QtCore import QThread
+
+from mugshot.telemetry import record, span
+from ._cursor_filter import CursorFilter
+from ._mouse_action import MouseAction
+from ._output_backend import OutputBackend, set_output_backend
+from ._scroll_controller import ScrollController
+
+
+class OutputWorker(QThread):
+    """A worker thread for sending mouse actions.
+
+    Actions are queued by the public slots, which return immediately, and are sent in order on
+    this thread through `MouseAction`. A move queued right after another move replaces it, so
+    only the newest cursor position is sent when the output falls behind.
+
+    With a cursor filter, cursor positions given to `setCursorTarget` are smoothed, and the
+    cursor is moved to the filtered position `rate` times per second, independently of the
+    camera's frame rate. With `extrapolate`, the position is predicted at the time of sending
+    rather than the time the frame was captured, making up for the pipeline's latency.
+
+    Scrolling is continuous while a direction is set with `setScrollDirection`, and paced by a
+    `ScrollController` on this thread, so its speed does not depend on the camera's frame rate.
+
+    Moves given the capture time of their frame measure the glass-to-cursor latency, from the
+    frame's capture to the move being sent, as `cursorLatency` and as the "glass_to_cursor"
+    stage of `mugshot.telemetry`.
+
+    Arguments:
+    - `backend`: Optional[OutputBackend] -- Output backend to use, the current one if None
+    - `cursor_filter`: Optional[CursorFilter] -- Filter for cursor targets, None to move to them directly
+    - `rate`: float -- Rate in Hz at which the filtered cursor is moved
+    - `extrapolate`: bool -- Whether to predict the filtered cursor forward to the present
+    - `max_prediction`: float -- Maximum time in seconds to predict past the latest target, so the cursor stops when targets stop coming
+    - `scroll_controller`: Optional[ScrollController] -- Paces continuous scrolling, a default `ScrollController` if None
+    """
+
+    STALE_AFTER = 0.5
+    """Seconds without cursor targets after which the filter starts over."""
+
+    def __init__(
+        self,
+        *args,
+        backend: Optional[OutputBackend] = None,
+        cursor_filter: Optional[CursorFilter] = None,
+        rate: float = 120.0,
+        extrapolate: bool = True,
+        max_prediction: float = 0.1,
+        scroll_controller: Optional[ScrollController] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        if backend is not None:
+            set_output_backend(backend)
+
+        self.cursorFilter = cursor_filter
+        self.rate = rate
+        self.extrapolate = extrapolate
+        self.maxPrediction = max_prediction
+        self._nextTick = 0.0
+        self._lastFilteredMove: Optional[tuple[int, int]] = None
+        self.scrollController = (
+            scroll_controller if scroll_controller is not None else ScrollController()
+        )
+
+        self.latency = 0.0
+        """Smoothed time in seconds from frame capture to a cursor target arriving."""
+
+        self.cursorLatency = 0.0
+        """Smoothed time in seconds from frame capture to the cursor being moved for it."""
+
+        self._queue: deque[tuple[Callable, tuple, Optional[float]]] = deque()
+        self._condition = threading.Condition()
+
+        self.sentCount = 0
+        """Number of actions sent."""
+
+        self.coalescedCount = 0
+        """Number of moves replaced by a newer move before being sent."""
+
+    def run(self):
+        """Overrides QThread.run, sends queued actions and filtered moves until interrupted by
+        `quit`."""
+        while True:
+            with self._condition:
+                if not self._queue and not self.isInterruptionRequested():
+                    self._condition.wait(self._waitTimeout())
+                if not self._queue and self.isInterruptionRequested():
+                    return
+                actions = list(self._queue)
+                self._queue.clear()
+                filteredMove = self._filteredMove()
+                filteredTimestamp = (
+                    None if self.cursorFilter is None else self.cursorFilter.timestamp
+                )
+                hClicks, vClicks = self.scrollController.step_due(time.monotonic())
+
+            for action, args, timestamp in actions:
+                self._send(action, *args)
+                if timestamp is not None:
+                    self._recordCursorLatency(timestamp)
+            if filteredMove is not None:
+                self._send(MouseAction.move_to, *filteredMove)
+                if filteredTimestamp is not None:
+                    self._recordCursorLatency(filteredTimestamp)
+            if vClicks:
+                self._send(MouseAction.v_scroll, vClicks)
+            if hClicks:
+                self._send(MouseAction.h_scroll, hClicks)
+
+    def _send(self, action: Callable, *args):
+        try:
+            with span("output"):
+                action(*args)
+        except Exception:
+            logging.exception(f"Mouse action {action.__name__} failed")
+        self.sentCount += 1
+
+    def _recordCursorLatency(self, timestamp: float):
+        latency = time.monotonic() - timestamp
+        self.cursorLatency = 0.9 * self.cursorLatency + 0.1 * latency
+        record("glass_to_cursor", latency)
+
+    def _waitTimeout(self) -> Optional[float]:
+        """Returns the time until the next filtered move or scroll event is due, None if there is
+        none to make."""
+        timeouts = [
+            timeout
+            for timeout in (
+                self._tickTimeout(),
+                self.scrollController.timeout(time.monotonic()),
+            )
+            if timeout is not None
+        ]
+        return min(timeouts) if timeouts else None
+
+    def _tickTimeout(self) -> Optional[float]:
+        """Returns the time until the next filtered move is due, None if there is none to make."""
+        if self.cursorFilter is None or self.cursorFilter.timestamp is None:
+            return None
+        now = time.monotonic()
+        if now > self.cursorFilter.timestamp + self.maxPrediction + 1 / self.rate:
+            # The filtered cursor has stopped until the next target
+            return None
+        return max(self._nextTick - now, 0.0)
+
+    def _filteredMove(self) -> Optional[tuple[int, int]]:
+        """Returns the filtered cursor position if a move is due and the position changed."""
+        if self.cursorFilter is None or self.cursorFilter.timestamp is None:
+            return None
+
+        now = time.monotonic()
+        if now < self._nextTick:
+            return None
+        self._nextTick += 1 / self.rate
+        if self._nextTick < now:
+            self._nextTick = now + 1 / self.rate
+
+        latest = self.cursorFilter.timestamp
+        target = min(now, latest + self.maxPrediction) if self.extrapolate else latest
+        position = self.cursorFilter.predict(target)
+        if position is None:
+            return None
+
+        move = (round(position[0]), round(position[1]))
+        if move == self._lastFilteredMove:
+            return None
+        self._lastFilteredMove = move
+        return move
+
+    def _put(self, action: Callable, *args, timestamp: Optional[float] = None):
+        with self._condition:
+            if (
+                action is MouseAction.move_to
+                and self._queue
+                and self._queue[-1][0] is MouseAction.move_to
+            ):
+                self._queue[-1] = (action, args, timestamp)
+                self.coalescedCount += 1
+            else:
+                self._queue.append((action, args, timestamp))
+            self._condition.notify()
+
+    def moveTo(self, x: int, y: int, timestamp: Optional[float] = None):
+        """Public slot to move the cursor, see `MouseAction.move_to`.
+
+        `timestamp` is the `time.monotonic()` time the frame the move is made for was captured,
+        for measuring latency, None if unknown."""
+        self._put(MouseAction.move_to, x, y, timestamp=timestamp)
+
+    def setCursorTarget(self, x: float, y: float, timestamp: Optional[float] = None):
+        """Public slot to move the cursor towards (`x`, `y`) through the cursor filter, or
+        directly without one.
+
+        Arguments:
+        - `x`, `y`: float -- Target position on the screen
+        - `timestamp`: Optional[float] -- `time.monotonic()` time the target was captured, now if None
+        """
+        if self.cursorFilter is None:
+            self.moveTo(round(x), round(y), timestamp)
+            return
+
+        now = time.monotonic()
+        timestamp = now if timestamp is None else timestamp
+        with self._condition:
+            self.latency = 0.9 * self.latency + 0.1 * (now - timestamp)
+
+            latest = self.cursorFilter.timestamp
+            if latest is not None and timestamp - latest > self.STALE_AFTER:
+                self.cursorFilter.reset()
+            self.cursorFilter.update((x, y), timestamp)
+            self._condition.notify()
+
+    def resetCursorFilter(self):
+        """Public slot to forget the filtered cursor, e.g. when inputs are paused, so it stops
+        moving."""
+        if self.cursorFilter is None:
+            return
+        with self._condition:
+            self.cursorFilter.reset()
+            self._lastFilteredMove = None
+
+    def leftDown(self):
+        """Public slot to press the left mouse button down."""
+        self._put(MouseAction.left_down)
+
+    def leftUp(self):
+        """Public slot to release the left mouse button."""
+        self._put(MouseAction.left_up)
+
+    def rightDown(self):
+        """Public slot to press the right mouse button down."""
+        self._put(MouseAction.right_down)
+
+    def rightUp(self):
+        """Public slot to release the right mouse button."""
+        self._put(MouseAction.right_up)
+
+    def setScrollDirection(self, horizontal: int, vertical: int):
+        """Public slot to start, change or stop (with `(0, 0)`) continuous scrolling, paced by
+        `scrollController`. Setting the current direction again does nothing.
+
+        Arguments:
+        - `horizontal`: int -- -1 to scroll left, 1 to scroll right, 0 not to scroll horizontally
+        - `vertical`: int -- -1 to scroll down, 1 to scroll up, 0 not to scroll vertically
+        """
+        with self._condition:
+            self.scrollController.set_direction(horizontal, vertical, time.monotonic())
+            self._condition.notify()
+
+    def vScroll(self, clicks: int):
+        """Public slot to scroll vertically by `clicks`."""
+        self._put(MouseAction.v_scroll, clicks)
+
+    def hScroll(self, clicks: int):
+        """Public slot to scroll horizontally by `clicks`."""
+        self._put(MouseAction.h_scroll, clicks)
+
+    def quit(self):
+        """Overrides QThread.quit() to send the remaining actions and stop."""
+
+        with self._condition:
+            self.requestInterruption()
+            self._condition.notify()
+        self.wait()
+        super().quit()
@@ -1,6 +1,11 @@
 from abc import ABC
 
-import pyautogui
+
+def _pyautogui():
+    """Imports pyautogui on first use, as importing it requires a display."""
+    import pyautogui
+
+    return pyautogui
 
 
 class Screen(ABC):
@@ -8,6 +13,36 @@ class Screen(ABC):
 
     @staticmethod
     def get_size() -> tuple[int, int]:
-        """Returns the size of the screen in pixels as a (width, height) tuple."""
+        """Returns the size of the screen in pixels as a (width, height) tuple.
+
+        The size is cached by the output backend until `invalidate` is called."""
+        from ._output_backend import get_output_backend
+
+        return get_output_backend().screen_size()
+
+    @staticmethod
+    def map_from_area(
+        position: tuple[float, float], area: tuple[float, float, float, float]
+    ) -> tuple[float, float]:
+        """Maps a position in a frame to screen coordinates, so that `area` covers the screen.
+
+        Arguments:
+        - `position`: tuple[float, float] -- Position in the frame, (0.0, 0.0) being its top-left corner and (1.0, 1.0) its bottom-right corner
+        - `area`: tuple[float, float, float, float] -- `(x1, y1, x2, y2)` corners of the area of the frame mapped to the screen, in the same units
+
+        Returns:
+        - The `(x, y)` position on the screen, outside of it if `position` is outside of `area`.
+        """
+        width, height = Screen.get_size()
+        x1, y1, x2, y2 = area
+        return (
+            (position[0] - x1) / (x2 - x1) * width,
+            (position[1] - y1) / (y2 - y1) * height,
+        )
+
+    @staticmethod
+    def invalidate():
+        """Forgets the cached screen size, e.g. when the screen geometry changes."""
+        from ._output_backend import get_output_backend
 
-        return pyautogui.size()
+        get_output_backend().invalidate_screen()
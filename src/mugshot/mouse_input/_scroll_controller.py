@@ -0,0 +1,116 @@
+import math
+from typing import Optional
+
+
+class ScrollController:
+    """Paces continuous scrolling in a direction set by gestures, independently of the rate at
+    which frames are detected.
+
+    While a direction is set, scrolling starts at `start_rate` steps per second and accelerates by
+    `acceleration` steps per second squared, up to `max_rate`. The first step is due as soon as
+    the direction is set. Steps are sent in batches at most `event_rate` times per second, so
+    fast scrolling sends fewer, larger scroll events.
+
+    Times are `time.monotonic()` times passed by the caller, e.g. `OutputWorker`'s loop.
+
+    Arguments:
+    - `start_rate`: float -- Steps per second when scrolling starts
+    - `acceleration`: float -- Increase of the rate per second while scrolling
+    - `max_rate`: float -- Maximum steps per second
+    - `event_rate`: float -- Maximum number of scroll events per second
+    - `step`: int -- Scroll clicks per step, see `OutputBackend.scroll`
+    """
+
+    def __init__(
+        self,
+        start_rate: float = 4.0,
+        acceleration: float = 20.0,
+        max_rate: float = 30.0,
+        event_rate: float = 15.0,
+        step: int = 100,
+    ):
+        self.start_rate = start_rate
+        self.acceleration = acceleration
+        self.max_rate = max(max_rate, start_rate)
+        self.event_rate = event_rate
+        self.step = step
+
+        self.direction = (0, 0)
+        """`(horizontal, vertical)` direction of scrolling, each -1, 0 or 1, up or right when positive."""
+
+        self._started = 0.0
+        self._sent = 0
+        self._next_event = 0.0
+
+    @property
+    def active(self) -> bool:
+        """Whether scrolling is in progress."""
+        return self.direction != (0, 0)
+
+    def set_direction(self, horizontal: int, vertical: int, now: float):
+        """Starts, changes or stops (with `(0, 0)`) scrolling. Setting the current direction
+        again does nothing, so it may be set on every frame."""
+        direction = (
+            int(math.copysign(1, horizontal)) if horizontal else 0,
+            int(math.copysign(1, vertical)) if vertical else 0,
+        )
+        if direction == self.direction:
+            return
+        self.direction = direction
+        self._started = now
+        self._sent = 0
+        self._next_event = now
+
+    def step_due(self, now: float) -> tuple[int, int]:
+        """Returns the `(horizontal, vertical)` clicks to scroll by at `now`, `(0, 0)` if no
+        scroll event is due."""
+        if not self.active or now < self._next_event:
+            return (0, 0)
+
+        steps = self._steps(now - self._started) - self._sent
+        if steps <= 0:
+            # Woken up early, e.g. by rounding, so wait for the next step
+            self._next_event = max(self._time_of(self._sent + 1), now + 0.001)
+            return (0, 0)
+
+        self._sent += steps
+        # Batches the following steps until the next event is allowed
+        self._next_event = max(now + 1 / self.event_rate, self._time_of(self._sent + 1))
+        clicks = steps * self.step
+        return (self.direction[0] * clicks, self.direction[1] * clicks)
+
+    def timeout(self, now: float) -> Optional[float]:
+        """Returns the seconds until the next scroll event is due, None when not scrolling."""
+        if not self.active:
+            return None
+        return max(self._next_event - now, 0.0)
+
+    def _ramp_time(self) -> float:
+        """Returns the seconds taken to accelerate to `max_rate`."""
+        if self.acceleration <= 0:
+            return 0.0
+        return (self.max_rate - self.start_rate) / self.acceleration
+
+    def _steps(self, elapsed: float) -> int:
+        """Returns the number of steps due `elapsed` seconds after scrolling started, the
+        integral of the rate plus the initial step."""
+        ramp = self._ramp_time()
+        t = min(elapsed, ramp)
+        distance = self.start_rate * t + self.acceleration * t * t / 2
+        if elapsed > ramp:
+            distance += self.max_rate * (elapsed - ramp)
+        return 1 + math.floor(distance + 1e-9)
+
+    def _time_of(self, steps: int) -> float:
+        """Returns the time at which `steps` steps are due, the inverse of `_steps`."""
+        distance = steps - 1
+        ramp = self._ramp_time()
+        ramp_distance = self.start_rate * ramp + self.acceleration * ramp * ramp / 2
+        if distance <= ramp_distance and self.acceleration > 0:
+            elapsed = (
+                -self.start_rate
+                + math.sqrt(self.start_rate**2 + 2 * self.acceleration * distance)
+            ) / self.acceleration
+        else:
+            elapsed = ramp + (distance - ramp_distance) / self.max_rate
+        return self._started + elapsed
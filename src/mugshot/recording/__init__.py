@@ -0,0 +1,5 @@
+"""Module for recording and replaying sessions"""
+
+from ._records import INPUT_DTYPE, input_to_record, record_to_input, records_to_inputs
+from ._recorder import SessionRecorder
+from ._session import RecordedSession, replay
@@ -0,0 +1,90 @@
+import argparse
+from collections import Counter
+import logging
+import math
+import time
+
+from mugshot.mouse_input import (
+    FrameInput,
+    GestureEngine,
+    create_cursor_filter,
+)
+from mugshot.recording import RecordedSession, replay
+
+
+def main():
+    """Entry point of the offline session replay."""
+    parser = argparse.ArgumentParser(
+        prog="python -m mugshot.recording",
+        description="Replays a recorded session through the gesture and cursor logic, without a camera or detector.",
+    )
+    parser.add_argument(
+        "session", help="directory of a session recorded with MUGSHOT_RECORD"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0,
+        help="pace of the replay relative to the recording, 0 for as fast as possible (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cursor-filter",
+        default="one-euro",
+        help="cursor filter to smooth the recorded cursor with: none, one-euro or kalman (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--press-frames",
+        type=int,
+        default=3,
+        help="consecutive frames with a gesture to press it (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--release-frames",
+        type=int,
+        default=2,
+        help="consecutive frames without a gesture to release it (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    session = RecordedSession(args.session)
+    gestures = GestureEngine(args.press_frames, args.release_frames)
+    cursor_filter = create_cursor_filter(args.cursor_filter)
+    transitions: Counter[tuple[str, str]] = Counter()
+    previous = None
+    movement = 0.0
+
+    def handle(frame_input: FrameInput):
+        nonlocal previous, movement
+        for event in gestures.update(frame_input):
+            transitions[(event.gesture, event.phase.name.lower())] += 1
+
+        position = frame_input.cursor_pos
+        if position is not None and cursor_filter is not None:
+            cursor_filter.update(position, frame_input.timestamp)  # type: ignore
+            position = cursor_filter.predict(frame_input.timestamp)  # type: ignore
+        if position is not None:
+            if previous is not None:
+                movement += math.dist(position, previous)
+            previous = position
+
+    started = time.perf_counter()
+    count = replay(session, handle, speed=args.speed or None)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"inputs     {count} in {elapsed:.2f} s ({count / max(elapsed, 1e-9):.0f} inputs/s)"
+    )
+    print(f"frames     {session.metadata['frames']}")
+    print(f"cursor     {movement / max(count - 1, 1):.2f} mean movement per input")
+    for name in GestureEngine.GESTURES:
+        counts = ", ".join(
+            f"{transitions[(name, phase)]} {phase}"
+            for phase in ("press", "hold", "release")
+        )
+        print(f"  {name:<12} {counts}")
+
+
+if __name__ == "__main__":
+    main()
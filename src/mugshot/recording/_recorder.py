@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import time
+from typing import Optional
+import cv2
+import numpy as np
+
+from mugshot.mouse_input import FrameInput
+from mugshot.telemetry import metrics_enabled, metrics_to_json, snapshot
+from ._records import INPUT_DTYPE, input_to_record
+
+FORMAT_VERSION = 1
+"""Version of the session format, stored in `session.json`."""
+
+METADATA_FILE = "session.json"
+INPUTS_FILE = "inputs.bin"
+FRAMES_FILE = "frames.avi"
+STAGES_FILE = "stages.json"
+
+
+class SessionRecorder:
+    """Records a session's stream of `FrameInput`s, and optionally its frames, to a directory,
+    to reproduce and tune gesture and cursor logic offline with `RecordedSession`.
+
+    A session directory holds:
+    - `session.json`: Metadata, e.g. the record format and the size of the frames
+    - `inputs.bin`: `INPUT_DTYPE` records without a header, only ever appended to, so a session can be memory-mapped while it is recorded and survives crashes
+    - `frames.avi`: Downscaled frames compressed with Motion JPEG, if recorded
+    - `stages.json`: Statistics of every telemetry stage at the end of the session, if metrics are enabled
+
+    Arguments:
+    - `directory`: str -- Directory of the session, created if needed. Must not hold a session already
+    - `frame_width`: Optional[int] -- Frames are downscaled to at most this width, None not to record frames
+    - `fps`: float -- Nominal frame rate of the video, only used by video players
+    - `flush_every`: int -- Number of records buffered before being written
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        frame_width: Optional[int] = 320,
+        fps: float = 30.0,
+        flush_every: int = 64,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, INPUTS_FILE)):
+            raise FileExistsError(f"{directory} already holds a recorded session")
+
+        self.directory = directory
+        self.frame_width = frame_width
+        self.fps = fps
+
+        self.count = 0
+        """Number of inputs recorded."""
+
+        self.frame_count = 0
+        """Number of frames recorded."""
+
+        self._buffer = np.zeros(flush_every, INPUT_DTYPE)
+        self._buffered = 0
+        self._inputs = open(os.path.join(directory, INPUTS_FILE), "ab")
+        self._video: Optional[cv2.VideoWriter] = None
+        self._frame_size: Optional[tuple[int, int]] = None
+        self._started = time.time()
+        self._write_metadata()
+
+    def record(
+        self,
+        frame_input: FrameInput,
+        frame: Optional[cv2.typing.MatLike] = None,
+        processing: Optional[float] = None,
+    ):
+        """Appends the inputs of a frame to the session.
+
+        Arguments:
+        - `frame_input`: FrameInput -- The inputs detected from the frame
+        - `frame`: Optional[cv2.Mat] -- The BGR frame the inputs were detected from, recorded if `frame_width` is not None
+        - `processing`: Optional[float] -- Seconds taken to process the frame
+        """
+        index = -1
+        if frame is not None and self.frame_width is not None:
+            index = self._record_frame(frame)
+
+        input_to_record(frame_input, processing, index, self._buffer[self._buffered])
+        self._buffered += 1
+        self.count += 1
+        if self._buffered == len(self._buffer):
+            self.flush()
+
+    def _record_frame(self, frame: cv2.typing.MatLike) -> int:
+        if self._video is None:
+            h, w = frame.shape[:2]
+            scale = min(self.frame_width / w, 1.0)  # type: ignore
+            self._frame_size = (round(w * scale), round(h * scale))
+            self._video = cv2.VideoWriter(
+                os.path.join(self.directory, FRAMES_FILE),
+                cv2.VideoWriter.fourcc(*"MJPG"),
+                self.fps,
+                self._frame_size,
+            )
+            self._write_metadata()
+
+        if (frame.shape[1], frame.shape[0]) != self._frame_size:
+            frame = cv2.resize(frame, self._frame_size, interpolation=cv2.INTER_AREA)
+        self._video.write(frame)
+        self.frame_count += 1
+        return self.frame_count - 1
+
+    def flush(self):
+        """Writes the buffered records to `inputs.bin`."""
+        if self._buffered == 0:
+            return
+        self._inputs.write(self._buffer[: self._buffered].tobytes())
+        self._inputs.flush()
+        self._buffered = 0
+
+    def close(self):
+        """Writes the remaining records and the session's metadata, and closes its files."""
+        if self._inputs.closed:
+            return
+        self.flush()
+        self._inputs.close()
+        if self._video is not None:
+            self._video.release()
+        if metrics_enabled():
+            with open(os.path.join(self.directory, STAGES_FILE), "w") as file:
+                file.write(metrics_to_json(snapshot()))
+        self._write_metadata()
+        logging.info(f"Recorded {self.count} inputs to {self.directory}")
+
+    def _write_metadata(self):
+        metadata = {
+            "version": FORMAT_VERSION,
+            "dtype": INPUT_DTYPE.descr,
+            "started": self._started,
+            "inputs": self.count,
+            "frames": self.frame_count,
+            "frame_size": self._frame_size,
+            "fps": self.fps,
+        }
+        path = os.path.join(self.directory, METADATA_FILE)
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(metadata, file, indent=2)
+        os.replace(f"{path}.tmp", path)
@@ -0,0 +1,114 @@
+import math
+from typing import Iterator, Optional
+import numpy as np
+
+from mugshot.mouse_input import FrameInput
+
+INPUT_DTYPE = np.dtype(
+    [
+        ("seq", "<i8"),
+        ("timestamp", "<f8"),
+        ("left_eye_closed", "i1"),
+        ("right_eye_closed", "i1"),
+        ("tongue_down", "i1"),
+        ("cursor", "<f4", (2,)),
+        ("queued", "<f4"),
+        ("dequeued", "<f4"),
+        ("processed", "<f4"),
+        ("processing", "<f4"),
+        ("frame", "<i8"),
+    ]
+)
+"""Structured dtype of a recorded `FrameInput`, 51 bytes per frame.
+
+- `seq`: Sequence number of the frame, -1 if unknown
+- `timestamp`: `time.monotonic()` capture time of the frame
+- `left_eye_closed`, `right_eye_closed`, `tongue_down`: 1 for True, 0 for False, -1 for None
+- `cursor`: `cursor_pos`, NaN for None
+- `queued`, `dequeued`, `processed`: Seconds from capture to each stage of the frame's envelope, NaN if unknown
+- `processing`: Seconds taken to process the frame, NaN if unknown
+- `frame`: Index of the frame in the session's video, -1 if not recorded
+"""
+
+
+def _encode_bool(value: Optional[bool]) -> int:
+    return -1 if value is None else int(value)
+
+
+def _decode_bool(value: int) -> Optional[bool]:
+    return None if value < 0 else bool(value)
+
+
+def input_to_record(
+    frame_input: FrameInput,
+    processing: Optional[float] = None,
+    frame: int = -1,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Converts a `FrameInput` into an `INPUT_DTYPE` record.
+
+    Arguments:
+    - `frame_input`: FrameInput -- The inputs to convert. Its `stage_ages` are not recorded
+    - `processing`: Optional[float] -- Seconds taken to process the frame, None if unknown
+    - `frame`: int -- Index of the frame in the session's video, -1 if not recorded
+    - `out`: Optional[np.ndarray] -- A 0-d `INPUT_DTYPE` array to write into, e.g. a row of a buffer, a new one if None
+
+    Returns:
+    - `out`, or the new record.
+    """
+    record = np.zeros((), INPUT_DTYPE) if out is None else out
+    envelope = frame_input.envelope
+    latencies = {} if envelope is None else envelope.latencies()
+
+    record["seq"] = -1 if envelope is None else envelope.seq
+    record["timestamp"] = (
+        math.nan if frame_input.timestamp is None else frame_input.timestamp
+    )
+    record["left_eye_closed"] = _encode_bool(frame_input.is_left_eye_closed)
+    record["right_eye_closed"] = _encode_bool(frame_input.is_right_eye_closed)
+    record["tongue_down"] = _encode_bool(frame_input.is_tongue_down)
+    record["cursor"] = (
+        (math.nan, math.nan)
+        if frame_input.cursor_pos is None
+        else frame_input.cursor_pos
+    )
+    for stage in ("queued", "dequeued", "processed"):
+        record[stage] = latencies.get(stage, math.nan)
+    record["processing"] = math.nan if processing is None else processing
+    record["frame"] = frame
+    return record
+
+
+def record_to_input(record: np.ndarray) -> FrameInput:
+    """Converts an `INPUT_DTYPE` record back into a `FrameInput`, without its envelope."""
+    timestamp = float(record["timestamp"])
+    x, y = record["cursor"].tolist()
+    return FrameInput(
+        is_left_eye_closed=_decode_bool(int(record["left_eye_closed"])),
+        is_right_eye_closed=_decode_bool(int(record["right_eye_closed"])),
+        cursor_pos=None if math.isnan(x) else (x, y),
+        is_tongue_down=_decode_bool(int(record["tongue_down"])),
+        timestamp=None if math.isnan(timestamp) else timestamp,
+    )
+
+
+def records_to_inputs(records: np.ndarray) -> Iterator[FrameInput]:
+    """Converts `INPUT_DTYPE` records back into `FrameInput`s, one at a time.
+
+    Columns are converted in bulk, so this is much faster than `record_to_input` on each record.
+    """
+    columns = zip(
+        records["left_eye_closed"].tolist(),
+        records["right_eye_closed"].tolist(),
+        records["cursor"].tolist(),
+        records["tongue_down"].tolist(),
+        records["timestamp"].tolist(),
+    )
+    for left, right, (x, y), tongue, timestamp in columns:
+        yield FrameInput(
+            is_left_eye_closed=None if left < 0 else bool(left),
+            is_right_eye_closed=None if right < 0 else bool(right),
+            cursor_pos=None if math.isnan(x) else (x, y),
+            is_tongue_down=None if tongue < 0 else bool(tongue),
+            timestamp=None if math.isnan(timestamp) else timestamp,
+        )
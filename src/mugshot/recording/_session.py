@@ -0,0 +1,111 @@
+import json
+import os
+import time
+from typing import Callable, Iterator, Optional
+import numpy as np
+
+from mugshot.feed import VideoFileSource
+from mugshot.mouse_input import FrameInput
+from ._recorder import FORMAT_VERSION, FRAMES_FILE, INPUTS_FILE, METADATA_FILE
+from ._records import INPUT_DTYPE, records_to_inputs
+
+
+class RecordedSession:
+    """A session recorded by `SessionRecorder`.
+
+    The inputs are memory-mapped rather than read, so even long sessions open instantly, and
+    sessions can be opened while they are still being recorded.
+
+    Arguments:
+    - `directory`: str -- Directory of the session
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, METADATA_FILE)) as file:
+            self.metadata: dict = json.load(file)
+            """Contents of `session.json`."""
+        if self.metadata["version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported session format {self.metadata['version']}, expected {FORMAT_VERSION}"
+            )
+
+        # A partly written last record, e.g. after a crash, is ignored
+        path = os.path.join(directory, INPUTS_FILE)
+        count = os.path.getsize(path) // INPUT_DTYPE.itemsize
+        self.inputs: np.ndarray = (
+            np.memmap(path, INPUT_DTYPE, "r", shape=(count,))
+            if count > 0
+            else np.zeros(0, INPUT_DTYPE)
+        )
+        """Every recorded input, as a read-only `INPUT_DTYPE` array."""
+
+    def __len__(self) -> int:
+        return len(self.inputs)
+
+    def frame_inputs(self) -> Iterator[FrameInput]:
+        """Returns the recorded inputs as `FrameInput`s, in order."""
+        return records_to_inputs(self.inputs)
+
+    def frames(self) -> Iterator[np.ndarray]:
+        """Returns the recorded frames in order, nothing if frames were not recorded. The index of
+        the frame each input was detected from is in its "frame" field."""
+        path = os.path.join(self.directory, FRAMES_FILE)
+        if not os.path.exists(path):
+            return
+        source = VideoFileSource(path)
+        if not source.open():
+            return
+        try:
+            while (frame := source.read()) is not None:
+                yield frame
+        finally:
+            source.release()
+
+
+def replay(
+    session: RecordedSession,
+    handler: Callable[[FrameInput], None],
+    speed: Optional[float] = 1.0,
+) -> int:
+    """Feeds the recorded inputs of a session to `handler`, e.g. `MainWindow.doInputs`.
+
+    Timestamps are shifted to the replay's clock: the first frame is captured when the replay
+    starts, and every input reaches `handler` as long after its capture as it did when recorded.
+    Checks on the inputs' age therefore behave as they did when recorded.
+
+    Arguments:
+    - `session`: RecordedSession -- The session to replay
+    - `handler`: function(FrameInput) -- Called with each input, in order
+    - `speed`: Optional[float] -- Pace of the replay relative to the recording, e.g. 4.0 for 4 times as fast, or None to replay as fast as possible, without waiting between inputs
+
+    Returns:
+    - The number of inputs replayed.
+    """
+    records = session.inputs
+    if len(records) == 0:
+        return 0
+
+    captured = records["timestamp"]
+    valid = ~np.isnan(captured)
+    base = float(captured[valid][0]) if valid.any() else 0.0
+    # Seconds from each frame's capture to its inputs being emitted
+    delays = np.nan_to_num(records["processed"], nan=0.0).tolist()
+
+    start = time.monotonic()
+    count = 0
+    for frame_input, delay in zip(records_to_inputs(records), delays):
+        if frame_input.timestamp is None:
+            frame_input.timestamp = time.monotonic()
+        elif speed is None:
+            frame_input.timestamp = start + frame_input.timestamp - base
+        else:
+            emitted = start + (frame_input.timestamp - base + delay) / speed
+            wait = emitted - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            frame_input.timestamp = emitted - delay
+
+        handler(frame_input)
+        count += 1
+    return count
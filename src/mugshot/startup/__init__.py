@@ -0,0 +1,3 @@
+"""Module for starting the pipeline"""
+
+from ._orchestrator import StartupOrchestrator
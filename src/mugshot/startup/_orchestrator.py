@@ -0,0 +1,110 @@
+import logging
+import threading
+import time
+from typing import Optional
+from PySide6.QtCore import QObject, QThread, Qt, Signal, SignalInstance
+
+
+class StartupOrchestrator(QObject):
+    """Starts the pipeline's worker threads together and reports when each component is ready.
+
+    The slow parts of a cold start, opening the camera and loading and warming up models, run on
+    different threads, so starting every thread at once overlaps them. Components are watched
+    through their workers' signals, and the pipeline is ready once every watched component is,
+    e.g. to only start executing inputs when the whole pipeline is hot.
+
+    Public signals:
+    - `componentReady`: Signal(str, float) -- Indicates that a component is ready, and emits its name and the seconds since `start`
+    - `componentFailed`: Signal(str, str) -- Indicates that a component failed to start, and emits its name and the reason
+    - `pipelineReady`: Signal(float) -- Indicates that every component is ready, and emits the seconds since `start`. Emitted once
+    """
+
+    componentReady = Signal(str, float)
+    componentFailed = Signal(str, str)
+    pipelineReady = Signal(float)
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._readiness: dict[str, Optional[float]] = {}
+        self._started: Optional[float] = None
+        self._ready = False
+
+    def watch(
+        self,
+        name: str,
+        ready: SignalInstance,
+        failed: Optional[SignalInstance] = None,
+    ):
+        """Watches a component, which is ready when `ready` is emitted.
+
+        Signals are connected directly, so components are marked from the emitting thread.
+
+        Arguments:
+        - `name`: str -- Name of the component, e.g. "camera"
+        - `ready`: SignalInstance -- Signal emitted when the component is ready, with any arguments
+        - `failed`: Optional[SignalInstance] -- Signal emitted with a reason when the component fails to start
+        """
+        with self._lock:
+            self._readiness.setdefault(name, None)
+        ready.connect(
+            lambda *_: self.markReady(name), Qt.ConnectionType.DirectConnection
+        )
+        if failed is not None:
+            failed.connect(
+                lambda reason: self.markFailed(name, reason),
+                Qt.ConnectionType.DirectConnection,
+            )
+
+    def start(self, *threads: QThread):
+        """Starts `threads` back to back, and the clock of readiness times."""
+        self._started = time.monotonic()
+        logging.info(f"Starting components {', '.join(self._readiness)}")
+        for thread in threads:
+            thread.start()
+        self._checkReady()
+
+    def markReady(self, name: str):
+        """Public slot to mark a component ready, safe to call from any thread. Later calls for
+        the same component are ignored, e.g. when a detector is swapped."""
+
+        with self._lock:
+            if self._readiness.get(name) is not None:
+                return
+            elapsed = self.elapsed()
+            self._readiness[name] = elapsed
+
+        logging.info(f"Component {name} ready after {elapsed:.2f} s")
+        self.componentReady.emit(name, elapsed)
+        self._checkReady()
+
+    def markFailed(self, name: str, reason: str):
+        """Public slot to report that a component failed to start, safe to call from any thread.
+        The pipeline then never becomes ready."""
+
+        logging.error(f"Component {name} failed to start: {reason}")
+        self.componentFailed.emit(name, reason)
+
+    def elapsed(self) -> float:
+        """Returns the seconds since `start`, 0.0 before it."""
+        return 0.0 if self._started is None else time.monotonic() - self._started
+
+    def readiness(self) -> dict[str, Optional[float]]:
+        """Returns the seconds after `start` at which each component was ready, None for
+        components that are not ready yet."""
+        with self._lock:
+            return dict(self._readiness)
+
+    def isReady(self) -> bool:
+        """Returns whether every component is ready."""
+        return self._ready
+
+    def _checkReady(self):
+        with self._lock:
+            if self._ready or self._started is None or None in self._readiness.values():
+                return
+            self._ready = True
+            elapsed = self.elapsed()
+
+        logging.info(f"Pipeline ready after {elapsed:.2f} s")
+        self.pipelineReady.emit(elapsed)
@@ -0,0 +1,19 @@
+"""Module for timing pipeline stages"""
+
+from ._metrics import (
+    BUCKETS,
+    StageHistogram,
+    StageStats,
+    enable_metrics,
+    metrics_enabled,
+    span,
+    record,
+    snapshot,
+    reset_metrics,
+)
+from ._export import (
+    MetricsExporter,
+    metrics_to_json,
+    metrics_to_prometheus,
+    format_stats,
+)
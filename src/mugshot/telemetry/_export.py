@@ -0,0 +1,101 @@
+from dataclasses import asdict
+import json
+import os
+import time
+from typing import Optional
+
+from ._metrics import BUCKETS, StageStats, snapshot
+
+
+def metrics_to_json(stats: dict[str, StageStats]) -> str:
+    """Formats stage statistics as a JSON object, keyed by stage name."""
+    return json.dumps(
+        {
+            "timestamp": time.time(),
+            "buckets_s": list(BUCKETS),
+            "stages": {name: asdict(stage) for name, stage in stats.items()},
+        },
+        indent=2,
+    )
+
+
+def metrics_to_prometheus(stats: dict[str, StageStats]) -> str:
+    """Formats stage statistics in the Prometheus text format, as a `mugshot_stage_seconds`
+    histogram and a `mugshot_stage_window_seconds` gauge of the rolling window's quantiles.
+    """
+    lines = [
+        "# HELP mugshot_stage_seconds Time spent in each pipeline stage.",
+        "# TYPE mugshot_stage_seconds histogram",
+    ]
+    for name, stage in stats.items():
+        for bound, count in zip(BUCKETS, stage.buckets):
+            lines.append(
+                f'mugshot_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {count}'
+            )
+        lines.append(
+            f'mugshot_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {stage.count}'
+        )
+        lines.append(f'mugshot_stage_seconds_sum{{stage="{name}"}} {stage.total}')
+        lines.append(f'mugshot_stage_seconds_count{{stage="{name}"}} {stage.count}')
+
+    lines += [
+        "# HELP mugshot_stage_window_seconds Quantiles of the latest spans of each pipeline stage.",
+        "# TYPE mugshot_stage_window_seconds gauge",
+    ]
+    for name, stage in stats.items():
+        for quantile, value in (
+            ("0.5", stage.p50),
+            ("0.9", stage.p90),
+            ("0.99", stage.p99),
+        ):
+            lines.append(
+                f'mugshot_stage_window_seconds{{stage="{name}",quantile="{quantile}"}} {value}'
+            )
+    return "\n".join(lines) + "\n"
+
+
+def format_stats(stats: dict[str, StageStats]) -> list[str]:
+    """Formats stage statistics as short lines of text, e.g. for an on-screen overlay."""
+    return [
+        f"{name:<14} p50 {stage.p50 * 1000:5.1f} ms  p90 {stage.p90 * 1000:5.1f} ms"
+        for name, stage in stats.items()
+    ]
+
+
+class MetricsExporter:
+    """Writes the statistics of every stage to a file, e.g. for the Prometheus node exporter's
+    textfile collector.
+
+    Files are replaced atomically, so readers never see a partial export.
+
+    Arguments:
+    - `path`: str -- File to write
+    - `format`: Optional[str] -- "json" or "prometheus", guessed from the extension of `path` if None, Prometheus for ".prom"
+    """
+
+    FORMATS = ("json", "prometheus")
+    """Formats accepted by `MetricsExporter`."""
+
+    def __init__(self, path: str, format: Optional[str] = None):
+        if format is None:
+            format = "prometheus" if path.endswith(".prom") else "json"
+        if format not in self.FORMATS:
+            raise ValueError(
+                f"Unknown metrics format {format!r}, expected one of {self.FORMATS}"
+            )
+        self.path = path
+        self.format = format
+
+    def export(self):
+        """Writes the current statistics to `path`."""
+        stats = snapshot()
+        text = (
+            metrics_to_prometheus(stats)
+            if self.format == "prometheus"
+            else metrics_to_json(stats)
+        )
+
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            file.write(text)
+        os.replace(temporary, self.path)
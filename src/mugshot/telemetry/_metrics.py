@@ -0,0 +1,154 @@
+from bisect import bisect_left
+from contextlib import nullcontext
+from dataclasses import dataclass
+import threading
+import time
+from typing import Optional
+import numpy as np
+
+BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+"""Upper bounds in seconds of the histogram buckets, the last bucket is unbounded."""
+
+
+@dataclass
+class StageStats:
+    """A dataclass for the timing statistics of a stage."""
+
+    count: int
+    """Number of spans recorded since the metrics were reset."""
+
+    total: float
+    """Seconds spent in the stage since the metrics were reset."""
+
+    buckets: list[int]
+    """Cumulative number of spans at most as long as each of `BUCKETS`, since the metrics were reset."""
+
+    mean: float
+    """Mean duration in seconds of the spans in the rolling window."""
+
+    p50: float
+    """Median duration in seconds of the spans in the rolling window."""
+
+    p90: float
+    """90th percentile duration in seconds of the spans in the rolling window."""
+
+    p99: float
+    """99th percentile duration in seconds of the spans in the rolling window."""
+
+    max: float
+    """Longest duration in seconds of the spans in the rolling window."""
+
+
+class StageHistogram:
+    """Durations of a stage, kept as a rolling window of the latest spans and as running bucket
+    counts.
+
+    Arguments:
+    - `window`: int -- Number of latest spans kept for percentiles
+    """
+
+    def __init__(self, window: int = 1024):
+        self._samples = np.zeros(window)
+        self._next = 0
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, seconds: float):
+        """Records a span of `seconds`."""
+        with self._lock:
+            self._samples[self._next] = seconds
+            self._next = (self._next + 1) % len(self._samples)
+            self.count += 1
+            self.total += seconds
+            self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def stats(self) -> Optional[StageStats]:
+        """Returns the statistics of the stage, None if no span was recorded."""
+        with self._lock:
+            if self.count == 0:
+                return None
+            window = self._samples[: min(self.count, len(self._samples))].copy()
+            count, total, buckets = self.count, self.total, list(self.buckets)
+
+        p50, p90, p99 = np.percentile(window, (50, 90, 99)).tolist()
+        return StageStats(
+            count=count,
+            total=total,
+            buckets=np.cumsum(buckets[:-1]).tolist(),
+            mean=float(window.mean()),
+            p50=p50,
+            p90=p90,
+            p99=p99,
+            max=float(window.max()),
+        )
+
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+_enabled = False
+_histograms: dict[str, StageHistogram] = {}
+_histograms_lock = threading.Lock()
+_NO_SPAN = nullcontext()
+
+
+def enable_metrics(enabled: bool = True):
+    """Enables or disables recording spans. Metrics are disabled by default, and spans then
+    cost a single check."""
+    global _enabled
+    _enabled = enabled
+
+
+def metrics_enabled() -> bool:
+    """Returns whether spans are recorded."""
+    return _enabled
+
+
+def span(stage: str):
+    """Returns a context manager measuring the time spent in its block as a span of `stage`, or
+    a shared no-op context manager if metrics are disabled.
+
+    Usage:
+    ```
+    with span("yolo"):
+        results = model.predict(frame)
+    ```
+    """
+    return _Span(stage) if _enabled else _NO_SPAN
+
+
+def record(stage: str, seconds: float):
+    """Records a span of `seconds` for `stage`, if metrics are enabled."""
+    if not _enabled:
+        return
+    histogram = _histograms.get(stage)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(stage, StageHistogram())
+    histogram.add(seconds)
+
+
+def snapshot() -> dict[str, StageStats]:
+    """Returns the statistics of every stage with recorded spans, keyed by stage name."""
+    stats = {name: histogram.stats() for name, histogram in list(_histograms.items())}
+    return {name: stage for name, stage in sorted(stats.items()) if stage is not None}
+
+
+def reset_metrics():
+    """Forgets every recorded span."""
+    with _histograms_lock:
+        _histograms.clear()
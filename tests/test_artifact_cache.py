@@ -0,0 +1,54 @@
+import os
+import pytest
+from mugshot.cv._artifact_cache import ArtifactCache
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "model.pt"
+    path.write_bytes(b"weights")
+    return str(path)
+
+
+def test_artifacts_are_prepared_once(tmp_path, source):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    prepared = []
+
+    def prepare(path):
+        prepared.append(path)
+        with open(path, "w") as file:
+            file.write("exported")
+
+    first = cache.get(source, "640", ".onnx", prepare)
+    second = ArtifactCache(cache.directory).get(source, "640", ".onnx", prepare)
+
+    assert first == second
+    assert os.path.basename(first).startswith("model-")
+    assert first.endswith("-640.onnx")
+    assert len(prepared) == 1
+    assert sorted(os.listdir(cache.directory)) == [
+        ArtifactCache.INDEX_FILE,
+        os.path.basename(first),
+    ]
+
+
+def test_changed_sources_are_prepared_again(tmp_path, source):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    digest = cache.digest(source)
+
+    with open(source, "wb") as file:
+        file.write(b"retrained weights")
+    assert cache.digest(source) != digest
+
+
+def test_failed_preparations_leave_nothing_behind(tmp_path, source):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+
+    def prepare(path):
+        with open(path, "w") as file:
+            file.write("partial")
+        raise RuntimeError("export failed")
+
+    with pytest.raises(RuntimeError):
+        cache.get(source, "640", ".onnx", prepare)
+    assert os.listdir(cache.directory) == [ArtifactCache.INDEX_FILE]
@@ -0,0 +1,164 @@
+import os
+import cv2
+import numpy as np
+from mugshot.bench import (
+    SuiteCase,
+    compare_results,
+    default_cases,
+    load_detector_class,
+    load_results,
+    measure_import,
+    run_benchmark,
+    run_suite,
+    save_results,
+    synthetic_frames,
+)
+from mugshot.cv import BaseCVDetection, Detections
+from mugshot.feed import ImageDirectorySource
+from mugshot.mouse_input import FrameInput
+from mugshot.bench._suite import _detector_case
+from mugshot.mouse_input import _output_backend
+from mugshot.telemetry import enable_metrics
+
+
+class CountingDetection(BaseCVDetection):
+    """A detector that only counts the frames it is given."""
+
+    def __init__(self):
+        self.count = 0
+
+    def process_frame(self, frame):
+        self.count += 1
+        return (frame, FrameInput())
+
+
+def test_run_benchmark(tmp_path):
+    for i in range(10):
+        cv2.imwrite(
+            os.path.join(tmp_path, f"{i:02d}.png"), np.zeros((48, 64, 3), np.uint8)
+        )
+
+    detection = CountingDetection()
+    result = run_benchmark(ImageDirectorySource(str(tmp_path)), detection, warmup=2)
+
+    assert detection.count == 10
+    assert result.frames == 8
+    assert len(result.latencies_ms) == 8
+    assert result.fps > 0
+    assert 0 <= result.percentile(50) <= result.percentile(99)
+
+    summary = result.summary()
+    assert summary["detector"] == "CountingDetection"
+    assert set(summary["latency_ms"]) == {"mean", "p50", "p90", "p99", "max"}
+
+
+def test_run_benchmark_max_frames(tmp_path):
+    for i in range(10):
+        cv2.imwrite(
+            os.path.join(tmp_path, f"{i:02d}.png"), np.zeros((48, 64, 3), np.uint8)
+        )
+
+    result = run_benchmark(
+        ImageDirectorySource(str(tmp_path)), CountingDetection(), max_frames=3
+    )
+    assert result.frames == 3
+
+
+def test_load_detector_class():
+    assert load_detector_class("BaseCVDetection") is BaseCVDetection
+    assert load_detector_class(f"{__name__}:CountingDetection") is CountingDetection
+
+
+def test_run_benchmark_stages(tmp_path):
+    for i in range(4):
+        cv2.imwrite(
+            os.path.join(tmp_path, f"{i:02d}.png"), np.zeros((48, 64, 3), np.uint8)
+        )
+
+    class DetectingDetection(BaseCVDetection):
+        def detect(self, frame):
+            return (Detections(), FrameInput())
+
+    enable_metrics()
+    try:
+        result = run_benchmark(
+            ImageDirectorySource(str(tmp_path)), DetectingDetection(), warmup=1
+        )
+    finally:
+        enable_metrics(False)
+
+    # Only measured frames are counted in the stage timings
+    assert result.summary()["stages_ms"]["annotate"]["count"] == 3
+
+
+def test_synthetic_frames_are_reproducible():
+    frames = synthetic_frames(count=4, size=(160, 120))
+    assert len(frames) == 4
+    assert frames[0].shape == (120, 160, 3)
+    assert all(
+        np.array_equal(a, b) for a, b in zip(frames, synthetic_frames(4, (160, 120)))
+    )
+    # The face moves between frames
+    assert not np.array_equal(frames[0], frames[1])
+
+
+def test_run_suite_and_compare_with_baseline(tmp_path):
+    def failing_setup():
+        raise OSError("missing model")
+
+    cases = [
+        case
+        for case in default_cases()
+        if case.name in ("Feed.setFeed", "MouseAction.move_to")
+    ]
+    cases.append(SuiteCase("Missing.process_frame", failing_setup))
+    backend = _output_backend._backend
+    results = run_suite(synthetic_frames(count=8), cases, warmup=2)
+
+    # The mouse benchmark restores the output backend it replaced
+    assert _output_backend._backend is backend
+
+    assert set(results["cases"]) == {"Feed.setFeed", "MouseAction.move_to"}
+    assert results["cases"]["Feed.setFeed"]["frames"] == 6
+    assert results["skipped"] == {"Missing.process_frame": "missing model"}
+
+    save_results(results, str(tmp_path / "baseline.json"))
+    baseline = load_results(str(tmp_path / "baseline.json"))
+    assert compare_results(results, baseline) == []
+
+
+class ClosingDetection(CountingDetection):
+    closed = 0
+
+    def close(self):
+        ClosingDetection.closed += 1
+
+
+def test_run_suite_closes_detectors():
+    case = _detector_case(f"{__name__}:ClosingDetection")
+    results = run_suite(synthetic_frames(count=4, size=(64, 48)), [case], warmup=1)
+
+    assert results["cases"][case.name]["frames"] == 3
+    assert ClosingDetection.closed == 1
+
+
+def test_compare_results_flags_regressions():
+    def results(**p50s):
+        return {
+            "cases": {name: {"latency_ms": {"p50": p50}} for name, p50 in p50s.items()}
+        }
+
+    baseline = results(slow=10.0, fast=0.01, stable=5.0)
+    current = results(slow=13.0, fast=0.05, stable=5.5, new=1.0)
+
+    # Regressions on tiny timings are within timer noise
+    regressions = compare_results(current, baseline, tolerance=0.25)
+    assert len(regressions) == 1 and regressions[0].startswith("slow:")
+    assert compare_results(current, baseline, tolerance=0.5) == []
+
+
+def test_measure_import():
+    timing = measure_import("json", repeat=1)
+    assert timing.module == "json"
+    assert timing.seconds > 0
+    assert all(seconds <= timing.seconds for _, seconds in timing.slowest)
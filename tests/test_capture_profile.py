@@ -0,0 +1,191 @@
+import cv2
+import numpy as np
+import pytest
+
+from mugshot.feed import (
+    CAPTURE_PROFILES,
+    CameraSource,
+    CaptureProfile,
+    candidate_profiles,
+    get_capture_profile,
+)
+from mugshot.feed._capture_profile import decode_fourcc
+
+MJPG = cv2.VideoWriter.fourcc(*"MJPG")
+YUYV = cv2.VideoWriter.fourcc(*"YUYV")
+
+
+class FakeCapture:
+    """A fake camera behaving like a V4L2 device: requested sizes snap to the closest size the
+    current pixel format supports, and unsupported formats are rejected."""
+
+    def __init__(self, modes, opened=True, max_fps=30.0, buffering=True):
+        self.modes = {
+            cv2.VideoWriter.fourcc(*name): sizes for name, sizes in modes.items()
+        }
+        self.opened = opened
+        self.max_fps = max_fps
+        self.buffering = buffering
+        self.sets = []
+
+        # Driver defaults: the largest uncompressed size, buffering 4 frames
+        self.fourcc = YUYV if YUYV in self.modes else next(iter(self.modes))
+        self.width, self.height = max(self.modes[self.fourcc], key=self._area)
+        self.fps = max_fps
+        self.buffer_size = 4 if buffering else 0
+        self._requested_width = self.width
+
+    @staticmethod
+    def _area(size):
+        return size[0] * size[1]
+
+    def isOpened(self):
+        return self.opened
+
+    def getBackendName(self):
+        return "FAKE"
+
+    def set(self, prop, value):
+        self.sets.append(prop)
+        if prop == cv2.CAP_PROP_FOURCC:
+            if int(value) not in self.modes:
+                return False
+            self.fourcc = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self._requested_width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            area = self._requested_width * int(value)
+            self.width, self.height = min(
+                self.modes[self.fourcc], key=lambda size: abs(self._area(size) - area)
+            )
+        elif prop == cv2.CAP_PROP_FPS:
+            self.fps = min(float(value), self.max_fps)
+        elif prop == cv2.CAP_PROP_BUFFERSIZE:
+            if not self.buffering:
+                return False
+            self.buffer_size = int(value)
+        return True
+
+    def get(self, prop):
+        return {
+            cv2.CAP_PROP_FOURCC: self.fourcc,
+            cv2.CAP_PROP_FRAME_WIDTH: self.width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self.height,
+            cv2.CAP_PROP_FPS: self.fps,
+            cv2.CAP_PROP_BUFFERSIZE: self.buffer_size,
+        }.get(prop, 0.0)
+
+    def read(self):
+        return (True, np.zeros((self.height, self.width, 3), np.uint8))
+
+    def release(self):
+        self.opened = False
+
+
+def fake_device(modes, **kwargs):
+    """Returns a capture factory creating a `FakeCapture`, and the list of its calls."""
+    calls = []
+
+    def factory(*args):
+        capture = FakeCapture(modes, **kwargs)
+        calls.append((args, capture))
+        return capture
+
+    return (factory, calls)
+
+
+WEBCAM = {
+    "YUYV": [(640, 480), (1280, 720), (1920, 1080)],
+    "MJPG": [(320, 240), (640, 480), (1280, 720), (1920, 1080)],
+}
+
+
+def test_profile_reports_accepted_settings():
+    factory, calls = fake_device(WEBCAM)
+    profile = CaptureProfile("test", 640, 480, fps=60, backend="v4l2")
+    source = CameraSource(2, profile, capture_factory=factory)
+
+    assert source.open()
+    assert calls[0][0] == (2, cv2.CAP_V4L2)
+    # The pixel format is requested before the size
+    sets = calls[0][1].sets
+    assert sets.index(cv2.CAP_PROP_FOURCC) < sets.index(cv2.CAP_PROP_FRAME_WIDTH)
+
+    settings = source.settings
+    assert (settings.width, settings.height) == (640, 480)
+    assert settings.fourcc == "MJPG"
+    assert settings.fps == 30  # Capped by the device
+    assert settings.buffer_size == 1
+    assert settings.backend == "FAKE"
+    assert source.read().shape == (480, 640, 3)
+
+
+def test_default_profile_keeps_driver_defaults():
+    factory, calls = fake_device(WEBCAM)
+    source = CameraSource(0, "default", capture_factory=factory)
+
+    assert source.open()
+    assert calls[0][0] == (0,)
+    assert calls[0][1].sets == []
+    assert (source.settings.width, source.settings.fourcc) == (1920, "YUYV")
+    assert source.settings.buffer_size == 4
+    assert source.selected_profile is None
+
+
+def test_auto_selects_cheapest_profile_meeting_size():
+    factory, _ = fake_device(WEBCAM)
+    source = CameraSource(
+        0, "auto", min_size=lambda: (600, 400), capture_factory=factory
+    )
+
+    assert source.open()
+    assert source.selected_profile == get_capture_profile("vga")
+    assert (source.settings.width, source.settings.height) == (640, 480)
+
+
+def test_auto_tries_larger_profiles_when_device_falls_back():
+    # Asking for 640x480 gives 320x240, the closest size in MJPG
+    factory, _ = fake_device({"MJPG": [(320, 240), (1280, 720)]})
+    source = CameraSource(0, "auto", min_size=(640, 480), capture_factory=factory)
+
+    assert source.open()
+    assert source.selected_profile == get_capture_profile("hd")
+    assert (source.settings.width, source.settings.height) == (1280, 720)
+
+
+def test_auto_settles_for_largest_frames():
+    factory, _ = fake_device({"MJPG": [(320, 240)]}, buffering=False)
+    source = CameraSource(0, "auto", min_size=(640, 480), capture_factory=factory)
+
+    assert source.open()
+    assert (source.settings.width, source.settings.height) == (320, 240)
+    # Unsupported by the device
+    assert source.settings.buffer_size == 0
+
+
+def test_backend_falls_back_to_any():
+    calls = []
+
+    def factory(*args):
+        calls.append(args)
+        return FakeCapture(WEBCAM, opened=args[1] == cv2.CAP_ANY)
+
+    source = CameraSource(
+        0, CaptureProfile("test", 640, 480, backend="v4l2"), capture_factory=factory
+    )
+    assert source.open()
+    assert calls == [(0, cv2.CAP_V4L2), (0, cv2.CAP_ANY)]
+
+
+def test_candidate_profiles_order():
+    names = [profile.name for profile in candidate_profiles((640, 480))]
+    assert names == ["vga", "hd", "fhd", "qvga"]
+    assert candidate_profiles(None) == sorted(CAPTURE_PROFILES, key=lambda p: p.cost)
+
+    with pytest.raises(ValueError):
+        CameraSource(0, "8k")
+
+
+def test_decode_fourcc():
+    assert decode_fourcc(MJPG) == "MJPG"
+    assert decode_fourcc(0) == ""
@@ -0,0 +1,83 @@
+import cv2
+import numpy as np
+import pytest
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+from mugshot.components.feed import Feed, RectFloat
+from mugshot.telemetry import enable_metrics, reset_metrics, snapshot
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def reference_preview(frame, mapArea):
+    """The original float32 mask compositing of `Feed.setFeed`."""
+    mask = np.full(frame.shape, 0.6, np.float32)
+    cv2.rectangle(
+        mask, (mapArea.x1, mapArea.y1), (mapArea.x2, mapArea.y2), (1.0, 1.0, 1.0), -1
+    )
+    return cv2.multiply(mask, frame.astype(np.float32)).astype(np.uint8)
+
+
+def shown_preview(feed):
+    image = feed.pixmap().toImage().convertToFormat(QImage.Format.Format_BGR888)
+    array = np.frombuffer(image.constBits(), np.uint8, image.sizeInBytes())
+    rows = array.reshape(image.height(), image.bytesPerLine())
+    # Copy out before the image is freed
+    return rows[:, : image.width() * 3].reshape(image.height(), image.width(), 3).copy()
+
+
+def test_set_feed_matches_float_compositing(app):
+    feed = Feed(mapArea=RectFloat(0.2, 0.2, 0.8, 0.8))
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (480, 640, 3), np.uint8)
+
+    feed.setFeed(frame)
+    assert np.array_equal(shown_preview(feed), reference_preview(frame, feed.mapArea))
+
+    # The map area is picked up after it changes
+    feed.mapArea.x1 = 10
+    feed.mapArea.y2 = 470
+    feed.setFeed(frame)
+    assert np.array_equal(shown_preview(feed), reference_preview(frame, feed.mapArea))
+
+
+def test_set_feed_resizes_other_resolutions(app):
+    feed = Feed(mapArea=RectFloat(0.0, 0.0, 1.0, 1.0))
+    feed.setFeed(np.full((720, 1280, 3), 200, np.uint8))
+    preview = shown_preview(feed)
+    assert preview.shape == (480, 640, 3)
+    assert int(preview[240, 320, 0]) == 200
+
+
+def test_feed_reports_preview_visibility(app):
+    feed = Feed(mapArea=RectFloat(0.2, 0.2, 0.8, 0.8))
+    changes = []
+    feed.previewVisibilityChanged.connect(changes.append)
+
+    feed.show()
+    feed.hide()
+    feed.show()
+    assert changes == [True, False, True]
+    feed.close()
+
+
+def test_feed_draws_stats_overlay(app):
+    enable_metrics()
+    reset_metrics()
+    try:
+        feed = Feed(mapArea=RectFloat(0.0, 0.0, 1.0, 1.0))
+        frame = np.full((480, 640, 3), 128, np.uint8)
+        feed.setFeed(frame)
+        assert np.array_equal(shown_preview(feed), frame)
+
+        # The preview's own timing is shown from the next frame on
+        feed.setStatsOverlay(True)
+        feed.setFeed(frame)
+        assert "preview" in snapshot()
+        assert not np.array_equal(shown_preview(feed)[:40], frame[:40])
+    finally:
+        enable_metrics(False)
+        reset_metrics()
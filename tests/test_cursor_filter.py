@@ -0,0 +1,76 @@
+import time
+import numpy as np
+import pytest
+from mugshot.mouse_input import (
+    KalmanFilter,
+    OneEuroFilter,
+    OutputWorker,
+    RecordingBackend,
+    create_cursor_filter,
+)
+
+RATE = 30.0
+
+
+def feed(cursor_filter, positions, start=0.0):
+    for i, position in enumerate(positions):
+        cursor_filter.update(position, start + i / RATE)
+
+
+@pytest.mark.parametrize("cursor_filter", [OneEuroFilter(), KalmanFilter()])
+def test_filter_reduces_jitter_at_rest(cursor_filter):
+    rng = np.random.default_rng(0)
+    measured = 500 + rng.normal(0, 3, (120, 2))
+
+    filtered = []
+    for i, position in enumerate(measured):
+        cursor_filter.update(tuple(position), i / RATE)
+        filtered.append(cursor_filter.position.copy())
+
+    assert (
+        np.std(filtered[30:], axis=0).max() < np.std(measured[30:], axis=0).min() * 0.7
+    )
+
+
+@pytest.mark.parametrize("cursor_filter", [OneEuroFilter(), KalmanFilter()])
+def test_filter_predicts_constant_velocity(cursor_filter):
+    velocity = np.array([300.0, -150.0])
+    feed(cursor_filter, [tuple(velocity * i / RATE) for i in range(60)])
+
+    # Predict 100 ms past the latest measurement
+    latest = 59 / RATE
+    expected = velocity * (latest + 0.1)
+    assert np.allclose(cursor_filter.predict(latest + 0.1), expected, atol=5)
+
+    cursor_filter.reset()
+    assert cursor_filter.predict(latest) is None
+
+
+def test_create_cursor_filter():
+    assert create_cursor_filter("none") is None
+    assert isinstance(create_cursor_filter("kalman"), KalmanFilter)
+    with pytest.raises(ValueError):
+        create_cursor_filter("median")
+
+
+def test_output_worker_moves_filtered_cursor():
+    backend = RecordingBackend(size=(1000, 1000))
+    worker = OutputWorker(backend=backend, cursor_filter=OneEuroFilter(), rate=200)
+    worker.start()
+    try:
+        now = time.monotonic()
+        for i in range(10):
+            worker.setCursorTarget(100 + i * 10, 100, now - 0.3 + i / RATE)
+        time.sleep(0.1)
+
+        moves = [event for event in backend.events if event[0] == "move"]
+        assert moves
+        # Extrapolated past the latest target, which was at x = 190
+        assert moves[-1][1] > 190
+
+        worker.resetCursorFilter()
+        count = len(backend.events)
+        time.sleep(0.05)
+        assert len(backend.events) == count
+    finally:
+        worker.quit()
@@ -0,0 +1,190 @@
+import threading
+import time
+import numpy as np
+import pytest
+from PySide6.QtCore import Qt
+from mugshot.cv import (
+    BaseCVDetection,
+    CVWorker,
+    DetectorRegistry,
+    Detections,
+    FaceResult,
+    RenderMode,
+    RenderPolicy,
+)
+from mugshot.feed import FrameEnvelope
+from mugshot.mouse_input import FrameInput
+
+
+class SlowDetection(BaseCVDetection):
+    """A detector that takes a fixed time per frame and records where it ran."""
+
+    DELAY = 0.05
+
+    def __init__(self):
+        self.thread_ids = set()
+        self.frames = []
+
+    def process_frame(self, frame):
+        self.thread_ids.add(threading.get_ident())
+        self.frames.append(int(frame[0, 0, 0]))
+        time.sleep(self.DELAY)
+        return (frame, FrameInput())
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def test_cv_worker_processes_off_calling_thread():
+    worker = CVWorker(cv_detection_class=SlowDetection)
+    worker.start()
+    try:
+        worker.processFrame(np.zeros((4, 4, 3), np.uint8))
+        assert wait_until(lambda: worker.processedCount == 1)
+        assert threading.get_ident() not in worker.cvDetection.thread_ids
+    finally:
+        worker.quit()
+
+
+def test_cv_worker_drops_frames_while_busy():
+    worker = CVWorker(cv_detection_class=SlowDetection)
+    worker.start()
+    try:
+        assert wait_until(lambda: worker.cvDetection is not None)
+        for i in range(20):
+            worker.processFrame(np.full((4, 4, 3), i, np.uint8))
+            time.sleep(SlowDetection.DELAY / 10)
+
+        assert wait_until(lambda: worker.processedCount + worker.droppedCount == 20)
+        assert worker.droppedCount > 0
+
+        # The newest frame is always processed last
+        assert wait_until(lambda: worker.cvDetection.frames[-1] == 19)
+    finally:
+        worker.quit()
+
+    assert worker.isFinished()
+
+
+class FastDetection(SlowDetection):
+    DELAY = 0
+
+
+def test_cv_worker_swaps_detection():
+    worker = CVWorker(cv_detection_class=SlowDetection)
+    worker.start()
+    try:
+        worker.processFrame(np.zeros((4, 4, 3), np.uint8))
+        assert wait_until(lambda: worker.processedCount == 1)
+
+        worker.setCVDetectionClass(FastDetection)
+        worker.processFrame(np.zeros((4, 4, 3), np.uint8))
+        assert wait_until(lambda: worker.processedCount == 2)
+        assert isinstance(worker.cvDetection, FastDetection)
+    finally:
+        worker.quit()
+
+
+class DrawingDetection(BaseCVDetection):
+    """A detector that reports one face, counting annotated frames."""
+
+    def __init__(self):
+        self.annotated = 0
+
+    def detect(self, frame):
+        return (Detections(faces=[FaceResult((1, 1, 4, 4))]), FrameInput())
+
+    def process_frame(self, frame):
+        self.annotated += 1
+        return super().process_frame(frame)
+
+
+class InputOnlyDetection(BaseCVDetection):
+    def detect(self, frame):
+        return (None, FrameInput())
+
+
+def test_base_detection_needs_detect_or_process_frame():
+    frame = np.zeros((8, 8, 3), np.uint8)
+    with pytest.raises(TypeError, match="must implement detect or process_frame"):
+        BaseCVDetection().process_frame(frame)
+    with pytest.raises(TypeError):
+        BaseCVDetection().detect(frame)
+
+    # Nothing to draw, so the frame is not copied
+    assert InputOnlyDetection().process_frame(frame)[0] is frame
+
+
+def test_cv_worker_default_detector():
+    assert DetectorRegistry.load(CVWorker.DEFAULT_DETECTOR).__name__ == "AltCVDetection"
+
+
+def run_frames(worker, count):
+    emitted = []
+    worker.frameProcessed.connect(emitted.append, Qt.ConnectionType.DirectConnection)
+    worker.start()
+    try:
+        assert wait_until(lambda: worker.cvDetection is not None)
+        for _ in range(count):
+            processed = worker.processedCount
+            worker.processFrame(np.zeros((8, 8, 3), np.uint8))
+            assert wait_until(lambda: worker.processedCount == processed + 1)
+    finally:
+        worker.quit()
+    return emitted
+
+
+def test_cv_worker_decimated_render_policy():
+    worker = CVWorker(cv_detection_class=DrawingDetection)
+    worker.setRenderPolicy(RenderPolicy(RenderMode.DECIMATED, interval=3))
+    emitted = run_frames(worker, 7)
+
+    assert worker.cvDetection.annotated == 3
+    assert len(emitted) == 3
+    assert all(frame.any() for frame in emitted)
+
+
+def test_cv_worker_hidden_preview_skips_annotation():
+    worker = CVWorker(cv_detection_class=DrawingDetection)
+    worker.setPreviewVisible(False)
+    assert run_frames(worker, 3) == []
+    assert worker.cvDetection.annotated == 0
+
+    worker = CVWorker(cv_detection_class=DrawingDetection)
+    worker.hiddenRenderPolicy = RenderPolicy(RenderMode.NONE, emit_raw=True)
+    worker.setPreviewVisible(False)
+    emitted = run_frames(worker, 3)
+    assert len(emitted) == 3
+    assert not any(frame.any() for frame in emitted)
+    assert worker.cvDetection.annotated == 0
+
+
+def test_cv_worker_traces_frames_into_inputs():
+    worker = CVWorker(cv_detection_class=DrawingDetection)
+    inputs = []
+    worker.inputsMade.connect(inputs.append, Qt.ConnectionType.DirectConnection)
+    worker.start()
+    try:
+        assert wait_until(lambda: worker.cvDetection is not None)
+        captured = time.monotonic() - 0.05
+        worker.processFrame(np.zeros((8, 8, 3), np.uint8), FrameEnvelope(7, captured))
+        assert wait_until(lambda: len(inputs) == 1)
+
+        # Frames submitted without an envelope are numbered by the worker
+        worker.processFrame(np.zeros((8, 8, 3), np.uint8))
+        assert wait_until(lambda: len(inputs) == 2)
+    finally:
+        worker.quit()
+
+    envelope = inputs[0].envelope
+    assert envelope.seq == 7
+    assert inputs[0].timestamp == captured
+    assert list(envelope.stages) == ["queued", "dequeued", "processed"]
+    latencies = list(envelope.latencies().values())
+    assert latencies == sorted(latencies) and latencies[0] >= 0.05
+
+    assert inputs[1].envelope.seq == 1
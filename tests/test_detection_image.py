@@ -0,0 +1,26 @@
+import numpy as np
+from mugshot.cv import DetectionImage
+
+
+def test_detection_image_downscales_into_reused_buffer():
+    image = DetectionImage(max_width=640)
+    frame = np.zeros((720, 1280, 3), np.uint8)
+
+    small = image.prepare(frame)
+    assert small.shape == (360, 640, 3)
+    assert image.factor == 2.0
+    assert image.prepare(frame) is small
+
+    assert image.to_frame((10, 20, 30, 40)) == (20, 40, 60, 80)
+    assert image.min_size(61) == (31, 31)
+
+
+def test_detection_image_keeps_small_frames():
+    image = DetectionImage(max_width=640)
+    frame = np.zeros((480, 640), np.uint8)
+    assert image.prepare(frame) is frame
+    assert image.factor == 1.0
+
+    image = DetectionImage(scale=0.25, max_width=None)
+    assert image.prepare(frame).shape == (120, 160)
+    assert image.to_frame((1, 1, 2, 2)) == (4, 4, 8, 8)
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+import pytest
+import mugshot.cv._detector_registry as detector_registry
+from mugshot.cv import BaseCVDetection, DetectorRegistry
+
+
+def test_detectors_are_imported_lazily():
+    code = (
+        "import sys, mugshot.cv, mugshot.app\n"
+        "assert 'mugshot.cv._alt_cv_detection' not in sys.modules\n"
+        "from mugshot.cv import AltCVDetection\n"
+        "assert 'mugshot.cv._alt_cv_detection' in sys.modules\n"
+        "assert 'mugshot.cv._cv_detection' not in sys.modules\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        env={"PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+
+
+def test_load_detectors():
+    assert DetectorRegistry.load("AltCVDetection").__name__ == "AltCVDetection"
+    assert {"AltCVDetection", "CVDetection"} <= set(DetectorRegistry.names())
+    assert DetectorRegistry.load("mugshot.cv:BaseCVDetection") is BaseCVDetection
+
+    with pytest.raises(ValueError, match="Unknown detector"):
+        DetectorRegistry.load("Missing")
+    with pytest.raises(ValueError, match="not a BaseCVDetection"):
+        DetectorRegistry.load("mugshot.cv:DetectorRegistry")
+
+
+def test_entry_points_are_discovered(monkeypatch):
+    entry_point = EntryPoint(
+        "PluginDetection",
+        "mugshot.cv:BaseCVDetection",
+        DetectorRegistry.ENTRY_POINT_GROUP,
+    )
+    monkeypatch.setattr(detector_registry, "entry_points", lambda group: [entry_point])
+    monkeypatch.setattr(DetectorRegistry, "_targets", dict(DetectorRegistry._targets))
+    monkeypatch.setattr(DetectorRegistry, "_discovered", False)
+
+    assert "PluginDetection" in DetectorRegistry.names()
+    assert DetectorRegistry.load("PluginDetection") is BaseCVDetection
@@ -0,0 +1,43 @@
+import numpy as np
+from mugshot.cv._face_tracker import FaceTracker
+
+
+def textured_frame(offset=(0, 0), size=(240, 320)):
+    """Makes a grayscale frame with a textured 60x60 patch at (100, 80) shifted by `offset`."""
+    rng = np.random.default_rng(0)
+    patch = (rng.random((60, 60)) * 255).astype(np.uint8)
+    frame = np.full(size, 128, np.uint8)
+    x, y = 100 + offset[0], 80 + offset[1]
+    frame[y : y + 60, x : x + 60] = patch
+    return frame
+
+
+def test_tracker_follows_translation():
+    tracker = FaceTracker()
+    assert tracker.start(textured_frame(), (100, 80, 60, 60))
+    assert tracker.active
+
+    for step in range(1, 6):
+        box = tracker.update(textured_frame((3 * step, 2 * step)))
+        assert box is not None
+
+    x, y, w, h = box
+    assert abs(x - 115) <= 1 and abs(y - 90) <= 1
+    assert abs(w - 60) <= 2 and abs(h - 60) <= 2
+    assert tracker.confidence > 0.5
+
+
+def test_tracker_loses_featureless_region():
+    tracker = FaceTracker()
+    flat = np.full((240, 320), 128, np.uint8)
+    assert not tracker.start(flat, (100, 80, 60, 60))
+    assert not tracker.active
+    assert tracker.update(flat) is None
+
+
+def test_tracker_loses_vanished_face():
+    tracker = FaceTracker()
+    assert tracker.start(textured_frame(), (100, 80, 60, 60))
+    assert tracker.update(np.full((240, 320), 128, np.uint8)) is None
+    assert not tracker.active
+    assert tracker.confidence == 0.0
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+import cv2
+import numpy as np
+from PySide6.QtCore import Qt
+from mugshot.feed import (
+    FeedWorker,
+    FrameBuffer,
+    ImageDirectorySource,
+    VideoFileSource,
+    open_source,
+)
+
+
+def make_frames(count=5, width=64, height=48):
+    """Makes distinguishable BGR frames, where each frame is filled with its index."""
+    return [np.full((height, width, 3), i * 10, np.uint8) for i in range(count)]
+
+
+def test_image_directory_source(tmp_path):
+    frames = make_frames()
+    for i, frame in enumerate(frames):
+        cv2.imwrite(os.path.join(tmp_path, f"{i:04d}.png"), frame)
+    (tmp_path / "notes.txt").write_text("not a frame")
+
+    source = ImageDirectorySource(str(tmp_path))
+    assert source.open()
+
+    read = []
+    while (frame := source.read()) is not None:
+        read.append(frame)
+    source.release()
+
+    assert len(read) == len(frames)
+    for expected, actual in zip(frames, read):
+        assert np.array_equal(expected, actual)
+
+
+def test_image_directory_source_loops(tmp_path):
+    for i, frame in enumerate(make_frames(count=2)):
+        cv2.imwrite(os.path.join(tmp_path, f"{i}.png"), frame)
+
+    source = ImageDirectorySource(str(tmp_path), loop=True)
+    assert source.open()
+    values = [int(source.read()[0, 0, 0]) for _ in range(5)]
+    assert values == [0, 10, 0, 10, 0]
+
+
+def test_image_directory_source_skips_unreadable(tmp_path):
+    frames = make_frames(2)
+    cv2.imwrite(str(tmp_path / "0.png"), frames[0])
+    (tmp_path / "1.png").write_bytes(b"not an image")
+    cv2.imwrite(str(tmp_path / "2.png"), frames[1])
+
+    source = ImageDirectorySource(str(tmp_path))
+    assert source.open()
+    assert np.array_equal(source.read(), frames[0])
+    assert np.array_equal(source.read(), frames[1])
+    assert source.read() is None
+
+    # Nothing readable, even when looping
+    (tmp_path / "0.png").write_bytes(b"")
+    (tmp_path / "2.png").write_bytes(b"")
+    source = ImageDirectorySource(str(tmp_path), loop=True)
+    assert source.open()
+    assert source.read() is None
+
+
+def test_image_directory_source_missing(tmp_path):
+    source = ImageDirectorySource(str(tmp_path / "missing"))
+    assert not source.open()
+    assert not source.is_opened()
+
+
+def test_video_file_source(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter.fourcc(*"MJPG"), 30, (64, 48))
+    for frame in make_frames(count=8):
+        writer.write(frame)
+    writer.release()
+
+    source = VideoFileSource(path)
+    assert source.open()
+    count = 0
+    while (frame := source.read()) is not None:
+        assert frame.shape == (48, 64, 3)
+        count += 1
+    source.release()
+
+    assert count == 8
+
+
+def test_open_source(tmp_path):
+    assert type(open_source("0")).__name__ == "CameraSource"
+    assert type(open_source(str(tmp_path))).__name__ == "ImageDirectorySource"
+    assert type(open_source(str(tmp_path / "clip.mp4"))).__name__ == "VideoFileSource"
+
+
+def test_frame_buffer_latest_wins():
+    buffer = FrameBuffer()
+    assert buffer.put(1)
+    assert not buffer.put(2)
+    assert not buffer.put(3)
+
+    assert buffer.take(timeout=0) == 3
+    assert buffer.take(timeout=0) is None
+    assert buffer.written == 3
+    assert buffer.overwritten == 2
+
+    assert buffer.put(4)
+
+
+def test_frame_buffer_take_waits():
+    buffer = FrameBuffer()
+    producer = threading.Timer(0.05, buffer.put, args=("frame",))
+    producer.start()
+    assert buffer.take(timeout=5) == "frame"
+    producer.join()
+
+
+def test_frame_buffer_close_wakes_consumer():
+    buffer = FrameBuffer()
+    closer = threading.Timer(0.05, buffer.close)
+    closer.start()
+    assert buffer.take() is None
+    assert buffer.closed
+    closer.join()
+
+
+def test_feed_worker_capture_loop(tmp_path):
+    for i, frame in enumerate(make_frames(count=3)):
+        cv2.imwrite(os.path.join(tmp_path, f"{i}.png"), frame)
+
+    worker = FeedWorker(ImageDirectorySource(str(tmp_path), loop=True))
+    shapes = []
+    worker.frameRead.connect(
+        lambda frame, envelope: shapes.append(frame.shape),
+        Qt.ConnectionType.DirectConnection,
+    )
+    worker.start()
+    try:
+        # The loop keeps capturing, looping over the images
+        deadline = time.monotonic() + 5
+        while worker.readCount < 6 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert worker.readCount >= 6
+    finally:
+        worker.quit()
+
+    assert shapes[0] == (48, 64, 3)
+
+    assert worker.isFinished()
+
+
+def test_feed_worker_numbers_frames(tmp_path):
+    for i, frame in enumerate(make_frames(count=3)):
+        cv2.imwrite(os.path.join(tmp_path, f"{i}.png"), frame)
+
+    worker = FeedWorker(ImageDirectorySource(str(tmp_path)))
+    envelopes = []
+    worker.frameRead.connect(
+        lambda frame, envelope: envelopes.append(envelope),
+        Qt.ConnectionType.DirectConnection,
+    )
+    worker.start()
+    worker.wait(5000)
+    worker.quit()
+
+    assert [envelope.seq for envelope in envelopes] == [0, 1, 2]
+    assert all(a.captured <= b.captured for a, b in zip(envelopes, envelopes[1:]))
@@ -0,0 +1,82 @@
+from mugshot.mouse_input import (
+    FrameInput,
+    Gesture,
+    GestureEngine,
+    GestureEvent,
+    GesturePhase,
+)
+
+
+def run(gesture, observations, dt=0.1):
+    """Feeds a string of observations ("x" observed, "." not) to a gesture, and returns the
+    phase of each frame's transition, or None."""
+    events = [
+        gesture.update(observation == "x", i * dt)
+        for i, observation in enumerate(observations)
+    ]
+    return [None if event is None else event.phase for event in events]
+
+
+def test_gesture_debounces_single_frames():
+    gesture = Gesture("left_eye", press_frames=3, release_frames=2, hold_time=None)
+    phases = run(gesture, "x.xx.x.xxx.xx..")
+
+    P, R = GesturePhase.PRESS, GesturePhase.RELEASE
+    assert phases == [None] * 9 + [P] + [None] * 4 + [R]
+    assert not gesture.pressed
+
+
+def test_gesture_holds_once():
+    gesture = Gesture("tongue_down", press_frames=1, release_frames=1, hold_time=0.25)
+    phases = run(gesture, "xxxxxx.")
+
+    H = GesturePhase.HOLD
+    assert phases == [
+        GesturePhase.PRESS,
+        None,
+        None,
+        H,
+        None,
+        None,
+        GesturePhase.RELEASE,
+    ]
+
+
+def test_engine_only_emits_transitions():
+    engine = GestureEngine(press_frames=2, release_frames=2, hold_time=None)
+    closed = FrameInput(
+        is_left_eye_closed=True, is_right_eye_closed=False, timestamp=1.0
+    )
+    opened = FrameInput(
+        is_left_eye_closed=False, is_right_eye_closed=False, timestamp=2.0
+    )
+
+    events = [engine.update(frame_input) for frame_input in [closed] * 5 + [opened] * 5]
+    assert events[1] == [GestureEvent("left_eye", GesturePhase.PRESS, 1.0)]
+    assert events[6] == [GestureEvent("left_eye", GesturePhase.RELEASE, 2.0)]
+    assert sum(len(frame_events) for frame_events in events) == 2
+
+
+def test_engine_tracks_tongue_direction():
+    engine = GestureEngine(press_frames=1, release_frames=1, hold_time=None)
+
+    engine.update(FrameInput(is_tongue_down=False))
+    assert engine.is_pressed("tongue_up") and not engine.is_pressed("tongue_down")
+
+    events = engine.update(FrameInput(is_tongue_down=True))
+    assert {(event.gesture, event.phase) for event in events} == {
+        ("tongue_up", GesturePhase.RELEASE),
+        ("tongue_down", GesturePhase.PRESS),
+    }
+
+    # No tongue releases the gesture
+    engine.update(FrameInput())
+    assert not engine.is_pressed("tongue_down")
+
+
+def test_engine_reset_releases_pressed_gestures():
+    engine = GestureEngine(press_frames=1)
+    engine.update(FrameInput(is_right_eye_closed=True))
+
+    assert [event.gesture for event in engine.reset()] == ["right_eye"]
+    assert engine.reset() == []
@@ -0,0 +1,84 @@
+import dlib
+import numpy as np
+from imutils import face_utils
+from mugshot.cv import (
+    LandmarkBuffer,
+    eye_aspect_ratios,
+    head_pose_ratios,
+    landmark_metrics,
+    mouth_aspect_ratios,
+)
+
+
+def reference_ear(eye):
+    """The EAR formula of CVDetection, one eye at a time."""
+    return (
+        np.linalg.norm(eye[1] - eye[5]) + np.linalg.norm(eye[2] - eye[4])
+    ) / np.linalg.norm(eye[0] - eye[3])
+
+
+def random_landmarks(faces):
+    return np.random.default_rng(0).uniform(0, 200, (faces, 68, 2)).astype(np.float32)
+
+
+def test_eye_aspect_ratios_match_per_eye_formula():
+    landmarks = random_landmarks(3)
+    l_start, l_end = face_utils.FACIAL_LANDMARKS_IDXS["left_eye"]
+    r_start, r_end = face_utils.FACIAL_LANDMARKS_IDXS["right_eye"]
+
+    ears = eye_aspect_ratios(landmarks)
+    assert ears.shape == (3, 2)
+    for face, (left, right) in zip(landmarks, ears):
+        assert np.isclose(left, reference_ear(face[l_start:l_end]), rtol=1e-5)
+        assert np.isclose(right, reference_ear(face[r_start:r_end]), rtol=1e-5)
+
+
+def test_landmark_buffer_grows_and_maps_coordinates():
+    points = dlib.points([dlib.point(i, 2 * i) for i in range(68)])
+    shape = dlib.full_object_detection(dlib.rectangle(0, 0, 100, 100), points)
+
+    buffer = LandmarkBuffer(capacity=1)
+    buffer.add(shape)
+    buffer.add(shape, scale=2.0, offset=(10.0, 0.0))
+    assert buffer.points.shape == (2, 68, 2)
+    assert tuple(buffer.points[0, 5]) == (5, 10)
+    assert tuple(buffer.points[1, 5]) == (20, 20)
+
+    buffer.clear()
+    assert buffer.points.shape == (0, 68, 2)
+
+
+def symmetric_face():
+    face = np.zeros((1, 68, 2), np.float32)
+    face[0, 36] = (60, 100)  # Outer eye corners
+    face[0, 45] = (140, 100)
+    face[0, 8] = (100, 200)  # Chin
+    face[0, 30] = (100, 140)  # Nose tip, 0.4 of the way to the chin
+    face[0, 60:68] = [
+        (80, 170),
+        (90, 165),
+        (100, 165),
+        (110, 165),
+        (120, 170),
+        (110, 175),
+        (100, 175),
+        (90, 175),
+    ]
+    return face
+
+
+def test_head_pose_and_mouth_ratios():
+    face = symmetric_face()
+    yaw, pitch = head_pose_ratios(face)
+    assert np.allclose((yaw[0], pitch[0]), (0.0, 0.0), atol=1e-6)
+
+    face[0, 30, 0] += 20  # Nose tip towards the image's right
+    yaw, _ = head_pose_ratios(face)
+    assert yaw[0] > 0.2
+
+    closed = mouth_aspect_ratios(face)[0]
+    face[0, 65:68, 1] += 20
+    assert mouth_aspect_ratios(face)[0] > closed
+
+    metrics = landmark_metrics(np.concatenate((face, symmetric_face())))
+    assert metrics.mar.shape == metrics.yaw.shape == metrics.left_ear.shape == (2,)
@@ -0,0 +1,132 @@
+import threading
+import time
+import pytest
+from mugshot.cv import ModelRegistry
+import mugshot.cv._alt_cv_detection as alt_cv_detection
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    ModelRegistry.evict()
+    yield
+    ModelRegistry.evict()
+
+
+def test_cascade_is_loaded_once():
+    first = ModelRegistry.cascade("haarcascade_eye.xml")
+    second = ModelRegistry.cascade("haarcascade_eye.xml")
+    assert first is second
+    assert not first.empty()
+    assert len(ModelRegistry.loaded()) == 1
+
+
+def test_cascade_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ModelRegistry.cascade(str(tmp_path / "missing.xml"))
+    assert ModelRegistry.loaded() == []
+
+
+def test_get_memoizes_by_options():
+    loads = []
+
+    def loader():
+        loads.append(None)
+        return object()
+
+    warmed = []
+    a = ModelRegistry.get("test", "model", loader, warm_up=warmed.append, size=320)
+    b = ModelRegistry.get("test", "model", loader, warm_up=warmed.append, size=320)
+    c = ModelRegistry.get("test", "model", loader, warm_up=warmed.append, size=640)
+
+    assert a is b
+    assert a is not c
+    assert len(loads) == 2
+    assert warmed == [a, c]
+
+
+def test_evict():
+    a = ModelRegistry.get("test", "a", object)
+    ModelRegistry.get("test", "b", object)
+    ModelRegistry.get("other", "a", object)
+
+    assert ModelRegistry.evict("a", kind="test") == 1
+    assert ModelRegistry.get("test", "a", object) is not a
+    assert ModelRegistry.evict(kind="test") == 2
+    assert ModelRegistry.evict() == 1
+    assert ModelRegistry.loaded() == []
+
+
+def test_release_evicts_on_last_reference():
+    a = ModelRegistry.get("test", "a", object)
+    assert ModelRegistry.get("test", "a", object) is a
+
+    # Still used by the other holder
+    assert not ModelRegistry.release(a)
+    assert ModelRegistry.get("test", "a", object) is a
+    assert not ModelRegistry.release(a)
+
+    assert ModelRegistry.release(a)
+    assert ModelRegistry.loaded() == []
+    assert not ModelRegistry.release(a)
+
+
+def test_load_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def loader(value):
+        def load():
+            # Only returns once every loader is running at the same time
+            barrier.wait()
+            return value
+
+        return load
+
+    assert ModelRegistry.load_concurrently(loader(1), loader(2), loader(3)) == [1, 2, 3]
+
+    def failing():
+        time.sleep(0.01)
+        raise FileNotFoundError("model.pt")
+
+    with pytest.raises(FileNotFoundError):
+        ModelRegistry.load_concurrently(lambda: 1, failing)
+
+
+def test_load_concurrently_releases_on_failure():
+    class Backend:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    backend = Backend()
+    shared = ModelRegistry.get("test", "shared", object)
+
+    def failing():
+        time.sleep(0.01)
+        raise FileNotFoundError("model.pt")
+
+    with pytest.raises(FileNotFoundError):
+        ModelRegistry.load_concurrently(
+            lambda: ModelRegistry.get("test", "cascade", object),
+            lambda: ModelRegistry.get("test", "shared", object),
+            lambda: backend,
+            failing,
+        )
+
+    # Loaded models were given back, and models used elsewhere are kept
+    assert backend.closed
+    assert ModelRegistry.loaded() == [("test", "shared", ())]
+    assert ModelRegistry.release(shared)
+
+
+def test_failed_detector_start_releases_models(monkeypatch):
+    def missing_model(*args, **kwargs):
+        time.sleep(0.01)
+        raise FileNotFoundError("best_alt.pt")
+
+    monkeypatch.setattr(alt_cv_detection, "create_yolo_backend", missing_model)
+    with pytest.raises(FileNotFoundError):
+        alt_cv_detection.AltCVDetection()
+
+    # The cascades loaded alongside the missing model were released
+    assert ModelRegistry.loaded() == []
@@ -0,0 +1,110 @@
+import time
+import pytest
+from mugshot.mouse_input import (
+    MouseAction,
+    OutputWorker,
+    RecordingBackend,
+    Screen,
+    get_output_backend,
+    set_output_backend,
+)
+
+
+@pytest.fixture
+def backend():
+    backend = RecordingBackend(size=(800, 600))
+    previous = set_output_backend(backend, close_previous=False)
+    MouseAction.is_left_down = MouseAction.is_right_down = False
+    try:
+        yield backend
+    finally:
+        set_output_backend(previous)
+
+
+def test_mouse_action_uses_backend(backend):
+    MouseAction.move_to(-5, 1000)
+    MouseAction.left_down()
+    MouseAction.left_down()
+    MouseAction.left_up()
+    MouseAction.v_scroll(-3)
+    MouseAction.h_scroll(2)
+
+    assert backend.events == [
+        ("move", 1, 598),
+        ("button", "left", True),
+        ("button", "left", False),
+        ("scroll", -3, False),
+        ("scroll", 2, True),
+    ]
+    assert MouseAction.get_position() == (1, 598)
+
+
+def test_screen_size_is_cached(backend):
+    for _ in range(5):
+        MouseAction.move_to(10, 10)
+    assert Screen.get_size() == (800, 600)
+    assert backend.screen_queries == 1
+
+    Screen.invalidate()
+    Screen.get_size()
+    assert backend.screen_queries == 2
+
+
+def test_output_worker_coalesces_moves(backend):
+    worker = OutputWorker()
+    assert get_output_backend() is backend
+
+    # Queue everything before starting, as if the output had fallen behind
+    for x in range(3):
+        worker.moveTo(x, 10)
+    worker.leftDown()
+    worker.moveTo(100, 10)
+    worker.moveTo(200, 10)
+    worker.leftUp()
+
+    worker.start()
+    worker.quit()
+
+    assert backend.events == [
+        ("move", 2, 10),
+        ("button", "left", True),
+        ("move", 200, 10),
+        ("button", "left", False),
+    ]
+    assert worker.coalescedCount == 3
+    assert worker.sentCount == 4
+
+
+def test_output_worker_measures_glass_to_cursor_latency(backend):
+    worker = OutputWorker()
+    worker.moveTo(1, 1)
+    assert worker.cursorLatency == 0.0
+
+    # A move for a frame captured 100 ms ago
+    worker.moveTo(2, 2, time.monotonic() - 0.1)
+    worker.start()
+    worker.quit()
+
+    assert backend.events == [("move", 2, 2)]
+    assert worker.cursorLatency >= 0.01
+
+
+def test_output_worker_paces_scrolling(backend):
+    worker = OutputWorker()
+    worker.start()
+    try:
+        start = time.monotonic()
+        worker.setScrollDirection(0, -1)
+        time.sleep(0.5)
+        worker.setScrollDirection(0, 0)
+        elapsed = time.monotonic() - start
+        sent = len(backend.events)
+        time.sleep(0.1)
+    finally:
+        worker.quit()
+
+    # Scrolling started immediately and stopped with the gesture
+    assert backend.events[0] == ("scroll", -100, False)
+    assert len(backend.events) == sent
+    assert 2 <= sent <= elapsed * worker.scrollController.event_rate + 1
+    assert all(event[0] == "scroll" and event[1] < 0 for event in backend.events)
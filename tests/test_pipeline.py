@@ -0,0 +1,93 @@
+import threading
+from mugshot.cv import PipelineScheduler, Stage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_synchronous_stages_run_at_their_rate():
+    clock = FakeClock()
+    calls = {"every": 0, "slow": 0}
+
+    def count(name):
+        def run(inputs):
+            calls[name] += 1
+            return inputs["frame"]
+
+        return run
+
+    scheduler = PipelineScheduler(
+        [Stage("every", count("every")), Stage("slow", count("slow"), rate=10)],
+        clock=clock,
+    )
+    for frame in range(30):
+        clock.now = frame / 30
+        results = scheduler.run({"frame": frame})
+
+    assert calls["every"] == 30
+    assert calls["slow"] == 10
+    assert results["every"].value == 29 and results["every"].age == 0
+    assert results["slow"].value == 27
+    assert abs(results["slow"].age - 2 / 30) < 1e-9
+    scheduler.close()
+
+
+def test_stages_see_earlier_results():
+    scheduler = PipelineScheduler(
+        [
+            Stage("double", lambda inputs: inputs["x"] * 2),
+            Stage("plus_one", lambda inputs: inputs["double"] + 1),
+        ]
+    )
+    results = scheduler.run({"x": 5})
+    assert results["plus_one"].value == 11
+    scheduler.close()
+
+
+def test_asynchronous_stage_does_not_block():
+    clock = FakeClock()
+    release = threading.Event()
+
+    def slow(inputs):
+        release.wait(timeout=5)
+        return inputs["frame"]
+
+    scheduler = PipelineScheduler(
+        [
+            Stage("fast", lambda inputs: inputs["frame"]),
+            Stage("slow", slow, asynchronous=True),
+        ],
+        clock=clock,
+    )
+
+    # While the slow stage is in flight, frames keep flowing and it is not resubmitted
+    for frame in range(5):
+        clock.now = frame
+        results = scheduler.run({"frame": frame})
+        assert results["fast"].value == frame
+        assert "slow" not in results
+
+    release.set()
+    scheduler.drain(timeout=5)
+
+    clock.now = 5
+    results = scheduler.run({"frame": 5})
+    assert results["slow"].value == 0
+    assert results["slow"].age == 5
+    scheduler.close()
+
+
+def test_failing_asynchronous_stage_is_skipped():
+    def fail(inputs):
+        raise RuntimeError("boom")
+
+    scheduler = PipelineScheduler([Stage("fail", fail, asynchronous=True)])
+    scheduler.run({})
+    scheduler.drain(timeout=5)
+    assert "fail" not in scheduler.run({})
+    scheduler.close()
@@ -0,0 +1,117 @@
+import numpy as np
+import mugshot.cv._alt_cv_detection as alt_cv_detection
+from mugshot.cv import PrimaryFaceSelector, YoloBackend, box_iou
+
+
+def test_box_iou():
+    assert box_iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert box_iou((0, 0, 10, 10), (5, 0, 10, 10)) == 50 / 150
+    assert box_iou((0, 0, 10, 10), (20, 20, 10, 10)) == 0.0
+
+
+def test_selector_keeps_identity():
+    selector = PrimaryFaceSelector()
+    user, bystander = (100, 100, 80, 80), (300, 90, 120, 120)
+
+    # The largest face is locked onto first
+    assert selector.select([user, bystander]) == 1
+
+    # The bystander stays primary as faces move and swap order, and the other face is ignored
+    assert selector.select([(310, 95, 118, 118), user]) == 0
+    assert selector.select([user, (320, 100, 116, 116)]) == 1
+
+    # A face appearing far away, or much smaller at the same place, is never the primary face
+    selector = PrimaryFaceSelector()
+    assert selector.select([user]) == 0
+    assert selector.select([(400, 100, 80, 80), (110, 110, 30, 30)]) is None
+    assert selector.missed == 1
+
+
+def test_selector_relocks_after_missed_frames():
+    selector = PrimaryFaceSelector(max_missed=2)
+    assert selector.select([(100, 100, 80, 80)]) == 0
+
+    other = (400, 100, 60, 60)
+    assert selector.select([other]) is None
+    assert selector.select([]) is None
+    assert selector.select([other]) == 0
+    assert selector.box == other
+
+
+class CountingBackend(YoloBackend):
+    def __init__(self):
+        self.crops = []
+
+    def predict(self, image, conf=0.5):
+        self.crops.append(image.shape)
+        return []
+
+
+class FakeCascade:
+    """A cascade returning fixed boxes, as `detectMultiScale` would."""
+
+    def __init__(self, boxes):
+        self.boxes = np.array(boxes, np.int32).reshape(-1, 4)
+        self.calls = 0
+
+    def detectMultiScale(self, image, *args, **kwargs):
+        self.calls += 1
+        return self.boxes
+
+
+def test_alt_cv_detection_only_inspects_primary_face(monkeypatch):
+    backend = CountingBackend()
+    monkeypatch.setattr(
+        alt_cv_detection, "create_yolo_backend", lambda *args, **kwargs: backend
+    )
+    detection = alt_cv_detection.AltCVDetection(max_detection_width=None)
+    detection.face_cascade = FakeCascade([[40, 40, 60, 60], [200, 40, 80, 80]])
+    detection.eye_cascade = FakeCascade([])
+
+    frame = np.zeros((240, 320, 3), np.uint8)
+    for _ in range(3):
+        detections, frame_input = detection.detect(frame)
+
+        assert [face.primary for face in detections.faces] == [False, True]
+        assert detections.faces[0].eyes is None and detections.faces[0].tongue is None
+        assert frame_input.cursor_pos == (240 / 320, 80 / 240)
+
+    # Eyes and tongue were searched once per frame, on the primary face only
+    assert detection.eye_cascade.calls == 3
+    assert len(backend.crops) == 3
+
+
+def test_alt_cv_detection_scheduled_forgets_lost_face(monkeypatch):
+    monkeypatch.setattr(
+        alt_cv_detection,
+        "create_yolo_backend",
+        lambda *args, **kwargs: CountingBackend(),
+    )
+    # Eyes are detected asynchronously, at most once every 1000 s
+    detection = alt_cv_detection.AltCVDetection(
+        max_detection_width=None, stage_rates={"eyes": 0.001}
+    )
+    faces = FakeCascade([[40, 40, 60, 60], [200, 40, 80, 80]])
+    detection.face_cascade = faces
+    detection.eye_cascade = FakeCascade([])
+    frame = np.zeros((240, 320, 3), np.uint8)
+
+    try:
+        detection.detect(frame)
+        detection.scheduler.drain(timeout=5)
+        detections, frame_input = detection.detect(frame)
+        assert [face.primary for face in detections.faces] == [False, True]
+        assert frame_input.is_left_eye_closed and "eyes" in frame_input.stage_ages
+
+        faces.boxes = np.zeros((0, 4), np.int32)
+        detections, _ = detection.detect(frame)
+        assert detections.faces == []
+
+        # The eye result from before the face was lost is not merged
+        faces.boxes = np.array([[200, 40, 80, 80]], np.int32)
+        detections, frame_input = detection.detect(frame)
+        assert detections.faces[0].eyes is None
+        assert not frame_input.is_left_eye_closed
+        assert "eyes" not in frame_input.stage_ages
+    finally:
+        detection.close()
@@ -0,0 +1,142 @@
+import os
+import time
+import numpy as np
+import pytest
+from mugshot.cv import BaseCVDetection, ProcessPoolDetection
+from mugshot.mouse_input import FrameInput, GestureEngine, GesturePhase
+
+SHAPE = (48, 64, 3)
+
+
+class InvertDetection(BaseCVDetection):
+    """A detector that inverts the frame in place and reports its value and process."""
+
+    def process_frame(self, frame):
+        value = int(frame[0, 0, 0])
+        frame[...] = 255 - frame
+        return (frame, FrameInput(cursor_pos=(value / 255, float(os.getpid()))))
+
+
+def test_process_pool_detection():
+    detection = ProcessPoolDetection(InvertDetection, workers=2, shape=SHAPE)
+    try:
+        inputs = []
+        for i in range(6):
+            _, frame_input = detection.process_frame(np.full(SHAPE, i * 10, np.uint8))
+            inputs.append(frame_input)
+            detection.drain(timeout=30)
+
+        annotated_frame, frame_input = detection.process_frame(
+            np.zeros(SHAPE, np.uint8)
+        )
+        inputs.append(frame_input)
+
+        results = [frame_input for frame_input in inputs if frame_input.cursor_pos]
+        assert results[-1].cursor_pos[0] == 50 / 255
+        assert all(frame_input.cursor_pos[1] != os.getpid() for frame_input in results)
+
+        # The annotated frame was written back into shared memory by the detector process
+        assert annotated_frame.shape == SHAPE
+        assert int(annotated_frame[0, 0, 0]) == 255 - 50
+    finally:
+        detection.close()
+
+
+class SlowInvertDetection(InvertDetection):
+    def process_frame(self, frame):
+        time.sleep(0.02)
+        return super().process_frame(frame)
+
+
+def test_process_pool_detection_drops_when_full():
+    detection = ProcessPoolDetection(SlowInvertDetection, workers=1, shape=SHAPE)
+    try:
+        for _ in range(20):
+            detection.process_frame(np.zeros(SHAPE, np.uint8))
+        assert detection.dropped > 0
+        detection.drain(timeout=30)
+    finally:
+        detection.close()
+
+
+def test_process_pool_detection_resizes_frames():
+    detection = ProcessPoolDetection(InvertDetection, workers=1, shape=SHAPE)
+    try:
+        detection.process_frame(np.full((96, 128, 3), 7, np.uint8))
+        detection.drain(timeout=30)
+        annotated_frame, frame_input = detection.process_frame(
+            np.zeros(SHAPE, np.uint8)
+        )
+        assert annotated_frame.shape == SHAPE
+        assert frame_input.cursor_pos[0] == 7 / 255
+    finally:
+        detection.close()
+
+
+class BrokenDetection(BaseCVDetection):
+    def __init__(self):
+        raise ValueError("missing model")
+
+
+def test_process_pool_detection_reports_startup_errors():
+    with pytest.raises(RuntimeError, match="missing model"):
+        ProcessPoolDetection(BrokenDetection, workers=1, shape=SHAPE)
+
+
+class FlakyDetection(InvertDetection):
+    """Raises on frames whose value is 13."""
+
+    def process_frame(self, frame):
+        if frame[0, 0, 0] == 13:
+            raise ValueError("bad frame")
+        return super().process_frame(frame)
+
+
+def test_process_pool_detection_skips_failed_frames():
+    detection = ProcessPoolDetection(FlakyDetection, workers=1, shape=SHAPE)
+    try:
+        for value in (13, 13, 13, 7):
+            detection.process_frame(np.full(SHAPE, value, np.uint8))
+            detection.drain(timeout=30)
+
+        # Failed frames freed their slots, and the worker kept processing frames
+        assert not detection._in_flight
+        assert detection.dropped == 0
+        _, frame_input = detection.process_frame(np.zeros(SHAPE, np.uint8))
+        assert frame_input.cursor_pos[0] == 7 / 255
+    finally:
+        detection.close()
+
+
+class SlowEyeDetection(BaseCVDetection):
+    """Reports the left eye closed in frames whose value is not 0, a frame every 10 ms."""
+
+    def detect(self, frame):
+        time.sleep(0.01)
+        return (None, FrameInput(is_left_eye_closed=bool(frame[0, 0, 0])))
+
+
+def test_process_pool_detection_drives_gestures():
+    detection = ProcessPoolDetection(SlowEyeDetection, workers=1, shape=SHAPE)
+    engine = GestureEngine(press_frames=3, release_frames=2, hold_time=None)
+    try:
+        inputs, events = [], []
+        for i in range(40):
+            _, frame_input = detection.detect(
+                np.ones(SHAPE, np.uint8), timestamp=100.0 + i
+            )
+            inputs.append((100.0 + i, frame_input))
+            events += engine.update(frame_input)
+            time.sleep(0.003)
+        detection.drain(timeout=30)
+    finally:
+        detection.close()
+
+    # Frames without a new result are placeholders, and do not release the gesture
+    assert any(frame_input.is_placeholder for _, frame_input in inputs)
+    assert [event.phase for event in events] == [GesturePhase.PRESS]
+    assert engine.is_pressed("left_eye")
+
+    # Results are stamped with the capture time of their own, older frame
+    results = [(t, i) for t, i in inputs if not i.is_placeholder]
+    assert all(i.timestamp in range(100, 140) and i.timestamp < t for t, i in results)
@@ -0,0 +1,93 @@
+import time
+import numpy as np
+from PySide6.QtCore import Qt
+from mugshot.cv import (
+    BaseCVDetection,
+    CVWorker,
+    DEFAULT_QUALITY_LEVELS,
+    QualityGovernor,
+)
+from mugshot.mouse_input import FrameInput
+
+from test_cv_worker import wait_until
+
+
+def test_governor_lowers_quality_over_budget():
+    governor = QualityGovernor(budget=0.033, window=10)
+    changes = [governor.record(0.050) for _ in range(10)]
+
+    # One decision per full window
+    assert changes[:-1] == [None] * 9
+    assert changes[-1] == DEFAULT_QUALITY_LEVELS[1]
+    assert governor.index == 1
+
+    for _ in range(100):
+        governor.record(0.050)
+    assert governor.index == len(DEFAULT_QUALITY_LEVELS) - 1
+
+
+def test_governor_recovers_with_headroom():
+    governor = QualityGovernor(budget=0.033, window=10, headroom=0.7)
+    for _ in range(20):
+        governor.record(0.050)
+    assert governor.index == 2
+
+    # Just under budget is not enough headroom to raise quality
+    for _ in range(30):
+        governor.record(0.030)
+    assert governor.index == 2
+
+    for _ in range(20):
+        governor.record(0.010)
+    assert governor.index == 0
+
+
+def test_governor_ignores_isolated_spikes():
+    governor = QualityGovernor(budget=0.033, window=20)
+    for i in range(100):
+        governor.record(0.100 if i % 20 == 0 else 0.020)
+    assert governor.index == 0
+
+
+class SlowingDetection(BaseCVDetection):
+    """A detector that takes `delay` seconds per frame, and records the quality levels applied
+    to it."""
+
+    def __init__(self):
+        self.delay = 0.050
+        self.levels = []
+
+    def apply_quality(self, level):
+        self.levels.append(level)
+        # Lower quality is fast enough
+        self.delay = 0.050 if level == DEFAULT_QUALITY_LEVELS[0] else 0.001
+
+    def detect(self, frame):
+        time.sleep(self.delay)
+        return (None, FrameInput())
+
+
+def test_cv_worker_applies_governor_levels():
+    governor = QualityGovernor(budget=0.033, window=5)
+    worker = CVWorker(cv_detection_class=SlowingDetection, quality_governor=governor)
+    changes = []
+    worker.qualityChanged.connect(changes.append, Qt.ConnectionType.DirectConnection)
+    worker.start()
+    try:
+        assert wait_until(lambda: worker.cvDetection is not None)
+        # The starting level is applied to new detectors
+        assert worker.cvDetection.levels == [DEFAULT_QUALITY_LEVELS[0]]
+
+        for i in range(10):
+            worker.processFrame(np.zeros((4, 4, 3), np.uint8))
+            assert wait_until(lambda: worker.processedCount == i + 1)
+    finally:
+        worker.quit()
+
+    # Lowered after the slow window, raised again after the fast one
+    assert changes == [1, 0]
+    assert worker.cvDetection.levels == [
+        DEFAULT_QUALITY_LEVELS[0],
+        DEFAULT_QUALITY_LEVELS[1],
+        DEFAULT_QUALITY_LEVELS[0],
+    ]
@@ -0,0 +1,119 @@
+import time
+import numpy as np
+import pytest
+
+from mugshot.feed import FrameEnvelope
+from mugshot.mouse_input import FrameInput
+from mugshot.recording import (
+    INPUT_DTYPE,
+    RecordedSession,
+    SessionRecorder,
+    input_to_record,
+    record_to_input,
+    replay,
+)
+
+
+def make_input(i: int, interval: float = 0.05) -> FrameInput:
+    """Returns the inputs of the `i`th frame of a session at 1 / `interval` fps, processed 10 ms
+    after being captured."""
+    envelope = FrameEnvelope(i, 100.0 + i * interval)
+    envelope.mark("processed", envelope.captured + 0.01)
+    frame_input = FrameInput(
+        is_left_eye_closed=i % 2 == 0,
+        is_right_eye_closed=None if i % 3 == 0 else False,
+        cursor_pos=None if i == 1 else (0.25 * i, 0.5),
+        is_tongue_down=True if i > 2 else None,
+        timestamp=envelope.captured,
+    )
+    frame_input.envelope = envelope
+    return frame_input
+
+
+def record_session(directory, count: int, frame_width=None) -> SessionRecorder:
+    recorder = SessionRecorder(str(directory), frame_width=frame_width, flush_every=4)
+    for i in range(count):
+        frame = np.full((120, 160, 3), i * 20 % 256, np.uint8)
+        recorder.record(make_input(i), frame, processing=0.005)
+    recorder.close()
+    return recorder
+
+
+def test_record_round_trips_inputs():
+    frame_input = make_input(3)
+    record = input_to_record(frame_input, processing=0.005, frame=7)
+
+    assert record.dtype == INPUT_DTYPE
+    assert record["seq"] == 3
+    assert record["frame"] == 7
+    assert record["processed"] == pytest.approx(0.01, abs=1e-6)
+    restored = record_to_input(record)
+    assert restored.is_left_eye_closed is False
+    assert restored.is_right_eye_closed is None
+    assert restored.is_tongue_down is True
+    assert restored.cursor_pos == (0.75, 0.5)
+    assert restored.timestamp == frame_input.timestamp
+
+
+def test_session_is_memory_mapped(tmp_path):
+    record_session(tmp_path, 10)
+    session = RecordedSession(str(tmp_path))
+
+    assert isinstance(session.inputs, np.memmap)
+    assert len(session) == 10
+    assert session.metadata["inputs"] == 10
+    assert session.inputs["seq"].tolist() == list(range(10))
+    assert [i.cursor_pos for i in session.frame_inputs()][:3] == [
+        (0.0, 0.5),
+        None,
+        (0.5, 0.5),
+    ]
+    assert list(session.frames()) == []
+
+
+def test_session_records_downscaled_frames(tmp_path):
+    record_session(tmp_path, 5, frame_width=80)
+    session = RecordedSession(str(tmp_path))
+
+    frames = list(session.frames())
+    assert len(frames) == 5
+    assert frames[0].shape == (60, 80, 3)
+    assert session.inputs["frame"].tolist() == list(range(5))
+    # Compressed, so only roughly the same
+    assert abs(int(frames[4].mean()) - 80) < 5
+
+
+def test_recorder_does_not_overwrite_sessions(tmp_path):
+    record_session(tmp_path, 1)
+    with pytest.raises(FileExistsError):
+        SessionRecorder(str(tmp_path))
+
+
+def test_replay_keeps_recorded_pace(tmp_path):
+    record_session(tmp_path, 5)
+    session = RecordedSession(str(tmp_path))
+    replayed = []
+
+    def handle(frame_input):
+        replayed.append((time.monotonic(), frame_input))
+
+    start = time.monotonic()
+    assert replay(session, handle, speed=2.0) == 5
+
+    # 0.2 s of frames, each emitted 10 ms after capture, at twice the pace
+    assert replayed[-1][0] - start == pytest.approx(0.105, abs=0.03)
+    for called, frame_input in replayed:
+        # As old as when recorded
+        assert called - frame_input.timestamp == pytest.approx(0.01, abs=0.03)
+
+
+def test_replay_as_fast_as_possible(tmp_path):
+    record_session(tmp_path, 50)
+    session = RecordedSession(str(tmp_path))
+    timestamps = []
+
+    start = time.monotonic()
+    replay(session, lambda frame_input: timestamps.append(frame_input.timestamp), None)
+
+    assert time.monotonic() - start < 0.5
+    assert np.diff(timestamps) == pytest.approx(0.05)
@@ -0,0 +1,66 @@
+from mugshot.mouse_input import ScrollController
+
+
+def simulate(controller, fps, duration=2.0, worker_rate=1000):
+    """Scrolls down for `duration` seconds, setting the direction on every frame at `fps` as
+    detection would, and polling the controller at `worker_rate` like the output thread.
+
+    Returns the scroll events sent, as `(time, clicks)`."""
+    events = []
+    next_frame = 0.0
+    for i in range(int(duration * worker_rate)):
+        now = i / worker_rate
+        if now >= next_frame:
+            controller.set_direction(0, -1, now)
+            next_frame += 1 / fps
+        horizontal, vertical = controller.step_due(now)
+        assert horizontal == 0
+        if vertical:
+            events.append((now, vertical))
+    return events
+
+
+def test_scrolling_does_not_depend_on_frame_rate():
+    slow = simulate(ScrollController(step=1), fps=8)
+    fast = simulate(ScrollController(step=1), fps=30)
+
+    assert slow == fast
+    assert slow[0] == (0.0, -1)
+
+
+def test_scrolling_accelerates_to_max_rate():
+    controller = ScrollController(
+        start_rate=4, acceleration=20, max_rate=30, event_rate=15, step=1
+    )
+    events = simulate(controller, fps=30, duration=4.0)
+
+    def clicks(start, end):
+        return -sum(clicks for t, clicks in events if start <= t < end)
+
+    # Slow at first, then at most `max_rate`
+    assert clicks(0.0, 0.5) <= 6
+    assert 28 <= clicks(3.0, 4.0) <= 31
+
+    # Fast scrolling is batched into at most `event_rate` events per second
+    assert len([t for t, _ in events if 3.0 <= t < 4.0]) <= 15
+
+    # The total matches the integral of the rate, plus the initial step
+    ramp = (30 - 4) / 20
+    expected = 1 + 4 * ramp + 20 * ramp**2 / 2 + 30 * (4.0 - ramp)
+    assert abs(clicks(0.0, 4.0) - expected) <= 31
+
+
+def test_scrolling_stops_and_changes_direction():
+    controller = ScrollController(step=100)
+    controller.set_direction(1, 0, 0.0)
+    assert controller.step_due(0.0) == (100, 0)
+    assert controller.step_due(0.01) == (0, 0)
+    assert controller.timeout(0.01) > 0
+
+    controller.set_direction(0, 0, 0.5)
+    assert not controller.active
+    assert controller.step_due(1.0) == (0, 0)
+    assert controller.timeout(1.0) is None
+
+    controller.set_direction(0, 5, 2.0)
+    assert controller.step_due(2.0) == (0, 100)
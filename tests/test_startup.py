@@ -0,0 +1,134 @@
+import time
+import numpy as np
+from PySide6.QtCore import Qt
+from mugshot.cv import BaseCVDetection, CVWorker
+from mugshot.feed import FeedWorker, FrameSource
+from mugshot.mouse_input import FrameInput
+from mugshot.startup import StartupOrchestrator
+
+DELAY = 0.3
+
+
+class SlowSource(FrameSource):
+    """A frame source that takes `DELAY` seconds to open, like a camera."""
+
+    def __init__(self):
+        self.opened = False
+
+    def open(self):
+        time.sleep(DELAY)
+        self.opened = True
+        return True
+
+    def is_opened(self):
+        return self.opened
+
+    def read(self):
+        time.sleep(0.01)
+        return np.zeros((48, 64, 3), np.uint8)
+
+    def release(self):
+        self.opened = False
+
+
+class SlowDetection(BaseCVDetection):
+    """A detector that takes `DELAY` seconds to load its models."""
+
+    def __init__(self):
+        time.sleep(DELAY)
+        self.frame_sizes = []
+
+    def process_frame(self, frame):
+        self.frame_sizes.append(frame.shape[:2])
+        return (frame, FrameInput())
+
+
+class BrokenDetection(BaseCVDetection):
+    def __init__(self):
+        raise FileNotFoundError("best_alt.pt")
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def start_pipeline(cv_detection_class):
+    feed_worker = FeedWorker(SlowSource())
+    cv_worker = CVWorker(cv_detection_class=cv_detection_class)
+    feed_worker.frameRead.connect(
+        cv_worker.processFrame, Qt.ConnectionType.DirectConnection
+    )
+
+    startup = StartupOrchestrator()
+    startup.watch("camera", feed_worker.sourceOpened, feed_worker.sourceFailed)
+    startup.watch("detector", cv_worker.detectorReady, cv_worker.detectorFailed)
+    startup.watch("warmup", cv_worker.warmedUp)
+
+    events = []
+    startup.componentReady.connect(
+        lambda name, _: events.append(name), Qt.ConnectionType.DirectConnection
+    )
+    startup.componentFailed.connect(
+        lambda name, reason: events.append((name, reason)),
+        Qt.ConnectionType.DirectConnection,
+    )
+    startup.pipelineReady.connect(
+        lambda _: events.append("pipeline"), Qt.ConnectionType.DirectConnection
+    )
+    startup.start(cv_worker, feed_worker)
+    return startup, feed_worker, cv_worker, events
+
+
+def test_startup_overlaps_components():
+    startup, feed_worker, cv_worker, events = start_pipeline(SlowDetection)
+    try:
+        assert wait_until(startup.isReady)
+        readiness = startup.readiness()
+        assert set(readiness) == {"camera", "detector", "warmup"}
+
+        # The camera opened while the models loaded, rather than one after the other
+        assert max(readiness.values()) < 2 * DELAY  # type: ignore
+        assert events[-1] == "pipeline"
+        assert events.count("pipeline") == 1
+        assert events.index("detector") < events.index("warmup")
+
+        # The detector was warmed up before processing the camera's frames
+        assert wait_until(lambda: cv_worker.processedCount > 0)
+        assert cv_worker.cvDetection.frame_sizes[0] == (480, 640)
+        assert cv_worker.cvDetection.frame_sizes[1] == (48, 64)
+    finally:
+        feed_worker.quit()
+        cv_worker.quit()
+
+
+def test_startup_reports_failures():
+    startup, feed_worker, cv_worker, events = start_pipeline(BrokenDetection)
+    try:
+        assert wait_until(lambda: ("detector", "best_alt.pt") in events)
+        assert wait_until(lambda: "camera" in events)
+        assert cv_worker.wait(5000)
+        assert not startup.isReady()
+        assert startup.readiness()["detector"] is None
+    finally:
+        feed_worker.quit()
+        cv_worker.quit()
+
+
+def test_mark_ready_is_idempotent():
+    startup = StartupOrchestrator()
+    ready = []
+    startup.pipelineReady.connect(ready.append, Qt.ConnectionType.DirectConnection)
+    startup._readiness = {"a": None, "b": None}
+
+    # Components marked before `start` only make the pipeline ready once started
+    startup.markReady("a")
+    startup.markReady("b")
+    assert not startup.isReady()
+    startup.start()
+    assert startup.isReady()
+
+    startup.markReady("b")
+    assert len(ready) == 1
@@ -0,0 +1,82 @@
+import json
+import time
+import pytest
+from mugshot.telemetry import (
+    BUCKETS,
+    MetricsExporter,
+    StageHistogram,
+    enable_metrics,
+    record,
+    reset_metrics,
+    snapshot,
+    span,
+)
+
+
+@pytest.fixture
+def metrics():
+    reset_metrics()
+    enable_metrics()
+    yield
+    enable_metrics(False)
+    reset_metrics()
+
+
+def test_spans_are_not_recorded_when_disabled():
+    reset_metrics()
+    with span("disabled"):
+        pass
+    record("disabled", 1.0)
+    assert snapshot() == {}
+
+
+def test_spans_are_recorded(metrics):
+    with span("sleep"):
+        time.sleep(0.01)
+    record("sleep", 0.02)
+
+    stats = snapshot()["sleep"]
+    assert stats.count == 2
+    assert stats.total >= 0.03
+    assert stats.max >= 0.02
+
+
+def test_histogram_rolls_window_and_counts_buckets():
+    histogram = StageHistogram(window=4)
+    for seconds in (1.0, 1.0, 0.001, 0.003, 0.003, 0.003):
+        histogram.add(seconds)
+
+    stats = histogram.stats()
+    assert stats is not None
+    assert stats.count == 6
+    # Only the latest four spans are in the window
+    assert stats.max == 0.003
+    assert stats.p50 == 0.003
+
+    # Buckets count every span, cumulatively
+    assert len(stats.buckets) == len(BUCKETS)
+    assert stats.buckets[BUCKETS.index(0.001)] == 1
+    assert stats.buckets[BUCKETS.index(0.005)] == 4
+    assert stats.buckets[-1] == 6
+
+
+def test_exporter_writes_json_and_prometheus(metrics, tmp_path):
+    record("yolo", 0.015)
+    record("yolo", 0.025)
+
+    MetricsExporter(str(tmp_path / "metrics.json")).export()
+    with open(tmp_path / "metrics.json") as file:
+        exported = json.load(file)
+    assert exported["stages"]["yolo"]["count"] == 2
+
+    MetricsExporter(str(tmp_path / "metrics.prom")).export()
+    text = (tmp_path / "metrics.prom").read_text()
+    assert 'mugshot_stage_seconds_bucket{stage="yolo",le="0.02"} 1' in text
+    assert 'mugshot_stage_seconds_bucket{stage="yolo",le="+Inf"} 2' in text
+    assert 'mugshot_stage_seconds_count{stage="yolo"} 2' in text
+
+    # Files are replaced, without temporary files left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "metrics.json",
+        "metrics.prom",
+    ]
@@ -0,0 +1,74 @@
+import os
+import numpy as np
+import pytest
+from mugshot.cv import ModelRegistry, create_yolo_backend
+from mugshot.cv._alt_cv_detection import MODEL_DIR
+from mugshot.cv import _yolo_backend
+
+ultralytics = pytest.importorskip("ultralytics")
+pytest.importorskip("onnxruntime")
+
+IMGSZ = 320
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    """The bundled tongue model, or an untrained model with the same architecture family."""
+    if os.path.exists(MODEL_DIR):
+        return MODEL_DIR
+    path = str(tmp_path_factory.mktemp("models") / "untrained.pt")
+    ultralytics.YOLO("yolov8n.yaml").save(path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory, monkeypatch):
+    monkeypatch.setattr(
+        _yolo_backend, "MODEL_CACHE_DIR", str(tmp_path_factory.getbasetemp() / "cache")
+    )
+    yield
+    ModelRegistry.evict()
+
+
+def fixture_image():
+    """A deterministic square image, so that both backends see the same unpadded input."""
+    rng = np.random.default_rng(0)
+    return (rng.random((IMGSZ, IMGSZ, 3)) * 255).astype(np.uint8)
+
+
+def test_onnx_parity(model_path):
+    conf = 0.25 if model_path == MODEL_DIR else 1e-4
+    torch_backend = create_yolo_backend("ultralytics", model_path, imgsz=IMGSZ)
+    onnx_backend = create_yolo_backend("onnx", model_path, imgsz=IMGSZ)
+    assert onnx_backend.names == torch_backend.names
+
+    expected = torch_backend.predict(fixture_image(), conf=conf)
+    actual = onnx_backend.predict(fixture_image(), conf=conf)
+
+    assert len(actual) == len(expected)
+    for detection in actual:
+        assert any(
+            other.cls == detection.cls
+            and np.allclose(other.xyxy, detection.xyxy, atol=1.0)
+            and abs(other.conf - detection.conf) < 0.01
+            for other in expected
+        )
+
+
+def test_onnx_maps_boxes_to_input(model_path):
+    backend = create_yolo_backend("onnx", model_path, imgsz=IMGSZ)
+    image = fixture_image()[:200, :120]
+    for detection in backend.predict(image, conf=1e-4):
+        x1, y1, x2, y2 = detection.xyxy
+        assert 0 <= x1 <= x2 <= 120 and 0 <= y1 <= y2 <= 200
+
+
+def test_onnx_int8(model_path):
+    backend = create_yolo_backend("onnx-int8", model_path, imgsz=IMGSZ)
+    assert backend.onnx_path.endswith("-int8.onnx")
+    assert isinstance(backend.predict(fixture_image()), list)
+
+
+def test_unknown_backend(model_path):
+    with pytest.raises(ValueError):
+        create_yolo_backend("tensorrt", model_path)